@@ -3,18 +3,336 @@ AI Analytics Engine for Enterprise AI Agent Consortium
 Provides analytics and insights for agent interactions and system performance
 """
 
+import io
 import logging
+import math
+import threading
+import time
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 
+import numpy as np
+
+from analytics.event_log import EVENT_LOG_ROOT, EventLog, decode_interaction, encode_interaction, open_worker_log
+
 logger = logging.getLogger(__name__)
 
+class InteractionLog:
+    """Fixed-capacity ring buffer of agent interactions in NumPy columns
+    
+    Each field is a preallocated array and agent names are interned to
+    small integer ids, so appending overwrites one slot per column and
+    allocates nothing. Timestamps are epoch seconds taken at log time
+    and never go below the previous entry's, so the buffer is two sorted
+    runs (the older tail, then the newer head) and time-window queries
+    binary-search each run.
+    """
+    
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.agent_ids = np.zeros(capacity, dtype=np.int32)
+        self.message_lengths = np.zeros(capacity, dtype=np.int64)
+        self.response_lengths = np.zeros(capacity, dtype=np.int64)
+        self.response_times = np.zeros(capacity, dtype=np.float64)
+        self.successes = np.zeros(capacity, dtype=np.bool_)
+        self.agent_names: List[str] = []
+        self._agent_ids: Dict[str, int] = {}
+        self._next = 0
+        self._size = 0
+        self._last = float('-inf')
+        self._lock = threading.Lock()
+    
+    def append(self, timestamp: float, agent_name: str, message_length: int, response_length: int,
+               response_time: float, success: bool):
+        """Record one interaction, overwriting the oldest once full"""
+        with self._lock:
+            # A timestamp behind the newest entry (clock step) is clamped to keep the runs sorted
+            timestamp = self._last = max(timestamp, self._last)
+            agent_id = self._agent_ids.get(agent_name)
+            if agent_id is None:
+                agent_id = self._agent_ids[agent_name] = len(self.agent_names)
+                self.agent_names.append(agent_name)
+            
+            index = self._next
+            self.timestamps[index] = timestamp
+            self.agent_ids[index] = agent_id
+            self.message_lengths[index] = message_length
+            self.response_lengths[index] = response_length
+            self.response_times[index] = response_time
+            self.successes[index] = success
+            self._next = index + 1 if index + 1 < self.capacity else 0
+            if self._size < self.capacity:
+                self._size += 1
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def rows(self) -> List[tuple]:
+        """(timestamp, agent_name, message_length, response_length, response_time, success) per entry, oldest first"""
+        with self._lock:
+            positions = np.concatenate([np.arange(run.start, run.stop) for run in self._runs()])
+            names = self.agent_names
+            return list(zip(
+                self.timestamps[positions].tolist(), [names[agent_id] for agent_id in self.agent_ids[positions].tolist()],
+                self.message_lengths[positions].tolist(), self.response_lengths[positions].tolist(),
+                self.response_times[positions].tolist(), self.successes[positions].tolist()
+            ))
+    
+    def _runs(self) -> List[slice]:
+        """Physical slices holding the entries, oldest run first"""
+        if self._size < self.capacity:
+            return [slice(0, self._size)]
+        return [slice(self._next, self.capacity), slice(0, self._next)]
+    
+    def positions_since(self, since: float) -> np.ndarray:
+        """Buffer positions of entries logged at or after `since`, oldest first"""
+        with self._lock:
+            return self._positions_since(since)
+    
+    def _positions_since(self, since: float) -> np.ndarray:
+        parts = []
+        for run in self._runs():
+            first = np.searchsorted(self.timestamps[run], since, side='left')
+            parts.append(np.arange(run.start + first, run.stop))
+        return np.concatenate(parts)
+    
+    def records(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        """Interaction dicts for the given positions"""
+        with self._lock:
+            return self._records(positions)
+    
+    def records_since(self, since: float) -> List[Dict[str, Any]]:
+        """Interaction dicts of entries logged at or after `since`, oldest first"""
+        with self._lock:
+            return self._records(self._positions_since(since))
+    
+    def _records(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        names = self.agent_names
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "agent_name": names[agent_id],
+                "message_length": message_length,
+                "response_length": response_length,
+                "response_time": response_time,
+                "success": success
+            }
+            for timestamp, agent_id, message_length, response_length, response_time, success in zip(
+                self.timestamps[positions].tolist(), self.agent_ids[positions].tolist(),
+                self.message_lengths[positions].tolist(), self.response_lengths[positions].tolist(),
+                self.response_times[positions].tolist(), self.successes[positions].tolist()
+            )
+        ]
+
+class LatencySketch:
+    """Streaming latency quantiles in log-spaced buckets (HDR histogram style)
+    
+    A value lands in the bucket [gamma^(i-1), gamma^i), so any quantile is
+    reported within `relative_error` of the true value, from 0.1 ms up to
+    about three hours. Recording is one log and one counter increment;
+    sketches with the same settings merge by adding their counts.
+    """
+    
+    MIN_VALUE = 1e-4
+    MAX_VALUE = 1e4
+    
+    def __init__(self, relative_error: float = 0.01):
+        self.relative_error = relative_error
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+        self._offset = math.ceil(math.log(self.MIN_VALUE) / self._log_gamma)
+        self.counts = np.zeros(math.ceil(math.log(self.MAX_VALUE) / self._log_gamma) - self._offset + 1,
+                               dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, value: float):
+        """Add one latency in seconds"""
+        clamped = min(max(value, self.MIN_VALUE), self.MAX_VALUE)
+        self.counts[math.ceil(math.log(clamped) / self._log_gamma) - self._offset] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other: 'LatencySketch') -> 'LatencySketch':
+        """Add another sketch's observations to this one"""
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+    
+    def stats(self) -> List[float]:
+        """count, total and max, stored next to `counts` in snapshots"""
+        return [self.count, self.total, self.max]
+    
+    @classmethod
+    def from_arrays(cls, counts: np.ndarray, stats: np.ndarray) -> 'LatencySketch':
+        sketch = cls()
+        if counts.shape != sketch.counts.shape:
+            raise ValueError("latency sketch layout differs from this version")
+        sketch.counts = counts.astype(np.int64)
+        sketch.count = int(stats[0])
+        sketch.total = float(stats[1])
+        sketch.max = float(stats[2])
+        return sketch
+    
+    def quantile(self, q: float) -> float:
+        """Value at quantile q (0-1); 0.0 when nothing was recorded"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))  # Nearest rank
+        index = int(np.searchsorted(np.cumsum(self.counts), rank, side='left'))
+        # Bucket midpoint, within relative_error of every value in the bucket
+        return min(2 * self.gamma ** (index + self._offset) / (self.gamma + 1), self.max)
+    
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max
+        }
+
+class ActivityRollup:
+    """Interaction totals per fixed time bucket, kept for `retention` buckets
+    
+    Each bucket holds [interactions, successes, response time sum] per
+    agent and one LatencySketch of response times, all updated as
+    interactions are logged. A window query merges the buckets it
+    covers, so its cost depends on the number of buckets, not on how
+    many interactions were logged.
+    """
+    
+    def __init__(self, bucket_seconds: int, retention: int):
+        self.bucket_seconds = bucket_seconds
+        self.retention = retention
+        # bucket start -> ({agent: [interactions, successes, response time sum]}, LatencySketch)
+        self.buckets: Dict[int, tuple] = {}
+        self._newest = None
+        self._lock = threading.Lock()
+    
+    @property
+    def span(self) -> int:
+        """Seconds of history retained"""
+        return self.bucket_seconds * self.retention
+    
+    def add(self, timestamp: float, agent_name: str, response_time: float, success: bool):
+        start = int(timestamp // self.bucket_seconds) * self.bucket_seconds
+        with self._lock:
+            bucket = self.buckets.get(start)
+            if bucket is None:
+                if self._newest is not None and start <= self._newest - self.span:
+                    return  # Older than anything retained
+                bucket = self.buckets[start] = ({}, LatencySketch())
+                if self._newest is None or start > self._newest:
+                    self._newest = start
+                    self._expire()
+            agents, sketch = bucket
+            totals = agents.get(agent_name)
+            if totals is None:
+                totals = agents[agent_name] = [0, 0, 0.0]
+            totals[0] += 1
+            totals[1] += success
+            totals[2] += response_time
+            sketch.record(response_time)
+    
+    def merge(self, other: 'ActivityRollup'):
+        """Add another rollup's buckets (same bucket size) to this one"""
+        with self._lock:
+            for start, (other_agents, other_sketch) in other.buckets.items():
+                bucket = self.buckets.get(start)
+                if bucket is None:
+                    bucket = self.buckets[start] = ({}, LatencySketch())
+                agents, sketch = bucket
+                for agent_name, (count, successes, response_time) in other_agents.items():
+                    totals = agents.setdefault(agent_name, [0, 0, 0.0])
+                    totals[0] += count
+                    totals[1] += successes
+                    totals[2] += response_time
+                sketch.merge(other_sketch)
+            if self.buckets:
+                self._newest = max(self.buckets)
+                self._expire()
+    
+    def _expire(self):
+        oldest = self._newest - (self.retention - 1) * self.bucket_seconds
+        for start in [start for start in self.buckets if start < oldest]:
+            del self.buckets[start]
+    
+    def summary(self, window_seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """Totals, latency quantiles and per-agent figures over the last `window_seconds`"""
+        now = time.time() if now is None else now
+        agents: Dict[str, List[float]] = {}
+        latency = LatencySketch()
+        with self._lock:
+            # Buckets overlapping the window count whole
+            for start, (bucket_agents, sketch) in self.buckets.items():
+                if start + self.bucket_seconds > now - window_seconds and start <= now:
+                    for agent_name, (count, successes, response_time) in bucket_agents.items():
+                        totals = agents.setdefault(agent_name, [0, 0, 0.0])
+                        totals[0] += count
+                        totals[1] += successes
+                        totals[2] += response_time
+                    latency.merge(sketch)
+        
+        interactions = sum(totals[0] for totals in agents.values())
+        successes = sum(totals[1] for totals in agents.values())
+        response_time = sum(totals[2] for totals in agents.values())
+        return {
+            "interactions": interactions,
+            "successful_completions": successes,
+            "success_rate": successes / interactions if interactions else 0.0,
+            "average_response_time": response_time / interactions if interactions else 0.0,
+            "response_time_percentiles": latency.summary(),
+            "agents": {
+                agent_name: {
+                    "interactions": count,
+                    "success_rate": successes / count,
+                    "average_response_time": response_time / count
+                }
+                for agent_name, (count, successes, response_time) in agents.items()
+            }
+        }
+
 class AIAnalyticsEngine:
-    """Provides analytics and insights for the multi-agent system"""
+    """Provides analytics and insights for the multi-agent system
+    
+    With an EventLog every logged interaction is also appended to it, and
+    the state is restored from the log's latest snapshot and tail when the
+    log is attached. Each time the log rotates to a new segment the
+    engine writes a snapshot of its state, so a restart replays at most
+    one segment. With an `event_log_root` instead, this process's worker
+    log under it is claimed by open_event_log(), at the latest on the
+    first logged interaction, so creating the engine touches no files.
+    """
+    
+    # Phases of a model call that get latency quantiles
+    LATENCY_METRICS = ("queue_wait", "time_to_first_token", "total_latency")
+    STATE_FORMAT = 1
     
-    def __init__(self):
-        self.interaction_history = []
+    def __init__(self, history_size: int = 1000, event_log: Optional[EventLog] = None,
+                 event_log_root: Optional[str] = None):
+        # Only the last `history_size` interactions are kept
+        self.interactions = InteractionLog(history_size)
+        # (agent, provider, model) -> metric -> LatencySketch
+        self.latency_sketches: Dict[tuple, Dict[str, LatencySketch]] = {}
+        # Pre-aggregated activity: minute buckets for two hours, hour buckets for a week
+        self.minute_rollup = ActivityRollup(60, 120)
+        self.hour_rollup = ActivityRollup(3600, 24 * 7)
+        self._top_agents = (None, [])
+        # (provider, model) -> [calls, failed calls]
+        self.provider_calls: Dict[tuple, List[int]] = {}
+        # agent -> canned fallback responses served instead of a model call; not
+        # interactions, and kept in memory only
+        self.fallback_responses: Dict[str, int] = {}
+        self._latency_lock = threading.Lock()
         self.agent_performance = {}
         self.system_metrics = {
             "total_interactions": 0,
@@ -22,25 +340,266 @@ class AIAnalyticsEngine:
             "average_response_time": 0.0,
             "agent_utilization": {}
         }
+        # Events are stamped, applied and appended one at a time, so the buffer stays in
+        # time order and snapshots match the log
+        self._event_lock = threading.Lock()
+        self.event_log = None
+        self.event_log_root = event_log_root
+        self._event_log_pending = event_log_root is not None
+        if event_log is not None:
+            self.restore(event_log)
+            self.event_log = event_log
     
     def log_interaction(self, agent_name: str, message: str, response: str, 
-                       response_time: float = 0.0, success: bool = True):
-        """Log an agent interaction for analytics"""
-        interaction = {
-            "timestamp": datetime.now().isoformat(),
-            "agent_name": agent_name,
-            "message_length": len(message),
-            "response_length": len(response),
-            "response_time": response_time,
-            "success": success
-        }
+                       response_time: float = 0.0, success: bool = True,
+                       provider: Optional[str] = None, model: Optional[str] = None,
+                       queue_wait: Optional[float] = None, time_to_first_token: Optional[float] = None):
+        """Log an agent interaction for analytics
         
-        self.interaction_history.append(interaction)
+        With a provider, the call's latencies also feed the quantile
+        sketches for (agent, provider, model); phases that were not
+        measured are left out.
+        """
+        if self._event_log_pending:
+            self.open_event_log()
+        with self._event_lock:
+            # Stamped under the lock, so concurrent callers are logged in time order
+            event = (time.time(), agent_name, len(message), len(response), response_time, success,
+                     provider, model, queue_wait, time_to_first_token)
+            self._apply(*event)
+            if self.event_log is None:
+                return
+            try:
+                if self.event_log.append(encode_interaction(*event)):
+                    self.event_log.write_snapshot(self.export_state())
+            except OSError as e:
+                logger.warning(f"Could not write analytics event log: {e} - no longer persisting analytics")
+                self.event_log = None
+    
+    def open_event_log(self) -> Optional[EventLog]:
+        """Claim this process's worker log under `event_log_root` and restore from it (once)"""
+        with self._event_lock:
+            if self._event_log_pending:
+                self._event_log_pending = False
+                event_log = open_worker_log(self.event_log_root)
+                if event_log is not None:
+                    self.restore(event_log)
+                    self.event_log = event_log
+        return self.event_log
+    
+    def _apply(self, timestamp: float, agent_name: str, message_length: int, response_length: int,
+               response_time: float, success: bool, provider: Optional[str], model: Optional[str],
+               queue_wait: Optional[float], time_to_first_token: Optional[float]):
+        """Fold one interaction into every aggregate"""
+        self.interactions.append(timestamp, agent_name, message_length, response_length, response_time, success)
+        self.minute_rollup.add(timestamp, agent_name, response_time, success)
+        self.hour_rollup.add(timestamp, agent_name, response_time, success)
         self.update_metrics(agent_name, response_time, success)
+        if provider is not None:
+            self.record_latency(agent_name, provider, model, total_latency=response_time,
+                                queue_wait=queue_wait, time_to_first_token=time_to_first_token)
+            with self._latency_lock:
+                calls = self.provider_calls.setdefault((provider, model or "default"), [0, 0])
+                calls[0] += 1
+                calls[1] += not success
+    
+    def record_latency(self, agent_name: str, provider: str, model: Optional[str], **latencies: Optional[float]):
+        """Add one call's phase latencies (seconds, keyed by LATENCY_METRICS name)"""
+        key = (agent_name, provider, model or "default")
+        with self._latency_lock:
+            sketches = self.latency_sketches.get(key)
+            if sketches is None:
+                sketches = self.latency_sketches[key] = {metric: LatencySketch() for metric in self.LATENCY_METRICS}
+            for metric, value in latencies.items():
+                if value is not None:
+                    sketches[metric].record(value)
+    
+    def get_latency_percentiles(self, agent_name: Optional[str] = None, provider: Optional[str] = None,
+                                model: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Latency summaries merged over every key matching the given filters"""
+        merged = {metric: LatencySketch() for metric in self.LATENCY_METRICS}
+        with self._latency_lock:
+            for (key_agent, key_provider, key_model), sketches in self.latency_sketches.items():
+                if ((agent_name is None or key_agent == agent_name) and
+                        (provider is None or key_provider == provider) and
+                        (model is None or key_model == model)):
+                    for metric, sketch in sketches.items():
+                        merged[metric].merge(sketch)
+        return {metric: sketch.summary() for metric, sketch in merged.items()}
+    
+    def record_fallback(self, agent_name: str):
+        """Count a canned response served to an agent without calling a model"""
+        with self._latency_lock:
+            self.fallback_responses[agent_name] = self.fallback_responses.get(agent_name, 0) + 1
+    
+    def get_fallback_responses(self) -> Dict[str, int]:
+        with self._latency_lock:
+            return dict(self.fallback_responses)
+    
+    def get_provider_calls(self) -> Dict[tuple, Dict[str, int]]:
+        """Call and error counts for each (provider, model)"""
+        with self._latency_lock:
+            return {key: {"calls": calls, "errors": errors} for key, (calls, errors) in self.provider_calls.items()}
+    
+    def get_latency_breakdown(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Latency summaries for each agent/provider/model key"""
+        with self._latency_lock:
+            return {
+                "/".join(key): {metric: sketch.summary() for metric, sketch in sketches.items()}
+                for key, sketches in self.latency_sketches.items()
+            }
+    
+    def restore(self, event_log: EventLog) -> int:
+        """Load the latest readable snapshot, then replay the segments after it; returns events replayed"""
+        start = 0
+        for sequence in reversed(event_log.snapshots()):
+            try:
+                self.load_state(event_log.read_snapshot(sequence))
+                start = sequence
+                break
+            except FileNotFoundError:
+                raise  # Compacted away while being read
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Could not load analytics snapshot {sequence} in {event_log.directory}: {e}")
+        replayed = 0
+        for payload in event_log.replay(start):
+            self._apply(*decode_interaction(payload))
+            replayed += 1
+        return replayed
+    
+    def export_state(self) -> bytes:
+        """Every aggregate as an .npz image (no pickle); the inverse of load_state"""
+        rows = self.interactions.rows()
+        names = sorted({row[1] for row in rows})
+        name_ids = {name: index for index, name in enumerate(names)}
+        arrays = {
+            "interaction_times": np.array([row[0] for row in rows], dtype=np.float64),
+            "interaction_agents": np.array([name_ids[row[1]] for row in rows], dtype=np.int32),
+            "message_lengths": np.array([row[2] for row in rows], dtype=np.int64),
+            "response_lengths": np.array([row[3] for row in rows], dtype=np.int64),
+            "response_times": np.array([row[4] for row in rows], dtype=np.float64),
+            "successes": np.array([row[5] for row in rows], dtype=np.bool_)
+        }
+        with self._latency_lock:
+            latency_keys = list(self.latency_sketches)
+            sketches = [self.latency_sketches[key][metric] for key in latency_keys for metric in self.LATENCY_METRICS]
+            arrays["latency_counts"] = np.array([sketch.counts for sketch in sketches], dtype=np.int64)
+            arrays["latency_stats"] = np.array([sketch.stats() for sketch in sketches], dtype=np.float64)
+            provider_calls = [[*key, *calls] for key, calls in self.provider_calls.items()]
+        metadata = {
+            "format": self.STATE_FORMAT,
+            "interaction_agents": names,
+            "latency_keys": [list(key) for key in latency_keys],
+            "provider_calls": provider_calls,
+            "agent_performance": self.agent_performance,
+            "system_metrics": self.system_metrics
+        }
+        for name, rollup in (("minute", self.minute_rollup), ("hour", self.hour_rollup)):
+            with rollup._lock:
+                starts = sorted(rollup.buckets)
+                metadata[f"{name}_rollup"] = [[start, rollup.buckets[start][0]] for start in starts]
+                arrays[f"{name}_counts"] = np.array([rollup.buckets[start][1].counts for start in starts], dtype=np.int64)
+                arrays[f"{name}_stats"] = np.array([rollup.buckets[start][1].stats() for start in starts],
+                                                   dtype=np.float64)
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, metadata=np.array(json.dumps(metadata)), **arrays)
+        return buffer.getvalue()
+    
+    def load_state(self, data: bytes):
+        """Replace every aggregate with an export_state image"""
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            metadata = json.loads(str(arrays["metadata"]))
+            if metadata.get("format") != self.STATE_FORMAT:
+                raise ValueError("unrecognised analytics state format")
+            names = metadata["interaction_agents"]
+            interactions = InteractionLog(self.interactions.capacity)
+            for row in zip(arrays["interaction_times"].tolist(), arrays["interaction_agents"].tolist(),
+                           arrays["message_lengths"].tolist(), arrays["response_lengths"].tolist(),
+                           arrays["response_times"].tolist(), arrays["successes"].tolist()):
+                interactions.append(row[0], names[row[1]], *row[2:])
+            
+            latency_sketches = {}
+            metrics = len(self.LATENCY_METRICS)
+            for index, key in enumerate(metadata["latency_keys"]):
+                latency_sketches[tuple(key)] = {
+                    metric: LatencySketch.from_arrays(arrays["latency_counts"][index * metrics + offset],
+                                                      arrays["latency_stats"][index * metrics + offset])
+                    for offset, metric in enumerate(self.LATENCY_METRICS)
+                }
+            
+            rollups = {}
+            for name, template in (("minute", self.minute_rollup), ("hour", self.hour_rollup)):
+                rollup = rollups[name] = ActivityRollup(template.bucket_seconds, template.retention)
+                for (start, agents), counts, stats in zip(metadata[f"{name}_rollup"], arrays[f"{name}_counts"],
+                                                          arrays[f"{name}_stats"]):
+                    rollup.buckets[start] = (agents, LatencySketch.from_arrays(counts, stats))
+                rollup._newest = max(rollup.buckets) if rollup.buckets else None
+        
+        self.interactions = interactions
+        with self._latency_lock:
+            self.latency_sketches = latency_sketches
+            self.provider_calls = {(provider, model): [calls, errors]
+                                   for provider, model, calls, errors in metadata["provider_calls"]}
+        self.minute_rollup = rollups["minute"]
+        self.hour_rollup = rollups["hour"]
+        self.agent_performance = metadata["agent_performance"]
+        self.system_metrics = metadata["system_metrics"]
+        self._top_agents = (None, [])
+    
+    def merge(self, other: 'AIAnalyticsEngine'):
+        """Add another engine's aggregates (e.g. another worker's) to this one"""
+        rows = sorted(self.interactions.rows() + other.interactions.rows(), key=lambda row: row[0])
+        interactions = InteractionLog(self.interactions.capacity)
+        for row in rows[-interactions.capacity:]:
+            interactions.append(*row)
+        self.interactions = interactions
+        
+        with self._latency_lock:
+            for key, other_sketches in other.latency_sketches.items():
+                sketches = self.latency_sketches.setdefault(
+                    key, {metric: LatencySketch() for metric in self.LATENCY_METRICS}
+                )
+                for metric, sketch in other_sketches.items():
+                    sketches[metric].merge(sketch)
+            for key, (calls, errors) in other.provider_calls.items():
+                totals = self.provider_calls.setdefault(key, [0, 0])
+                totals[0] += calls
+                totals[1] += errors
+        self.minute_rollup.merge(other.minute_rollup)
+        self.hour_rollup.merge(other.hour_rollup)
+        
+        for agent_name, other_perf in other.agent_performance.items():
+            perf = self.agent_performance.setdefault(agent_name, {
+                "total_requests": 0,
+                "successful_requests": 0,
+                "average_response_time": 0.0,
+                "success_rate": 0.0
+            })
+            total_requests = perf["total_requests"] + other_perf["total_requests"]
+            perf["average_response_time"] = (
+                perf["average_response_time"] * perf["total_requests"] +
+                other_perf["average_response_time"] * other_perf["total_requests"]
+            ) / total_requests if total_requests else 0.0
+            perf["total_requests"] = total_requests
+            perf["successful_requests"] += other_perf["successful_requests"]
+            perf["success_rate"] = perf["successful_requests"] / total_requests if total_requests else 0.0
         
-        # Keep only last 1000 interactions to prevent memory issues
-        if len(self.interaction_history) > 1000:
-            self.interaction_history = self.interaction_history[-1000:]
+        metrics, other_metrics = self.system_metrics, other.system_metrics
+        total = metrics["total_interactions"] + other_metrics["total_interactions"]
+        metrics["average_response_time"] = (
+            metrics["average_response_time"] * metrics["total_interactions"] +
+            other_metrics["average_response_time"] * other_metrics["total_interactions"]
+        ) / total if total else 0.0
+        metrics["total_interactions"] = total
+        metrics["successful_completions"] += other_metrics["successful_completions"]
+        for agent_name, count in other_metrics["agent_utilization"].items():
+            metrics["agent_utilization"][agent_name] = metrics["agent_utilization"].get(agent_name, 0) + count
+        self._top_agents = (None, [])
+    
+    @property
+    def interaction_history(self) -> List[Dict[str, Any]]:
+        """Every retained interaction, oldest first"""
+        return self.interactions.records_since(float('-inf'))
     
     def update_metrics(self, agent_name: str, response_time: float, success: bool):
         """Update system metrics"""
@@ -91,25 +650,29 @@ class AIAnalyticsEngine:
         return {
             "system_metrics": self.system_metrics,
             "agent_performance": self.agent_performance,
-            "recent_activity": self.get_recent_activity(),
+            "recent_activity": self.get_activity_summary(),
+            "latency_percentiles": self.get_latency_breakdown(),
+            "fallback_responses": self.get_fallback_responses(),
             "top_performing_agents": self.get_top_agents(),
             "analytics_timestamp": datetime.now().isoformat()
         }
     
     def get_recent_activity(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get recent activity within specified hours"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent = []
-        
-        for interaction in self.interaction_history:
-            interaction_time = datetime.fromisoformat(interaction["timestamp"])
-            if interaction_time >= cutoff_time:
-                recent.append(interaction)
-        
-        return recent
+        return self.interactions.records_since(time.time() - hours * 3600)
+    
+    def get_activity_summary(self, hours: float = 24) -> Dict[str, Any]:
+        """Totals and latency quantiles over the last `hours`, from the pre-aggregated buckets"""
+        window = hours * 3600
+        rollup = self.minute_rollup if window <= self.minute_rollup.span else self.hour_rollup
+        return {"window_hours": hours, **rollup.summary(window)}
     
     def get_top_agents(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get top performing agents"""
+        # Rankings only change when an interaction is logged
+        key = (self.system_metrics["total_interactions"], limit)
+        if self._top_agents[0] == key:
+            return [dict(agent) for agent in self._top_agents[1]]
         agents = []
         
         for agent_name, perf in self.agent_performance.items():
@@ -122,7 +685,8 @@ class AIAnalyticsEngine:
         
         # Sort by success rate and total requests
         agents.sort(key=lambda x: (x["success_rate"], x["total_requests"]), reverse=True)
-        return agents[:limit]
+        self._top_agents = (key, agents[:limit])
+        return [dict(agent) for agent in agents[:limit]]
     
     def generate_insights(self) -> List[str]:
         """Generate actionable insights from analytics data"""
@@ -167,5 +731,5 @@ class AIAnalyticsEngine:
         analytics_data["insights"] = self.generate_insights()
         return json.dumps(analytics_data, indent=2)
 
-# Global analytics engine instance
-ai_analytics = AIAnalyticsEngine()
\ No newline at end of file
+# Global analytics engine instance, persisted to this worker's event log once one is opened
+ai_analytics = AIAnalyticsEngine(event_log_root=EVENT_LOG_ROOT)
\ No newline at end of file
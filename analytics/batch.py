@@ -0,0 +1,43 @@
+"""
+Batch Analytics - Bulk rescoring of stored sessions
+Rebuilds session analytics across the whole history (e.g. after keyword
+changes), reading transcripts and writing results a chunk at a time
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from analytics.cache import analytics_key, session_analytics_record
+from analytics.engine import AnalyticsResult, ConversationAnalytics, analytics_engine
+
+Transcript = Tuple[List[Dict], Optional[str]]
+
+
+class BatchAnalytics:
+    """Rescores many conversations with the engine, writing results back in bulk.
+
+    Each session goes through analyze_conversation, so rescored analytics
+    are exactly what a fresh analysis returns. The per-session cost worth
+    batching is the database round trip: transcripts are loaded and
+    results saved one chunk per query.
+    """
+
+    def __init__(self, engine: Optional[ConversationAnalytics] = None):
+        self.engine = engine or analytics_engine
+
+    def analyze_many(self, transcripts: Iterable[Transcript]) -> List[AnalyticsResult]:
+        """AnalyticsResult for every (conversation, report) pair, in order"""
+        return [self.engine.analyze_conversation(conversation, report) for conversation, report in transcripts]
+
+    def rescore_sessions(self, db_manager, session_ids: Optional[List[int]] = None,
+                         chunk_size: int = 500) -> int:
+        """Recompute SessionAnalytics for stored sessions in bulk; returns sessions scored"""
+        scored = 0
+        for chunk in db_manager.iter_session_transcripts(session_ids, chunk_size=chunk_size):
+            results = self.analyze_many((messages, None) for messages in chunk.values())
+            # Keyed like AnalyticsCache entries, so rescored sessions also warm its database tier
+            db_manager.bulk_save_session_analytics({
+                session_id: session_analytics_record(result, analytics_key(self.engine, messages, None))
+                for (session_id, messages), result in zip(chunk.items(), results)
+            })
+            scored += len(chunk)
+        return scored
@@ -0,0 +1,175 @@
+"""
+Analytics Engine Benchmarks
+Times conversation analytics on large synthetic transcripts
+
+Run with:  python -m analytics.benchmark [words] [sessions]
+"""
+
+import random
+import sys
+import time
+from dataclasses import asdict
+from typing import Dict, List, Tuple
+
+from analytics.engine import ConversationAnalytics
+
+AGENT_TYPES = ["Product Manager", "Business Analyst", "Engineer", "Financial Analyst", "Security Expert"]
+
+FILLER_WORDS = [
+    "the", "and", "for", "with", "team", "users", "plan", "data", "phase", "system",
+    "feature", "launch", "support", "process", "quality", "review", "Q3", "2025",
+    "approach", "platform", "mobile", "Stripe", "AWS", "product", "analysis"
+]
+
+PHRASES = [
+    "We should implement a microservices architecture.",
+    "Target market size is $2,500,000 with 15% growth expected.",
+    "Next steps: build the API integration in phase 2.",
+    "Key risk: competitive pressure and budget limitations.",
+    "Cloud infrastructure must meet compliance and security requirements.",
+    "Revenue and ROI look strong; pricing strategy is competitive.",
+    "Timeline milestone 3 covers the database migration.",
+    "This is an excellent, robust and scalable design, but expensive."
+]
+
+
+def synthetic_transcript(total_words: int = 100_000, messages: int = 40,
+                         seed: int = 7) -> Tuple[List[Dict], str]:
+    """Deterministic conversation plus report totalling roughly `total_words` words"""
+    rng = random.Random(seed)
+    engine = ConversationAnalytics()
+    vocabulary = FILLER_WORDS + sorted(
+        engine.business_keywords | engine.technical_keywords | engine.risk_keywords
+        | engine.positive_keywords | engine.negative_keywords
+    )
+
+    def passage(words: int) -> str:
+        parts = []
+        count = 0
+        while count < words:
+            if rng.random() < 0.1:
+                phrase = rng.choice(PHRASES)
+            else:
+                phrase = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(5, 12))) + "."
+            parts.append(phrase)
+            count += len(phrase.split())
+        return " ".join(parts)
+
+    per_message = total_words // (messages + 1)
+    conversation = [
+        {"role": "assistant", "agent_type": AGENT_TYPES[i % len(AGENT_TYPES)], "content": passage(per_message)}
+        for i in range(messages)
+    ]
+    return conversation, passage(per_message)
+
+
+def time_call(func, *args, repeat: int = 5) -> float:
+    """Best wall-clock time of `repeat` calls, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(total_words: int = 100_000):
+    """Print timings for the analytics entry points"""
+    conversation, report = synthetic_transcript(total_words)
+    words = sum(len(msg["content"].split()) for msg in conversation) + len(report.split())
+    engine = ConversationAnalytics()
+
+    print(f"Transcript: {len(conversation)} messages, {words:,} words")
+    elapsed = time_call(lambda: asdict(engine.analyze_conversation(conversation, report)))
+    print(f"analyze_conversation: {elapsed:8.1f} ms  ({words / elapsed * 1000:,.0f} words/s)")
+    for name in ("key_topics", "success_probability"):
+        elapsed = time_call(lambda: getattr(engine.analyze_conversation(conversation, report), name))
+        print(f"  {name} only: {elapsed:.1f} ms")
+    
+    def stream_all():
+        stream = engine.stream()
+        for message in conversation:
+            stream.add_message(message)
+        return stream
+    
+    elapsed = time_call(stream_all)
+    print(f"stream add_message:   {elapsed:8.1f} ms  ({elapsed / len(conversation):.2f} ms per message)")
+    stream = stream_all()
+    elapsed = time_call(stream.snapshot, report)
+    print(f"stream snapshot:      {elapsed:8.1f} ms")
+
+
+def run_batch(sessions: int = 1000, words_per_session: int = 1500):
+    """Print sessions/minute for rescoring, every field of every result computed"""
+    distinct = [synthetic_transcript(words_per_session, messages=8, seed=seed) for seed in range(min(sessions, 50))]
+    transcripts = [distinct[i % len(distinct)] for i in range(sessions)]
+    engine = ConversationAnalytics()
+
+    print(f"Batch: {sessions:,} sessions of ~{words_per_session:,} words")
+    elapsed = time_call(lambda: [asdict(engine.analyze_conversation(c, r)) for c, r in transcripts], repeat=3)
+    print(f"rescoring:            {elapsed:8.1f} ms  ({sessions / elapsed * 60_000:,.0f} sessions/min)")
+
+
+def run_sampled(words: int = 1_000_000):
+    """Print approximate against exact analytics time for a 10-round x 10-agent transcript"""
+    from analytics.sampling import SampledAnalytics
+
+    conversation, report = synthetic_transcript(words, messages=100)
+    for index, message in enumerate(conversation):
+        message["round_number"] = index // 10 + 1
+        message["agent_type"] = f"{AGENT_TYPES[index % len(AGENT_TYPES)]} {index % 10}"
+    engine = ConversationAnalytics()
+    sampled = SampledAnalytics(engine)
+
+    print(f"Sampled: {len(conversation)} messages, ~{words:,} words")
+    exact = time_call(lambda: asdict(engine.analyze_conversation(conversation, report)), repeat=1)
+    print(f"exact:                {exact:8.1f} ms")
+    elapsed = time_call(lambda: asdict(sampled.analyze(conversation, report)), repeat=3)
+    print(f"sampled:              {elapsed:8.1f} ms  ({exact / elapsed:.0f}x faster)")
+
+
+def run_scorer(sessions: int = 1000, words_per_session: int = 1500):
+    """Print learned-scorer inference throughput, batched against one session at a time"""
+    from analytics.engine import LazyAnalytics
+    from analytics.scorer import SIGNALS, feature_matrix, train_scorer
+
+    distinct = [synthetic_transcript(words_per_session, messages=8, seed=seed) for seed in range(min(sessions, 50))]
+    transcripts = [distinct[i % len(distinct)] for i in range(sessions)]
+    engine = ConversationAnalytics()
+
+    # Synthetic labels: the heuristic scores plus noise, just to get trained weights
+    rng = random.Random(11)
+    heuristic = [engine.analyze_conversation(conversation, report) for conversation, report in distinct]
+    outcomes = [(result.success_probability + rng.uniform(-0.1, 0.1) > 0.5,
+                 min(1.0, max(0.0, result.quality_score + rng.uniform(-0.1, 0.1))))
+                for result in heuristic]
+    scorer = train_scorer(distinct, outcomes, engine)
+    engine.set_scorer(scorer)
+
+    analyses = [LazyAnalytics(engine, conversation, report) for conversation, report in transcripts]
+    signals = [analysis.signals() for analysis in analyses]
+    features = [analysis.scanned_features() for analysis in analyses]
+
+    def score_batch():
+        return scorer.predict(feature_matrix([feature.word_counts for feature in features],
+                                             [feature.total_words for feature in features],
+                                             {name: [row[name] for row in signals] for name in SIGNALS}))
+
+    def score_each():
+        return [scorer.score(feature.word_counts, feature.total_words, row)
+                for feature, row in zip(features, signals)]
+
+    print(f"Learned scorer: {sessions:,} sessions of ~{words_per_session:,} words")
+    elapsed = time_call(score_batch, repeat=3)
+    print(f"batched inference:    {elapsed:8.1f} ms  ({sessions / elapsed * 60_000:,.0f} sessions/min)")
+    elapsed = time_call(score_each, repeat=3)
+    print(f"per-session inference:{elapsed:8.1f} ms  ({sessions / elapsed * 60_000:,.0f} sessions/min)")
+    elapsed = time_call(lambda: [asdict(engine.analyze_conversation(c, r)) for c, r in transcripts], repeat=3)
+    print(f"rescoring + model:    {elapsed:8.1f} ms  ({sessions / elapsed * 60_000:,.0f} sessions/min)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    run_batch(int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
+    run_sampled()
+    run_scorer(int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
@@ -0,0 +1,145 @@
+"""
+Analytics Cache - Memoized conversation analytics
+Repeat analyses of the same conversation (API polling, dashboard reruns,
+report generation) are served from a content-hash keyed cache
+"""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from analytics.engine import AnalyticsResult, ConversationAnalytics, analytics_engine
+from analytics.sampling import sampled_analytics
+from utils.content_store import content_digest
+
+
+def analytics_key(engine: ConversationAnalytics, conversation: List[Dict], report: Optional[str]) -> str:
+    """Stable hash of everything analyze_conversation reads, plus the engine and scorer versions.
+
+    A message's `content_hash`, when present, is trusted to be the digest of
+    its content (simulate_conversation records it that way), so keying a
+    long transcript only hashes the report.
+    """
+    digest = hashlib.sha256(engine.version.encode())
+    # A trained scorer changes quality and success, so results are keyed by the model too
+    scorer = engine.learned_scorer()
+    if scorer is not None:
+        digest.update(scorer.digest.encode())
+    for message in conversation:
+        content_hash = message.get('content_hash') or content_digest(message.get('content', ''))
+        digest.update(repr((message.get('agent_type'), message.get('round_number'), content_hash)).encode())
+    digest.update(content_digest(report or "").encode())
+    return digest.hexdigest()
+
+
+def session_analytics_record(result: AnalyticsResult, key: Optional[str] = None) -> Dict:
+    """SessionAnalytics column values for an AnalyticsResult; `key` also stores it for the cache"""
+    record = {
+        'key_topics': result.key_topics,
+        'topic_frequencies': result.topic_frequencies,
+        'round_metrics': result.round_metrics,
+        'agent_participation': result.agent_metrics,
+        'sentiment_analysis': {
+            'sentiment_score': result.sentiment_score,
+            'confidence_score': result.confidence_score,
+            'quality_score': result.quality_score,
+            'risk_factors': result.risk_factors
+        },
+        'technical_complexity': result.technical_complexity,
+        'market_opportunity_score': result.business_value,
+        'success_probability': result.success_probability,
+        'recommended_next_steps': result.recommendations
+    }
+    if key is not None:
+        record['analytics_key'] = key
+        record['analytics_result'] = asdict(result)
+    return record
+
+
+class AnalyticsCache:
+    """Content-addressed memo of analyze_conversation results.
+
+    A bounded LRU in memory answers repeats with one hash and a lookup. With
+    a DatabaseManager, results are also stored on the session's
+    SessionAnalytics row and found again by key after a restart. Callers get
+    their own copy of a cached result. With a SampledAnalytics sampler,
+    misses on transcripts above its threshold are estimated, not analyzed
+    in full.
+    """
+
+    def __init__(self, engine: Optional[ConversationAnalytics] = None, max_entries: int = 256,
+                 db_manager=None, sampler=None):
+        self.engine = engine or analytics_engine
+        self.sampler = sampler
+        self.max_entries = max_entries
+        self.db_manager = db_manager
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, AnalyticsResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, conversation: List[Dict], report: Optional[str]) -> str:
+        return analytics_key(self.engine, conversation, report)
+
+    def get(self, key: str) -> Optional[AnalyticsResult]:
+        """Cached result for a key from memory, then the database"""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+
+        if self.db_manager is not None:
+            stored = self.db_manager.get_cached_analytics(key)
+            if stored is not None:
+                result = AnalyticsResult(**stored)
+                self._remember(key, result)
+                with self._lock:
+                    self.hits += 1
+                return copy.deepcopy(result)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, result: AnalyticsResult, session_id: Optional[int] = None):
+        """Cache a result; with a session id it is also persisted to SessionAnalytics"""
+        self._remember(key, copy.deepcopy(result))
+        if self.db_manager is not None and session_id is not None:
+            self.db_manager.bulk_save_session_analytics({session_id: session_analytics_record(result, key)})
+
+    def analyze(self, conversation: List[Dict], report: Optional[str],
+                session_id: Optional[int] = None) -> AnalyticsResult:
+        """analyze_conversation, computed once per distinct conversation and report"""
+        key = self.key(conversation, report)
+        result = self.get(key)
+        if result is None:
+            if self.sampler is not None:
+                result = self.sampler.analyze(conversation, report)
+            else:
+                result = self.engine.analyze_conversation(conversation, report)
+            self.put(key, result, session_id)
+        return result
+
+    def _remember(self, key: str, result: AnalyticsResult):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop the in-memory tier"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global cache over the global analytics engine; very long transcripts are sampled
+analytics_cache = AnalyticsCache(sampler=sampled_analytics)
@@ -3,17 +3,34 @@ Enterprise AI Agent Consortium - Analytics Engine
 Advanced analytics for conversation quality, sentiment analysis, and business insights
 """
 
+import os
 import re
+import copy
 import json
+import threading
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime
-import numpy as np
 from collections import Counter
+from itertools import accumulate, compress
+from operator import add
+
+from utils.content_store import content_digest
+
+# Trained quality/success model (see analytics.scorer); absent, the heuristics apply
+SCORER_PATH = os.getenv("ANALYTICS_SCORER",
+                        os.path.join(os.path.dirname(os.path.abspath(__file__)), "scorer.npz"))
 
 @dataclass
 class AnalyticsResult:
-    """Container for analytics results"""
+    """Container for analytics results
+    
+    Results from analyze_conversation are lazy: each field is computed on
+    first access by a LazyAnalytics resolver. asdict() and comparisons read
+    every field, so they see the same values an eager result has. A deep
+    copy stays lazy: it shares the resolver, and each result then keeps its
+    own copy of every value it reads.
+    """
     sentiment_score: float
     confidence_score: float
     quality_score: float
@@ -23,11 +40,455 @@ class AnalyticsResult:
     risk_factors: List[str]
     success_probability: float
     recommendations: List[str]
+    round_metrics: List[Dict] = field(default_factory=list)         # One entry per conversation round
+    agent_metrics: Dict[str, Dict] = field(default_factory=dict)     # Agent type -> metrics for its messages
+    topic_frequencies: Dict[str, int] = field(default_factory=dict)  # Occurrences of each key topic
+    confidence_intervals: Dict[str, Tuple[float, float]] = field(default_factory=dict)  # Only for sampled results
+    
+    @classmethod
+    def lazy(cls, resolver: 'LazyAnalytics') -> 'AnalyticsResult':
+        """Result whose fields are computed by `resolver` when first read"""
+        result = cls.__new__(cls)
+        result._resolver = resolver
+        return result
+    
+    def __getattr__(self, name):
+        # Only reached for fields that have not been computed yet
+        resolver = self.__dict__.get('_resolver')
+        if resolver is None or name not in _RESULT_FIELDS:
+            raise AttributeError(name)
+        value = resolver.resolve(name)
+        if resolver.shared:
+            value = copy.deepcopy(value)
+        setattr(self, name, value)
+        if _RESULT_FIELDS.issubset(self.__dict__):
+            del self._resolver  # Fully computed; release the intermediates
+        return value
+    
+    def __deepcopy__(self, memo):
+        resolver = self.__dict__.get('_resolver')
+        if resolver is None:
+            return type(self)(**asdict(self))
+        resolver.shared = True
+        result = type(self).lazy(resolver)
+        for name in _RESULT_FIELDS.intersection(self.__dict__):
+            setattr(result, name, copy.deepcopy(self.__dict__[name], memo))
+        return result
+
+_RESULT_FIELDS = frozenset(f.name for f in fields(AnalyticsResult))
+
+class TextFeatures:
+    """Tokens and counts shared by every metric, built in one pass over the transcript
+    
+    `words` are the lowercased whitespace tokens that keyword metrics match
+    against; `terms` are word-character runs used for topic extraction. Terms
+    never span whitespace, so they are derived from the distinct words rather
+    than by scanning the text a second time.
+    """
+    
+    _TERM = re.compile(r'\b\w+\b')
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.lowered = text.lower()
+        self.words = self.lowered.split()
+        self.total_words = len(self.words)
+        self.word_counts = Counter(self.words)
+        self.pattern_counts = None  # Filled in by ScoringMatcher on first use
+        self._term_counts = None    # Derived from word_counts on first use
+    
+    @property
+    def term_counts(self) -> Counter:
+        if self._term_counts is None:
+            self._term_counts = Counter()
+            self._add_terms(self._term_counts, self.word_counts)
+        return self._term_counts
+    
+    @term_counts.setter
+    def term_counts(self, counts: Counter):
+        self._term_counts = counts
+    
+    @classmethod
+    def _add_terms(cls, term_counts: Counter, word_counts: Counter):
+        # Distinct words keep first-occurrence order, so term order (and
+        # therefore topic tie-breaking) matches a scan of the whole text
+        for word, count in word_counts.items():
+            for term in cls._TERM.findall(word):
+                term_counts[term] += count
+    
+    @classmethod
+    def from_conversation(cls, conversation: List[Dict], report: Optional[str]) -> 'TextFeatures':
+        """Features for the combined conversation and report text"""
+        return cls(" ".join([msg.get('content', '') for msg in conversation]) + " " + (report or ""))
+    
+    def keyword_count(self, keywords) -> int:
+        """Occurrences of any of `keywords` among the words"""
+        counts = self.word_counts
+        return sum(counts[keyword] for keyword in keywords if keyword in counts)
+    
+    def mentions(self, term: str) -> bool:
+        """Whether `term` occurs anywhere in the lowercased text"""
+        return term in self.lowered
+
+class StreamingFeatures(TextFeatures):
+    """TextFeatures for text that arrives in chunks
+    
+    Counts are updated in O(chunk length) and the full text is never kept.
+    Substring mentions are only tracked for the `watch_terms` given up front.
+    Chunks must be joined by whitespace, as conversation messages are.
+    """
+    
+    def __init__(self, matcher: 'ScoringMatcher', watch_terms):
+        self.total_words = 0
+        self.word_counts = Counter()
+        self.term_counts = Counter()
+        self.pattern_counts = None
+        self._patterns = ScoringStream(matcher)
+        self._watch_terms = set(watch_terms)
+        self._mentioned = set()
+    
+    def _add_counts(self, chunk: str):
+        lowered = chunk.lower()
+        chunk_counts = Counter(lowered.split())
+        self.total_words += sum(chunk_counts.values())
+        self.word_counts.update(chunk_counts)
+        self._add_terms(self.term_counts, chunk_counts)
+        for term in self._watch_terms - self._mentioned:
+            if term in lowered:
+                self._mentioned.add(term)
+    
+    def extend(self, chunk: str):
+        """Add the next chunk of text"""
+        self._add_counts(chunk)
+        self._patterns.feed(chunk)
+    
+    def snapshot(self, final_chunk: str = "") -> 'StreamingFeatures':
+        """Features for the text so far plus `final_chunk` as its end; self is unchanged"""
+        snapshot = copy.copy(self)
+        snapshot.word_counts = self.word_counts.copy()
+        snapshot.term_counts = self.term_counts.copy()
+        snapshot._mentioned = set(self._mentioned)
+        snapshot._add_counts(final_chunk)
+        patterns = self._patterns.finish(final_chunk)
+        snapshot.pattern_counts = patterns.matcher._grouped(patterns.counts)
+        snapshot.chunk_pattern_counts = patterns.chunk_counts
+        return snapshot
+    
+    def mentions(self, term: str) -> bool:
+        return term in self._mentioned
+
+class SegmentFeatures(TextFeatures):
+    """Features for a group of messages, such as one round or one agent's turns
+    
+    Built by adding up each message's own TextFeatures. Scoring pattern
+    counts come from the scan of the whole conversation: a group gets the
+    matches that start in its messages (see ConversationBreakdown).
+    """
+    
+    def __init__(self, matcher: 'ScoringMatcher', watch_terms):
+        self.total_words = 0
+        self.word_counts = Counter()
+        self.term_counts = Counter()
+        self.pattern_counts = None
+        self.message_indices = []
+        self.message_count = 0
+        self.total_length = 0
+        self.agent_types = set()
+        self._watch_terms = watch_terms
+        self._mentioned = set()
+    
+    def add(self, index: int, message: Dict, features: TextFeatures):
+        """Add the conversation's `index`-th message and its features"""
+        self.total_words += features.total_words
+        self.word_counts.update(features.word_counts)
+        self.term_counts.update(features.term_counts)
+        self.message_indices.append(index)
+        for term in self._watch_terms - self._mentioned:
+            if features.mentions(term):
+                self._mentioned.add(term)
+        self.message_count += 1
+        self.total_length += len(features.text)
+        self.agent_types.add(message.get('agent_type', 'unknown'))
+    
+    def mentions(self, term: str) -> bool:
+        return term in self._mentioned
+
+class ConversationBreakdown:
+    """Per-round and per-agent SegmentFeatures for a conversation
+    
+    Messages are grouped by their `round_number` and `agent_type` keys;
+    messages without either (the user's prompt) are left out. Pattern
+    counts are not scanned here: resolve_patterns() takes each message's
+    counts from the session-wide scan, so scoring stays a single pass.
+    """
+    
+    def __init__(self, matcher: 'ScoringMatcher', watch_terms):
+        self.matcher = matcher
+        self.watch_terms = set(watch_terms)
+        self.message_total = 0
+        self.rounds: Dict[int, SegmentFeatures] = {}
+        self.agents: Dict[str, SegmentFeatures] = {}
+    
+    def add_message(self, message: Dict):
+        """Fold the next conversation message into its round and agent groups"""
+        index = self.message_total
+        self.message_total += 1
+        round_number = message.get('round_number')
+        agent_type = message.get('agent_type')
+        if round_number is None and agent_type is None:
+            return
+        
+        features = TextFeatures(message.get('content', ''))
+        for groups, key in ((self.rounds, round_number), (self.agents, agent_type)):
+            if key is not None:
+                if key not in groups:
+                    groups[key] = SegmentFeatures(self.matcher, self.watch_terms)
+                groups[key].add(index, message, features)
+    
+    def resolve_patterns(self, message_counts: List[List[int]]):
+        """Set every group's pattern counts from per-message (ungrouped) counts"""
+        empty = [0] * len(self.matcher._compiled)
+        for segment in (*self.rounds.values(), *self.agents.values()):
+            totals = empty
+            for index in segment.message_indices:
+                totals = list(map(add, totals, message_counts[index]))
+            segment.pattern_counts = self.matcher._grouped(totals)
+
+# Where a scoring pattern can start matching; ScoringMatcher only tries a
+# pattern at tokens that satisfy its anchor
+def starts_with(*words):
+    """Match begins at one of these words (case-insensitive)"""
+    return ('word', words)
+
+def precedes(*words):
+    """Match begins at the word right before one of these words"""
+    return ('before', words)
+
+NUMBER = ('number',)            # Word starting with a digit
+CAPITALIZED = ('capitalized',)  # Word starting with A-Z
+PERCENT = ('percent',)          # Digit run immediately before a '%'
+DOLLAR = ('dollar',)            # Dollar sign
+
+class ScoringMatcher:
+    """Counts matches of many scoring patterns in a single scan of the text
+    
+    The text is split once into words and dollar signs, each followed by
+    its separator. Every distinct token is classified once against the
+    anchor tables, and only tokens where a pattern can start are visited,
+    trying that pattern's own precompiled regex anchored at that position.
+    Counts follow re.findall semantics: matches of one pattern never overlap.
+    """
+    
+    _TOKEN = re.compile(r'(\$|\w+)([^\w$]*)')
+    _FIRST_TOKEN = re.compile(r'[\w$]')
+    _CACHE_LIMIT = 200_000
+    
+    def __init__(self, pattern_groups: Dict[str, List[Tuple[str, int, Tuple]]]):
+        self.groups = {}
+        self._compiled = []
+        self._by_word = {}
+        self._by_next_word = {}
+        self._by_kind = {'number': [], 'capitalized': [], 'percent': [], 'dollar': []}
+        
+        for group, patterns in pattern_groups.items():
+            self.groups[group] = []
+            for regex, flags, anchor in patterns:
+                index = len(self._compiled)
+                self._compiled.append(re.compile(regex, flags))
+                self.groups[group].append(index)
+                kind = anchor[0]
+                if kind == 'word':
+                    for word in anchor[1]:
+                        self._by_word.setdefault(word, []).append(index)
+                elif kind == 'before':
+                    for word in anchor[1]:
+                        self._by_next_word.setdefault(word, []).append(index)
+                else:
+                    self._by_kind[kind].append(index)
+        
+        # token -> anchor info, or None when no pattern can start at it
+        self._token_anchors = {}
+    
+    def count(self, text: str) -> Dict[str, List[int]]:
+        """Per-pattern match counts, grouped as the patterns were registered"""
+        counts = [0] * len(self._compiled)
+        self._scan(text, 0, len(text), counts, [0] * len(self._compiled), None)
+        return self._grouped(counts)
+    
+    def count_slices(self, text: str, boundaries: List[int]) -> List[List[int]]:
+        """Per-pattern counts for each text[boundaries[i]:boundaries[i + 1]], from one scan
+        
+        Boundaries must fall between tokens. A match is counted in the slice
+        where it starts, so the slices add up to count(text).
+        """
+        ends = [0] * len(self._compiled)
+        previous_start = None
+        slices = []
+        for pos, endpos in zip(boundaries, boundaries[1:]):
+            counts = [0] * len(self._compiled)
+            previous_start = self._scan(text, pos, endpos, counts, ends, previous_start)
+            slices.append(counts)
+        return slices
+    
+    def _grouped(self, counts: List[int]) -> Dict[str, List[int]]:
+        return {group: [counts[index] for index in indices] for group, indices in self.groups.items()}
+    
+    def _classify(self, token: str):
+        """(word patterns, next-word patterns, kind patterns, ends in a digit) for a token"""
+        if token == '$':
+            return (None, None, self._by_kind['dollar'], False)
+        key = token.casefold()
+        first = token[0]
+        if first.isdecimal():
+            kind = self._by_kind['number']
+        elif 'A' <= first <= 'Z':
+            kind = self._by_kind['capitalized']
+        else:
+            kind = None
+        anchors = (self._by_word.get(key), self._by_next_word.get(key), kind or None, token[-1].isdecimal())
+        return anchors if any(anchors) else None
+    
+    def _scan(self, text: str, pos: int, endpos: int, counts: List[int], ends: List[int],
+              previous_start: Optional[int]) -> Optional[int]:
+        """Count matches at tokens starting in text[pos:endpos]
+        
+        `ends` holds each pattern's last match end and `previous_start` the
+        start of the word before `pos`; both are updated so a later call can
+        carry on from `endpos`. Returns the new `previous_start`.
+        """
+        first = self._FIRST_TOKEN.search(text, pos, endpos)
+        if first is None:
+            return previous_start
+        tokens, separators = zip(*self._TOKEN.findall(text, first.start(), endpos))
+        starts = list(accumulate(map(add, map(len, tokens), map(len, separators)), initial=first.start()))
+        
+        table = self._token_anchors
+        if len(table) > self._CACHE_LIMIT:
+            table = self._token_anchors = {}
+        for token in set(tokens).difference(table):
+            table[token] = self._classify(token)
+        anchors = list(map(table.__getitem__, tokens))
+        
+        compiled = self._compiled
+        
+        def attempt(indices, pos):
+            for index in indices:
+                if pos >= ends[index]:
+                    match = compiled[index].match(text, pos)
+                    if match:
+                        counts[index] += 1
+                        ends[index] = match.end()
+        
+        percent = self._by_kind['percent']
+        
+        for i in compress(range(len(tokens)), anchors):
+            word, next_word, kind, ends_in_digit = anchors[i]
+            start = starts[i]
+            if word:
+                attempt(word, start)
+            if next_word:
+                if i == 0:
+                    if previous_start is not None:
+                        attempt(next_word, previous_start)
+                elif tokens[i - 1] != '$':
+                    attempt(next_word, starts[i - 1])
+            if kind:
+                attempt(kind, start)
+            if ends_in_digit and separators[i][:1] == '%':
+                token = tokens[i]
+                digits = len(token) - 1
+                while digits > 0 and token[digits - 1].isdecimal():
+                    digits -= 1
+                attempt(percent, start + digits)
+        
+        return None if tokens[-1] == '$' else starts[len(tokens) - 1]
+
+def _last_token_start(text: str, floor: int) -> int:
+    """Start of the last ScoringMatcher token in text[floor:], or floor if there is none"""
+    i = len(text)
+    while i > floor and not (text[i - 1].isalnum() or text[i - 1] in '_$'):
+        i -= 1
+    if i > floor and text[i - 1] == '$':
+        return i - 1
+    while i > floor and (text[i - 1].isalnum() or text[i - 1] == '_'):
+        i -= 1
+    return i
+
+class ScoringStream:
+    """Resumable ScoringMatcher scan over text that arrives in chunks
+    
+    A match can run from one word into the next, so the last token seen is
+    held back until more text arrives, and the word before it is kept for
+    patterns anchored on the preceding word. Only that short tail is
+    buffered; counts match a single scan of the concatenated chunks.
+    `chunk_counts` splits them by the chunk each match starts in, which
+    needs chunks to start with whitespace (the first one excepted).
+    """
+    
+    def __init__(self, matcher: ScoringMatcher):
+        self.matcher = matcher
+        self.chunk_counts: List[List[int]] = []
+        self._ends = [0] * len(matcher._compiled)
+        self._tail = ""
+        self._tail_chunk = None  # Chunk the held-back token arrived in
+        self._resume = 0
+        self._previous_start = None
+    
+    @property
+    def counts(self) -> List[int]:
+        """Per-pattern counts over every chunk"""
+        return [sum(column) for column in zip(*self.chunk_counts)] or [0] * len(self._ends)
+    
+    def feed(self, chunk: str, final: bool = False):
+        """Scan the next chunk; `final` also scans the held-back tail"""
+        text = self._tail + chunk
+        boundary = len(self._tail)
+        stop = len(text) if final else _last_token_start(text, self._resume)
+        self.chunk_counts.append([0] * len(self._ends))
+        
+        # The held-back token is credited to the chunk it came from
+        previous_start = self._previous_start
+        if self._tail_chunk is not None:
+            previous_start = self.matcher._scan(text, self._resume, min(stop, boundary),
+                                                self.chunk_counts[self._tail_chunk], self._ends, previous_start)
+        previous_start = self.matcher._scan(text, max(self._resume, boundary), stop,
+                                            self.chunk_counts[-1], self._ends, previous_start)
+        if boundary <= stop < len(text):
+            self._tail_chunk = len(self.chunk_counts) - 1
+        
+        keep = stop if previous_start is None else min(previous_start, stop)
+        self._tail = text[keep:]
+        self._resume = stop - keep
+        self._previous_start = None if previous_start is None else previous_start - keep
+        self._ends = [end - keep for end in self._ends]
+    
+    def finish(self, final_chunk: str = "") -> 'ScoringStream':
+        """Copy with `final_chunk` fed as the end of the text; self is unchanged"""
+        finished = copy.copy(self)
+        finished.chunk_counts = list(self.chunk_counts)
+        if self._tail_chunk is not None:
+            finished.chunk_counts[self._tail_chunk] = list(self.chunk_counts[self._tail_chunk])
+        finished._ends = list(self._ends)
+        finished.feed(final_chunk, final=True)
+        return finished
+    
+    def result(self, final_chunk: str = "") -> Dict[str, List[int]]:
+        """Grouped counts with `final_chunk` as the end of the text; self is unchanged"""
+        return self.matcher._grouped(self.finish(final_chunk).counts)
 
 class ConversationAnalytics:
     """Advanced analytics for conversation analysis"""
     
-    def __init__(self):
+    # Bump when scoring logic changes; keyword, pattern and risk table edits
+    # already change `version` on their own
+    ALGORITHM_VERSION = 1
+    
+    def __init__(self, scorer_path: Optional[str] = None):
+        # Trained quality/success model, loaded on first use (see analytics.scorer)
+        self.scorer_path = scorer_path
+        self._scorer = None
+        self._scorer_loaded = False
+        
         # Business and technical keywords
         self.business_keywords = {
             'revenue', 'profit', 'market', 'customer', 'growth', 'roi', 'monetization',
@@ -53,41 +514,139 @@ class ConversationAnalytics:
             'poor', 'weak', 'ineffective', 'problematic', 'risky', 'challenging',
             'limited', 'difficult', 'expensive', 'slow', 'complex', 'uncertain'
         }
+        
+        # Regex scoring patterns, all counted in one scan by ScoringMatcher
+        self.scoring_patterns = {
+            'technical': [
+                (r'\b\w+\s+(architecture|framework|database|api)\b', re.IGNORECASE,
+                 precedes('architecture', 'framework', 'database', 'api')),
+                (r'\b(micro)?services?\b', re.IGNORECASE,
+                 starts_with('service', 'services', 'microservice', 'microservices')),
+                (r'\bcloud\s+\w+\b', re.IGNORECASE, starts_with('cloud')),
+                (r'\b\w+\s+integration\b', re.IGNORECASE, precedes('integration'))
+            ],
+            'value': [
+                (r'\$[\d,]+', re.IGNORECASE, DOLLAR),  # Dollar amounts
+                (r'\b\d+%\s+(growth|increase|improvement)\b', re.IGNORECASE, NUMBER),
+                (r'\b(roi|return|profit|revenue)\b', re.IGNORECASE,
+                 starts_with('roi', 'return', 'profit', 'revenue')),
+                (r'\b(market\s+size|target\s+market)\b', re.IGNORECASE, starts_with('market', 'target'))
+            ],
+            'specificity': [
+                (r'\b\d+\b', 0, NUMBER),                 # Numbers
+                (r'\d+%', 0, PERCENT),                    # Percentages
+                (r'\b[A-Z][a-z]+\b', 0, CAPITALIZED)      # Proper nouns
+            ],
+            'completeness': [
+                (r'\b(market|target|customer|user)\b', re.IGNORECASE,
+                 starts_with('market', 'target', 'customer', 'user')),
+                (r'\b(competition|competitor|competitive)\b', re.IGNORECASE,
+                 starts_with('competition', 'competitor', 'competitive')),
+                (r'\b(technical|technology|architecture)\b', re.IGNORECASE,
+                 starts_with('technical', 'technology', 'architecture')),
+                (r'\b(timeline|schedule|milestone)\b', re.IGNORECASE,
+                 starts_with('timeline', 'schedule', 'milestone')),
+                (r'\b(budget|cost|price|financial)\b', re.IGNORECASE,
+                 starts_with('budget', 'cost', 'price', 'financial')),
+                (r'\b(risk|challenge|mitigation)\b', re.IGNORECASE,
+                 starts_with('risk', 'challenge', 'mitigation'))
+            ],
+            'actionability': [
+                (r'\b(implement|develop|create|build|design)\b', re.IGNORECASE,
+                 starts_with('implement', 'develop', 'create', 'build', 'design')),
+                (r'\b(should|must|need to|recommend)\b', re.IGNORECASE,
+                 starts_with('should', 'must', 'need', 'recommend')),
+                (r'\b(next steps?|action items?)\b', re.IGNORECASE, starts_with('next', 'action')),
+                (r'\b(phase \d+|step \d+|milestone)\b', re.IGNORECASE,
+                 starts_with('phase', 'step', 'milestone'))
+            ]
+        }
+        self.pattern_matcher = ScoringMatcher(self.scoring_patterns)
+        
+        # Risk factor raised when any of its terms appears in the text
+        self.risk_indicators = [
+            (['scalability', 'performance', 'security'], "Technical scalability and performance considerations"),
+            (['competitive', 'market', 'competition'], "Competitive market dynamics"),
+            (['budget', 'timeline', 'resource'], "Resource and timeline constraints"),
+            (['compliance', 'regulation', 'legal'], "Regulatory and compliance requirements")
+        ]
+        
+        # Identifies which results this configuration produces, e.g. for cached analytics
+        self.version = content_digest(repr((
+            self.ALGORITHM_VERSION,
+            [sorted(keywords) for keywords in (self.business_keywords, self.technical_keywords, self.risk_keywords,
+                                               self.positive_keywords, self.negative_keywords)],
+            self.scoring_patterns,
+            self.risk_indicators
+        )))[:16]
     
     def analyze_conversation(self, conversation: List[Dict], report: str) -> AnalyticsResult:
-        """Comprehensive conversation analysis"""
-        
-        # Combine all text for analysis
-        all_text = " ".join([msg.get('content', '') for msg in conversation]) + " " + (report or "")
-        
-        # Perform various analyses
-        sentiment = self._analyze_sentiment(all_text)
-        confidence = self._calculate_confidence(conversation)
-        quality = self._assess_quality(conversation, report)
-        topics = self._extract_topics(all_text)
-        tech_complexity = self._assess_technical_complexity(all_text)
-        business_value = self._assess_business_value(all_text)
-        risks = self._identify_risk_factors(all_text)
-        success_prob = self._calculate_success_probability(sentiment, confidence, quality, business_value)
-        recommendations = self._generate_recommendations(sentiment, quality, tech_complexity, business_value)
-        
-        return AnalyticsResult(
-            sentiment_score=sentiment,
-            confidence_score=confidence,
-            quality_score=quality,
-            key_topics=topics,
-            technical_complexity=tech_complexity,
-            business_value=business_value,
-            risk_factors=risks,
-            success_probability=success_prob,
-            recommendations=recommendations
-        )
+        """Comprehensive conversation analysis
+        
+        Fields are computed when first read, so asking only for e.g.
+        key_topics skips the pattern scan and the round/agent breakdown.
+        """
+        return LazyAnalytics(self, conversation, report).result()
+    
+    def learned_scorer(self):
+        """Installed LearnedScorer for this engine, or None when the heuristics apply"""
+        if not self._scorer_loaded:
+            path = self.scorer_path or SCORER_PATH
+            if os.path.exists(path):
+                from analytics.scorer import load_scorer  # scipy and scikit-learn only once a model file exists
+                self._scorer = load_scorer(self.version, path)
+            self._scorer_loaded = True
+        return self._scorer
     
-    def _analyze_sentiment(self, text: str) -> float:
+    def set_scorer(self, scorer):
+        """Use `scorer` (None for the heuristics) instead of the model file"""
+        self._scorer = scorer
+        self._scorer_loaded = True
+    
+    def stream(self) -> 'StreamingAnalytics':
+        """Accumulator that updates these analytics message by message"""
+        return StreamingAnalytics(self)
+    
+    def breakdown(self, conversation: List[Dict] = ()) -> ConversationBreakdown:
+        """Per-round and per-agent features for `conversation`; more messages can be added"""
+        breakdown = ConversationBreakdown(self.pattern_matcher,
+                                          [term for terms, _ in self.risk_indicators for term in terms])
+        for message in conversation:
+            breakdown.add_message(message)
+        return breakdown
+    
+    def breakdown_metrics(self, breakdown: ConversationBreakdown) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """(round metrics in round order, agent type -> metrics); patterns must be resolved"""
+        round_metrics = [dict(round=round_number, **self._segment_metrics(segment))
+                         for round_number, segment in sorted(breakdown.rounds.items())]
+        agent_metrics = {agent_type: self._segment_metrics(segment)
+                         for agent_type, segment in breakdown.agents.items()}
+        return round_metrics, agent_metrics
+    
+    def _segment_metrics(self, features: SegmentFeatures) -> Dict:
+        """Session metrics restricted to one round's or one agent's messages"""
+        return {
+            'messages': features.message_count,
+            'words': features.total_words,
+            'sentiment_score': self._analyze_sentiment(features),
+            'confidence_score': self._confidence_from_stats(features.message_count, features.total_length,
+                                                            len(features.agent_types)),
+            'quality_score': self._assess_quality(features),
+            'technical_complexity': self._assess_technical_complexity(features),
+            'business_value': self._assess_business_value(features),
+            'risk_factors': self._identify_risk_factors(features)
+        }
+    
+    def _pattern_counts(self, features: TextFeatures) -> Dict[str, List[int]]:
+        """Scoring pattern counts for the text, computed once per analysis"""
+        if features.pattern_counts is None:
+            features.pattern_counts = self.pattern_matcher.count(features.text)
+        return features.pattern_counts
+    
+    def _analyze_sentiment(self, features: TextFeatures) -> float:
         """Analyze sentiment polarity (-1 to 1)"""
-        words = text.lower().split()
-        positive_count = sum(1 for word in words if word in self.positive_keywords)
-        negative_count = sum(1 for word in words if word in self.negative_keywords)
+        positive_count = features.keyword_count(self.positive_keywords)
+        negative_count = features.keyword_count(self.negative_keywords)
         
         total_sentiment_words = positive_count + negative_count
         if total_sentiment_words == 0:
@@ -102,9 +661,17 @@ class ConversationAnalytics:
             return 0.0
         
         # Factors affecting confidence
-        message_count = len(conversation)
-        avg_message_length = np.mean([len(msg.get('content', '')) for msg in conversation])
-        agent_diversity = len(set(msg.get('agent_type', 'unknown') for msg in conversation))
+        return self._confidence_from_stats(
+            message_count=len(conversation),
+            total_length=sum(len(msg.get('content', '')) for msg in conversation),
+            agent_diversity=len(set(msg.get('agent_type', 'unknown') for msg in conversation))
+        )
+    
+    def _confidence_from_stats(self, message_count: int, total_length: int, agent_diversity: int) -> float:
+        """Confidence from running message statistics"""
+        if message_count == 0:
+            return 0.0
+        avg_message_length = total_length / message_count
         
         # Normalize factors
         message_factor = min(1.0, message_count / 10)  # Ideal around 10 messages
@@ -114,26 +681,23 @@ class ConversationAnalytics:
         confidence = (message_factor * 0.4 + length_factor * 0.3 + diversity_factor * 0.3)
         return round(confidence, 2)
     
-    def _assess_quality(self, conversation: List[Dict], report: str) -> float:
+    def _assess_quality(self, features: TextFeatures) -> float:
         """Assess overall conversation quality"""
-        if not conversation and not report:
+        if features.total_words == 0:
             return 0.0
         
-        all_text = " ".join([msg.get('content', '') for msg in conversation]) + " " + (report or "")
-        
         # Quality indicators
-        specificity = self._measure_specificity(all_text)
-        completeness = self._measure_completeness(all_text)
-        actionability = self._measure_actionability(all_text)
+        specificity = self._measure_specificity(features)
+        completeness = self._measure_completeness(features)
+        actionability = self._measure_actionability(features)
         
         quality = (specificity * 0.3 + completeness * 0.4 + actionability * 0.3)
         return round(quality, 2)
     
-    def _extract_topics(self, text: str) -> List[str]:
+    def _extract_topics(self, features: TextFeatures) -> List[str]:
         """Extract key topics from text"""
         # Simple keyword-based topic extraction
-        words = re.findall(r'\b\w+\b', text.lower())
-        word_freq = Counter(words)
+        word_freq = features.term_counts
         
         # Filter out common words and extract meaningful topics
         stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an'}
@@ -142,70 +706,41 @@ class ConversationAnalytics:
         
         return meaningful_words[:8]  # Return top 8 topics
     
-    def _assess_technical_complexity(self, text: str) -> float:
+    def _assess_technical_complexity(self, features: TextFeatures) -> float:
         """Assess technical complexity of the project"""
-        words = text.lower().split()
-        tech_word_count = sum(1 for word in words if word in self.technical_keywords)
+        tech_word_count = features.keyword_count(self.technical_keywords)
         
         # Also look for technical patterns
-        patterns = [
-            r'\b\w+\s+(architecture|framework|database|api)\b',
-            r'\b(micro)?services?\b',
-            r'\bcloud\s+\w+\b',
-            r'\b\w+\s+integration\b'
-        ]
-        
-        pattern_matches = sum(len(re.findall(pattern, text, re.IGNORECASE)) for pattern in patterns)
+        pattern_matches = sum(self._pattern_counts(features)['technical'])
         
         # Normalize to 0-1 scale
-        total_words = len(words)
+        total_words = features.total_words
         if total_words == 0:
             return 0.0
         
         complexity = min(1.0, (tech_word_count + pattern_matches * 2) / (total_words * 0.1))
         return round(complexity, 2)
     
-    def _assess_business_value(self, text: str) -> float:
+    def _assess_business_value(self, features: TextFeatures) -> float:
         """Assess business value and commercial potential"""
-        words = text.lower().split()
-        business_word_count = sum(1 for word in words if word in self.business_keywords)
+        business_word_count = features.keyword_count(self.business_keywords)
         
         # Look for value indicators
-        value_patterns = [
-            r'\$[\d,]+',  # Dollar amounts
-            r'\b\d+%\s+(growth|increase|improvement)\b',
-            r'\b(roi|return|profit|revenue)\b',
-            r'\b(market\s+size|target\s+market)\b'
-        ]
-        
-        value_matches = sum(len(re.findall(pattern, text, re.IGNORECASE)) for pattern in value_patterns)
+        value_matches = sum(self._pattern_counts(features)['value'])
         
-        total_words = len(words)
+        total_words = features.total_words
         if total_words == 0:
             return 0.0
         
         business_value = min(1.0, (business_word_count + value_matches * 3) / (total_words * 0.1))
         return round(business_value, 2)
     
-    def _identify_risk_factors(self, text: str) -> List[str]:
+    def _identify_risk_factors(self, features: TextFeatures) -> List[str]:
         """Identify potential risk factors"""
-        risks = []
-        
-        # Technical risks
-        if any(word in text.lower() for word in ['scalability', 'performance', 'security']):
-            risks.append("Technical scalability and performance considerations")
-        
-        # Market risks
-        if any(word in text.lower() for word in ['competitive', 'market', 'competition']):
-            risks.append("Competitive market dynamics")
-        
-        # Resource risks
-        if any(word in text.lower() for word in ['budget', 'timeline', 'resource']):
-            risks.append("Resource and timeline constraints")
-        
-        # Regulatory risks
-        if any(word in text.lower() for word in ['compliance', 'regulation', 'legal']):
-            risks.append("Regulatory and compliance requirements")
+        risks = [
+            label for terms, label in self.risk_indicators
+            if any(features.mentions(term) for term in terms)
+        ]
         
         return risks[:5]  # Return top 5 risks
     
@@ -255,57 +790,239 @@ class ConversationAnalytics:
         
         return recommendations[:5]
     
-    def _measure_specificity(self, text: str) -> float:
+    def _measure_specificity(self, features: TextFeatures) -> float:
         """Measure how specific and detailed the content is"""
         # Look for specific indicators: numbers, percentages, proper nouns, technical terms
-        numbers = len(re.findall(r'\b\d+\b', text))
-        percentages = len(re.findall(r'\d+%', text))
-        proper_nouns = len(re.findall(r'\b[A-Z][a-z]+\b', text))
+        numbers, percentages, proper_nouns = self._pattern_counts(features)['specificity']
         
-        total_words = len(text.split())
+        total_words = features.total_words
         if total_words == 0:
             return 0.0
         
         specificity = min(1.0, (numbers + percentages * 2 + proper_nouns) / (total_words * 0.1))
         return specificity
     
-    def _measure_completeness(self, text: str) -> float:
+    def _measure_completeness(self, features: TextFeatures) -> float:
         """Measure how complete the analysis is"""
         # Check for key business analysis components
-        components = [
-            r'\b(market|target|customer|user)\b',
-            r'\b(competition|competitor|competitive)\b',
-            r'\b(technical|technology|architecture)\b',
-            r'\b(timeline|schedule|milestone)\b',
-            r'\b(budget|cost|price|financial)\b',
-            r'\b(risk|challenge|mitigation)\b'
-        ]
+        components = self._pattern_counts(features)['completeness']
         
-        covered_components = sum(1 for pattern in components 
-                               if re.search(pattern, text, re.IGNORECASE))
+        covered_components = sum(1 for matches in components if matches)
         
         completeness = covered_components / len(components)
         return completeness
     
-    def _measure_actionability(self, text: str) -> float:
+    def _measure_actionability(self, features: TextFeatures) -> float:
         """Measure how actionable the recommendations are"""
         # Look for action-oriented language
-        action_patterns = [
-            r'\b(implement|develop|create|build|design)\b',
-            r'\b(should|must|need to|recommend)\b',
-            r'\b(next steps?|action items?)\b',
-            r'\b(phase \d+|step \d+|milestone)\b'
-        ]
-        
-        action_words = sum(len(re.findall(pattern, text, re.IGNORECASE)) 
-                          for pattern in action_patterns)
+        action_words = sum(self._pattern_counts(features)['actionability'])
         
-        total_words = len(text.split())
+        total_words = features.total_words
         if total_words == 0:
             return 0.0
         
         actionability = min(1.0, action_words / (total_words * 0.05))
         return actionability
 
+class LazyAnalytics:
+    """Computes AnalyticsResult fields on demand from shared intermediates
+    
+    Each field is computed once, after the fields it depends on (success
+    probability needs sentiment, confidence, quality and business value).
+    The text features, the pattern scan and the round/agent breakdown are
+    likewise built only when a requested field needs them, and at most once.
+    Any of them can be supplied up front instead of a conversation.
+    """
+    
+    def __init__(self, engine: ConversationAnalytics, conversation: List[Dict] = (),
+                 report: Optional[str] = None, features: Optional[TextFeatures] = None,
+                 confidence: Optional[float] = None, breakdown: Optional[ConversationBreakdown] = None,
+                 intervals: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.engine = engine
+        self.conversation = conversation
+        self.report = report
+        self.values = {}
+        # Set once results copied from one another read these values
+        self.shared = False
+        self._features = features
+        self._confidence = confidence
+        self._breakdown = breakdown
+        self._intervals = intervals
+        self._slice_counts = None
+        self._lock = threading.RLock()
+    
+    def result(self) -> AnalyticsResult:
+        return AnalyticsResult.lazy(self)
+    
+    def resolve(self, name: str):
+        """Value of one AnalyticsResult field, computing its dependencies first"""
+        with self._lock:
+            if name not in self.values:
+                self.values[name] = getattr(self, '_' + name)()
+            return self.values[name]
+    
+    # Shared intermediates
+    
+    def features(self) -> TextFeatures:
+        if self._features is None:
+            self._features = TextFeatures.from_conversation(self.conversation, self.report)
+        return self._features
+    
+    def scanned_features(self) -> TextFeatures:
+        """Features with scoring pattern counts filled in"""
+        features = self.features()
+        if features.pattern_counts is None:
+            totals = [sum(column) for column in zip(*self.slice_counts())]
+            features.pattern_counts = self.engine.pattern_matcher._grouped(totals)
+        return features
+    
+    def slice_counts(self) -> List[List[int]]:
+        """Pattern counts per message (then the report) from one scan of the text"""
+        if self._slice_counts is None:
+            # Messages are joined by single spaces, then the report follows
+            boundaries = [0]
+            for message in self.conversation:
+                boundaries.append(boundaries[-1] + len(message.get('content', '')) + 1)
+            text = self.features().text
+            boundaries.append(len(text))
+            self._slice_counts = self.engine.pattern_matcher.count_slices(text, boundaries)
+        return self._slice_counts
+    
+    def breakdown(self) -> ConversationBreakdown:
+        if self._breakdown is None:
+            breakdown = self.engine.breakdown(self.conversation)
+            breakdown.resolve_patterns(self.slice_counts())
+            self._breakdown = breakdown
+        return self._breakdown
+    
+    # Fields
+    
+    def _sentiment_score(self) -> float:
+        return self.engine._analyze_sentiment(self.features())
+    
+    def _confidence_score(self) -> float:
+        if self._confidence is None:
+            self._confidence = self.engine._calculate_confidence(self.conversation)
+        return self._confidence
+    
+    def signals(self) -> Dict[str, float]:
+        """Heuristic scores a learned scorer reads; none depend on its outputs"""
+        features = self.scanned_features()
+        return {
+            'sentiment_score': self.resolve('sentiment_score'),
+            'confidence_score': self.resolve('confidence_score'),
+            'specificity': self.engine._measure_specificity(features),
+            'completeness': self.engine._measure_completeness(features),
+            'actionability': self.engine._measure_actionability(features),
+            'technical_complexity': self.resolve('technical_complexity'),
+            'business_value': self.resolve('business_value')
+        }
+    
+    def learned_scores(self) -> Dict[str, float]:
+        """Learned scorer outputs by field; empty when no scorer is installed"""
+        if 'learned' not in self.values:
+            scorer = self.engine.learned_scorer()
+            if scorer is None:
+                self.values['learned'] = {}
+            else:
+                features = self.scanned_features()
+                self.values['learned'] = scorer.score(features.word_counts, features.total_words, self.signals())
+        return self.values['learned']
+    
+    def _quality_score(self) -> float:
+        learned = self.learned_scores()
+        if 'quality_score' in learned:
+            return learned['quality_score']
+        return self.engine._assess_quality(self.scanned_features())
+    
+    def _key_topics(self) -> List[str]:
+        return self.engine._extract_topics(self.features())
+    
+    def _technical_complexity(self) -> float:
+        return self.engine._assess_technical_complexity(self.scanned_features())
+    
+    def _business_value(self) -> float:
+        return self.engine._assess_business_value(self.scanned_features())
+    
+    def _risk_factors(self) -> List[str]:
+        return self.engine._identify_risk_factors(self.features())
+    
+    def _success_probability(self) -> float:
+        learned = self.learned_scores()
+        if 'success_probability' in learned:
+            return learned['success_probability']
+        return self.engine._calculate_success_probability(
+            *map(self.resolve, ('sentiment_score', 'confidence_score', 'quality_score', 'business_value'))
+        )
+    
+    def _recommendations(self) -> List[str]:
+        return self.engine._generate_recommendations(
+            *map(self.resolve, ('sentiment_score', 'quality_score', 'technical_complexity', 'business_value'))
+        )
+    
+    def _round_metrics(self) -> List[Dict]:
+        return self._segment_metrics()[0]
+    
+    def _agent_metrics(self) -> Dict[str, Dict]:
+        return self._segment_metrics()[1]
+    
+    def _segment_metrics(self) -> Tuple[List[Dict], Dict[str, Dict]]:
+        if 'segments' not in self.values:
+            self.values['segments'] = self.engine.breakdown_metrics(self.breakdown())
+        return self.values['segments']
+    
+    def _topic_frequencies(self) -> Dict[str, int]:
+        term_counts = self.features().term_counts
+        return {topic: term_counts[topic] for topic in self.resolve('key_topics')}
+    
+    def _confidence_intervals(self) -> Dict[str, Tuple[float, float]]:
+        return dict(self._intervals or {})
+
+class StreamingAnalytics:
+    """Incremental analytics for a conversation that is still running
+    
+    add_message updates word, keyword, topic and pattern counts, risk
+    mentions, confidence factors and the message's round and agent groups
+    in O(message length). snapshot() returns the same AnalyticsResult
+    analyze_conversation would for the messages so far, so live views never
+    need a full pass over the transcript. Safe to snapshot from one thread
+    while another adds messages.
+    """
+    
+    def __init__(self, engine: ConversationAnalytics):
+        self.engine = engine
+        risk_terms = [term for terms, _ in engine.risk_indicators for term in terms]
+        self.features = StreamingFeatures(engine.pattern_matcher, risk_terms)
+        self.message_count = 0
+        self.total_length = 0
+        self.agent_types = set()
+        self.breakdown = engine.breakdown()
+        self._lock = threading.Lock()
+    
+    def add_message(self, message: Dict):
+        """Fold one conversation message into the running analytics"""
+        content = message.get('content', '')
+        with self._lock:
+            self.features.extend(content if self.message_count == 0 else " " + content)
+            self.message_count += 1
+            self.total_length += len(content)
+            self.agent_types.add(message.get('agent_type', 'unknown'))
+            self.breakdown.add_message(message)
+    
+    def snapshot(self, report: Optional[str] = None) -> AnalyticsResult:
+        """Current analytics, optionally including the final report"""
+        with self._lock:
+            features = self.features.snapshot(" " + (report or ""))
+            confidence = self.engine._confidence_from_stats(self.message_count, self.total_length,
+                                                            len(self.agent_types))
+            self.breakdown.resolve_patterns(features.chunk_pattern_counts)
+            analysis = LazyAnalytics(self.engine, features=features, confidence=confidence,
+                                     breakdown=self.breakdown)
+            # Round and agent groups are live state, so they are scored under the lock;
+            # the other fields only read the snapshot's own features
+            analysis.resolve('round_metrics')
+            analysis.resolve('agent_metrics')
+        return analysis.result()
+
 # Global analytics engine instance
 analytics_engine = ConversationAnalytics()
\ No newline at end of file
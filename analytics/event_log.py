@@ -0,0 +1,284 @@
+"""
+Analytics Event Log - Durable per-worker record of AI analytics interactions
+Every logged interaction is appended to a segment-rotated binary log; on each
+rotation the engine writes a compacted snapshot of its state and the segments
+it covers are deleted. A restarting process loads the newest snapshot and
+replays only the segments after it, and an aggregator merges every worker's
+state into fleet-wide analytics
+
+Layout: <root>/<worker>/segment-NNNNNNNN.log and snapshot-NNNNNNNN.npz
+    segment  = header (magic 8s, format version I), then records
+    record   = payload length (I), CRC-32 of the payload (I), payload
+    payload  = timestamp, response time, queue wait, time to first token (d),
+               success (?), message and response length (Q), then the agent,
+               provider and model names (H lengths + UTF-8)
+    snapshot NNNNNNNN = engine state after every segment numbered below NNNNNNNN
+
+Each process claims the first worker-N directory nobody holds a lock on (or
+ANALYTICS_WORKER_ID), so a restarted worker picks up a freed directory.
+
+Fleet view with:  python -m analytics.event_log [root]
+"""
+
+import json
+import logging
+import math
+import os
+import struct
+import sys
+import zlib
+from itertools import count
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, every process shares worker-0
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOG_ROOT = os.getenv("ANALYTICS_EVENT_LOG", "analytics_events")
+SEGMENT_BYTES = 1 << 20
+
+SEGMENT_MAGIC = b"AEVLOG\x00\x00"
+LOG_FORMAT = 1
+_SEGMENT_HEADER = struct.Struct("<8sI")
+_RECORD_HEADER = struct.Struct("<II")
+_INTERACTION = struct.Struct("<dddd?QQHHH")
+
+Interaction = Tuple[float, str, int, int, float, bool, Optional[str], Optional[str], Optional[float], Optional[float]]
+
+
+def encode_interaction(timestamp: float, agent_name: str, message_length: int, response_length: int,
+                       response_time: float, success: bool, provider: Optional[str], model: Optional[str],
+                       queue_wait: Optional[float], time_to_first_token: Optional[float]) -> bytes:
+    """Payload for one interaction; unmeasured phases are stored as NaN, missing names as empty"""
+    names = [(name or "").encode("utf-8") for name in (agent_name, provider, model)]
+    return _INTERACTION.pack(
+        timestamp, response_time,
+        math.nan if queue_wait is None else queue_wait,
+        math.nan if time_to_first_token is None else time_to_first_token,
+        success, message_length, response_length, *(len(name) for name in names)
+    ) + b"".join(names)
+
+
+def decode_interaction(payload: bytes) -> Interaction:
+    """Arguments of AIAnalyticsEngine._apply for one payload"""
+    (timestamp, response_time, queue_wait, time_to_first_token, success, message_length, response_length,
+     agent_length, provider_length, model_length) = _INTERACTION.unpack_from(payload)
+    offset = _INTERACTION.size
+    names = []
+    for length in (agent_length, provider_length, model_length):
+        names.append(payload[offset:offset + length].decode("utf-8"))
+        offset += length
+    agent_name, provider, model = names
+    return (timestamp, agent_name, message_length, response_length, response_time, success,
+            provider or None, model or None,
+            None if math.isnan(queue_wait) else queue_wait,
+            None if math.isnan(time_to_first_token) else time_to_first_token)
+
+
+def _read_records(path: str) -> Tuple[List[bytes], int]:
+    """Payloads of a segment and the offset where its valid records end.
+
+    A torn or corrupt record ends the segment: it can only be the last
+    write of a process that died mid-append.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _SEGMENT_HEADER.size or _SEGMENT_HEADER.unpack_from(data) != (SEGMENT_MAGIC, LOG_FORMAT):
+        return [], 0
+    payloads = []
+    offset = _SEGMENT_HEADER.size
+    while offset + _RECORD_HEADER.size <= len(data):
+        length, checksum = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            break
+        payloads.append(payload)
+        offset = start + length
+    return payloads, offset
+
+
+def _numbered(directory: str, prefix: str, suffix: str) -> List[int]:
+    numbers = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(suffix):
+            try:
+                numbers.append(int(name[len(prefix):-len(suffix)]))
+            except ValueError:
+                continue
+    return sorted(numbers)
+
+
+class EventLog:
+    """One worker's segments and snapshots.
+
+    Records are written unbuffered, so a crashed process loses at most the
+    record it was writing; that torn tail is cut off when the log is
+    reopened. Opened with writable=False the log is only read, which is
+    how the aggregator looks at other workers' directories.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = SEGMENT_BYTES, writable: bool = True,
+                 lock_file=None):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.sequence = None
+        self._file = None
+        self._size = 0
+        self._lock_file = lock_file
+        if writable:
+            os.makedirs(directory, exist_ok=True)
+            self._open_tail()
+
+    def _path(self, prefix: str, sequence: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"{prefix}{sequence:08d}{suffix}")
+
+    def segments(self) -> List[int]:
+        return _numbered(self.directory, "segment-", ".log")
+
+    def snapshots(self) -> List[int]:
+        return _numbered(self.directory, "snapshot-", ".npz")
+
+    def _open_tail(self):
+        segments = self.segments()
+        if not segments:
+            snapshots = self.snapshots()
+            self._start_segment(snapshots[-1] if snapshots else 0)
+            return
+        self.sequence = segments[-1]
+        path = self._path("segment-", self.sequence, ".log")
+        _, valid_end = _read_records(path)
+        if valid_end == 0:
+            os.remove(path)
+            self._start_segment(self.sequence)
+            return
+        self._file = open(path, "r+b", buffering=0)
+        self._file.truncate(valid_end)
+        self._file.seek(valid_end)
+        self._size = valid_end
+
+    def _start_segment(self, sequence: int):
+        if self._file is not None:
+            self._file.close()
+        self.sequence = sequence
+        self._file = open(self._path("segment-", sequence, ".log"), "ab", buffering=0)
+        self._file.write(_SEGMENT_HEADER.pack(SEGMENT_MAGIC, LOG_FORMAT))
+        self._size = _SEGMENT_HEADER.size
+
+    def append(self, payload: bytes) -> bool:
+        """Write one record; True when it filled the segment and a new one was started"""
+        record = _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        self._file.write(record)
+        self._size += len(record)
+        if self._size >= self.segment_bytes:
+            self._start_segment(self.sequence + 1)
+            return True
+        return False
+
+    def write_snapshot(self, data: bytes):
+        """Store state covering every segment before the current one, then drop what it replaces"""
+        path = self._path("snapshot-", self.sequence, ".npz")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        for sequence in self.segments():
+            if sequence < self.sequence:
+                os.remove(self._path("segment-", sequence, ".log"))
+        for sequence in self.snapshots():
+            if sequence < self.sequence:
+                os.remove(self._path("snapshot-", sequence, ".npz"))
+
+    def read_snapshot(self, sequence: int) -> bytes:
+        with open(self._path("snapshot-", sequence, ".npz"), "rb") as f:
+            return f.read()
+
+    def replay(self, start: int = 0) -> Iterator[bytes]:
+        """Payloads of every record in segments numbered `start` and up, in order"""
+        for sequence in self.segments():
+            if sequence >= start:
+                yield from _read_records(self._path("segment-", sequence, ".log"))[0]
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+def claim_worker_directory(root: str) -> Optional[Tuple[str, object]]:
+    """(directory, open lock file) of a worker directory this process now owns"""
+    worker_id = os.getenv("ANALYTICS_WORKER_ID")
+    names = [worker_id] if worker_id else (f"worker-{n}" for n in count())
+    for name in names:
+        directory = os.path.join(root, name)
+        os.makedirs(directory, exist_ok=True)
+        lock_file = open(os.path.join(directory, "lock"), "a")
+        if fcntl is None:
+            return directory, lock_file
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return directory, lock_file
+        except OSError:
+            lock_file.close()  # Held by a live process
+    return None
+
+
+def open_worker_log(root: Optional[str] = None, segment_bytes: int = SEGMENT_BYTES) -> Optional[EventLog]:
+    """This process's event log under `root`, or None when logging is off or the directory is unusable"""
+    root = EVENT_LOG_ROOT if root is None else root
+    if not root:
+        return None
+    try:
+        claimed = claim_worker_directory(root)
+        if claimed is None:
+            logger.warning(f"Analytics worker directory {os.getenv('ANALYTICS_WORKER_ID')} is in use - "
+                           f"analytics will not be persisted")
+            return None
+        directory, lock_file = claimed
+        return EventLog(directory, segment_bytes, lock_file=lock_file)
+    except OSError as e:
+        logger.warning(f"Could not open analytics event log under {root}: {e} - analytics will not be persisted")
+        return None
+
+
+def worker_directories(root: Optional[str] = None) -> List[str]:
+    root = EVENT_LOG_ROOT if root is None else root
+    if not os.path.isdir(root):
+        return []
+    return [os.path.join(root, name) for name in sorted(os.listdir(root))
+            if os.path.isdir(os.path.join(root, name))]
+
+
+def aggregate(root: Optional[str] = None, history_size: int = 1000):
+    """Fleet-wide AIAnalyticsEngine: every worker's snapshot and tail, merged"""
+    from analytics.ai_analytics import AIAnalyticsEngine
+
+    fleet = AIAnalyticsEngine(history_size)
+    for directory in worker_directories(root):
+        # A live worker may compact its segments mid-read; its newer snapshot covers them
+        for attempt in range(3):
+            worker = AIAnalyticsEngine(history_size)
+            try:
+                worker.restore(EventLog(directory, writable=False))
+                break
+            except FileNotFoundError:
+                continue
+        else:
+            logger.warning(f"Skipping analytics worker {directory}: its log kept changing while being read")
+            continue
+        fleet.merge(worker)
+    return fleet
+
+
+def main(root: Optional[str] = None):
+    print(json.dumps(aggregate(root).get_system_analytics(), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
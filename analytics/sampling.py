@@ -0,0 +1,305 @@
+"""
+Sampled Analytics - Approximate conversation analytics for very large transcripts
+Estimates the ratio-based metrics from a stratified sample of sentences, so
+analysis time stays bounded however long the agents' outputs get
+"""
+
+import random
+import re
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from analytics.engine import (AnalyticsResult, ConversationAnalytics, ConversationBreakdown, LazyAnalytics,
+                              TextFeatures, analytics_engine)
+
+# Sampling units are sentences, also cut near every multiple of this many characters
+SENTENCE_WINDOW = 600
+SENTENCE_ENDS = '.!?\n'
+# A cut moves forward to the next whitespace within this many characters, so words stay whole
+CUT_SLACK = 100
+_WHITESPACE = re.compile(r'\s')
+REPORT_CELL = ('report',)
+
+
+def transcript_length(conversation: List[Dict], report: Optional[str]) -> int:
+    """Characters of message and report text an analysis reads"""
+    return sum(len(message.get('content', '')) for message in conversation) + len(report or "")
+
+
+class SampledFeatures(TextFeatures):
+    """TextFeatures estimated from weighted sample units
+
+    Each unit is a sentence (or a whole short stratum) with its own
+    features and pattern counts, and a weight that scales it up to the
+    stratum it was drawn from. Word and pattern counts are the weighted
+    sums, so every engine metric reads them unchanged. Message statistics
+    are exact, since they never need the text.
+    """
+
+    def __init__(self, pattern_size: int, watch_terms):
+        self.total_words = 0
+        self.word_counts = Counter()
+        self.pattern_counts = None
+        self.message_count = 0
+        self.total_length = 0
+        self.agent_types = set()
+        self._estimated_words = 0.0
+        self._pattern_totals = [0.0] * pattern_size
+        self._term_counts = None
+        self._watch_terms = watch_terms
+        self._mentioned = set()
+
+    @property
+    def term_counts(self) -> Counter:
+        # Estimated occurrences, rounded to whole counts for topic frequencies
+        if self._term_counts is None:
+            estimates = Counter()
+            self._add_terms(estimates, self.word_counts)
+            self._term_counts = Counter({term: round(count) for term, count in estimates.items()})
+        return self._term_counts
+
+    def add_unit(self, weight: float, features: TextFeatures, pattern_counts: List[int]):
+        """Add one sample unit scaled by `weight`"""
+        self._estimated_words += weight * features.total_words
+        word_counts = self.word_counts
+        for word, count in features.word_counts.items():
+            word_counts[word] += weight * count
+        self._pattern_totals = [total + weight * count for total, count in zip(self._pattern_totals, pattern_counts)]
+        for term in self._watch_terms - self._mentioned:
+            if features.mentions(term):
+                self._mentioned.add(term)
+
+    def add_messages(self, messages: List[Dict]):
+        """Count messages exactly; their text is only sampled"""
+        for message in messages:
+            self.message_count += 1
+            self.total_length += len(message.get('content', ''))
+            self.agent_types.add(message.get('agent_type', 'unknown'))
+
+    def finish(self, matcher) -> 'SampledFeatures':
+        self.total_words = round(self._estimated_words)
+        self.pattern_counts = matcher._grouped(self._pattern_totals)
+        return self
+
+    def mentions(self, term: str) -> bool:
+        return term in self._mentioned
+
+
+class _ReplicateFeatures(TextFeatures):
+    """Just the totals the ratio metrics read, for one bootstrap replicate"""
+
+    def __init__(self, total_words: float, keyword_totals: Dict[frozenset, float],
+                 pattern_counts: Dict[str, List[float]]):
+        self.total_words = total_words
+        self.keyword_totals = keyword_totals
+        self.pattern_counts = pattern_counts
+
+    def keyword_count(self, keywords) -> float:
+        return self.keyword_totals[frozenset(keywords)]
+
+
+class SampledAnalytics:
+    """analyze_conversation estimated from a stratified sample of sentences.
+
+    Messages are stratified by (round, agent); the report and the prompt
+    are strata of their own. Each stratum gets a share of the sample in
+    proportion to its length (at least `min_per_stratum`) and strata
+    shorter than a few sentences are read whole. The sampling units are
+    the sentences of each message, cut into pieces at fixed positions
+    (near every SENTENCE_WINDOW characters), so they partition the text
+    and a unit never depends on where it was hit. Units are picked at
+    uniformly random character offsets, i.e. with probability proportional
+    to their length, and weighted by the inverse of that probability, so
+    estimates of counts over whole units are unbiased. A keyword or
+    pattern that straddles a cut is missed in both pieces. The work done
+    per call is bounded by the sample size rather than the transcript
+    length.
+
+    Sentiment, quality (specificity and actionability), technical
+    complexity, business value and success probability carry a bootstrap
+    confidence interval in `confidence_intervals`. Topics, topic
+    frequencies and risk factors come from the sampled text only, and
+    completeness only sees components that were sampled. Transcripts
+    under `exact_below` characters are analyzed exactly.
+    """
+
+    def __init__(self, engine: Optional[ConversationAnalytics] = None, sample_size: int = 1000,
+                 exact_below: int = 200_000, min_per_stratum: int = 5, replicates: int = 200,
+                 level: float = 0.95, seed: int = 0):
+        self.engine = engine or analytics_engine
+        self.sample_size = sample_size
+        self.exact_below = exact_below
+        self.min_per_stratum = min_per_stratum
+        self.replicates = replicates
+        self.level = level
+        self.seed = seed
+        self.watch_terms = {term for terms, _ in self.engine.risk_indicators for term in terms}
+        self.keyword_sets = [frozenset(keywords) for keywords in (
+            self.engine.positive_keywords, self.engine.negative_keywords, self.engine.technical_keywords,
+            self.engine.business_keywords, self.engine.risk_keywords
+        )]
+
+    def analyze(self, conversation: List[Dict], report: Optional[str]) -> AnalyticsResult:
+        """Approximate analytics; exact (with no intervals) for transcripts under the threshold"""
+        if transcript_length(conversation, report) < self.exact_below:
+            return self.engine.analyze_conversation(conversation, report)
+
+        engine = self.engine
+        strata = self._strata(conversation, report)
+        units = self._sample(strata)
+
+        # One scan of the sampled text gives every unit its pattern counts
+        texts = [text for _, _, text, _ in units]
+        boundaries = list(accumulate([len(text) + 1 for text in texts], initial=0))
+        boundaries[-1] -= 1
+        pattern_counts = engine.pattern_matcher.count_slices("\n".join(texts), boundaries)
+        unit_features = [TextFeatures(text) for text in texts]
+
+        pattern_size = len(engine.pattern_matcher._compiled)
+        session = SampledFeatures(pattern_size, self.watch_terms)
+        session.add_messages(conversation)
+        breakdown = ConversationBreakdown(engine.pattern_matcher, self.watch_terms)
+        for cell, messages in strata.items():
+            if cell == REPORT_CELL or cell == (None, None):
+                continue
+            for groups, key in ((breakdown.rounds, cell[0]), (breakdown.agents, cell[1])):
+                if key is not None:
+                    if key not in groups:
+                        groups[key] = SampledFeatures(pattern_size, self.watch_terms)
+                    groups[key].add_messages(messages)
+
+        for (cell, weight, _, _), features, counts in zip(units, unit_features, pattern_counts):
+            session.add_unit(weight, features, counts)
+            if cell != REPORT_CELL:
+                for groups, key in ((breakdown.rounds, cell[0]), (breakdown.agents, cell[1])):
+                    if key is not None:
+                        groups[key].add_unit(weight, features, counts)
+        session.finish(engine.pattern_matcher)
+        for segment in (*breakdown.rounds.values(), *breakdown.agents.values()):
+            segment.finish(engine.pattern_matcher)
+        breakdown.message_total = len(conversation)
+
+        confidence = engine._calculate_confidence(conversation)
+        intervals = self._intervals(units, unit_features, pattern_counts, confidence)
+        return LazyAnalytics(engine, features=session, confidence=confidence, breakdown=breakdown,
+                             intervals=intervals).result()
+
+    def _strata(self, conversation: List[Dict], report: Optional[str]) -> Dict[Tuple, List[Dict]]:
+        """Messages grouped by (round, agent); the report is a stratum of its own"""
+        strata = {}
+        for message in conversation:
+            strata.setdefault((message.get('round_number'), message.get('agent_type')), []).append(message)
+        if report:
+            strata[REPORT_CELL] = [{'content': report}]
+        return strata
+
+    def _sample(self, strata: Dict[Tuple, List[Dict]]) -> List[Tuple[Tuple, float, str, bool]]:
+        """(stratum, weight, text, sampled) units; unsampled ones are whole messages"""
+        rng = random.Random(self.seed)
+        lengths = {cell: sum(len(message.get('content', '')) for message in messages)
+                   for cell, messages in strata.items()}
+        total = sum(lengths.values()) or 1
+
+        units = []
+        for cell, messages in strata.items():
+            length = lengths[cell]
+            draws = max(self.min_per_stratum, round(self.sample_size * length / total))
+            if length <= draws * SENTENCE_WINDOW // 4:
+                # Short enough to read whole
+                units.extend((cell, 1.0, message.get('content', ''), False) for message in messages)
+                continue
+
+            contents = [message.get('content', '') for message in messages]
+            starts = [0]
+            for content in contents:
+                starts.append(starts[-1] + len(content))
+            for _ in range(draws):
+                offset = rng.randrange(length)
+                index = bisect_right(starts, offset) - 1
+                content = contents[index]
+                start, end = self._sentence(content, offset - starts[index])
+                # Picked with probability (end - start) / length; weight by the inverse
+                units.append((cell, length / (draws * (end - start)), content[start:end], True))
+        return units
+
+    @staticmethod
+    def _cut(text: str, index: int) -> int:
+        """Position of the index-th fixed cut in `text`"""
+        position = index * SENTENCE_WINDOW
+        if position <= 0 or position >= len(text):
+            return min(max(position, 0), len(text))
+        space = _WHITESPACE.search(text, position, position + CUT_SLACK)
+        return space.start() if space else position
+
+    @classmethod
+    def _sentence(cls, text: str, offset: int) -> Tuple[int, int]:
+        """Span of the unit containing `offset`: its sentence, within the fixed cuts around it"""
+        index = offset // SENTENCE_WINDOW
+        floor = cls._cut(text, index)
+        if offset < floor:
+            index -= 1
+            floor = cls._cut(text, index)
+        ceiling = cls._cut(text, index + 1)
+        found = max(text.rfind(char, floor, offset) for char in SENTENCE_ENDS)
+        start = found + 1 if found != -1 else floor
+        ends = [position for position in (text.find(char, offset, ceiling) for char in SENTENCE_ENDS)
+                if position != -1]
+        end = min(ends) + 1 if ends else ceiling
+        return start, end
+
+    def _intervals(self, units, unit_features: List[TextFeatures], pattern_counts: List[List[int]],
+                   confidence: float) -> Dict[str, Tuple[float, float]]:
+        """Percentile bootstrap intervals, resampling units within their strata"""
+        engine = self.engine
+        values = np.array([
+            [features.total_words, *(features.keyword_count(keywords) for keywords in self.keyword_sets), *counts]
+            for features, counts in zip(unit_features, pattern_counts)
+        ], dtype=float)
+        weights = np.array([weight for _, weight, _, _ in units])
+
+        # Replicate weights: each stratum's units drawn again with replacement
+        rng = np.random.default_rng(self.seed)
+        replicate_weights = np.ones((self.replicates, len(units)))  # Units read whole have no sampling error
+        cells = {}
+        for index, (cell, _, _, sampled) in enumerate(units):
+            if sampled:
+                cells.setdefault(cell, []).append(index)
+        for indices in cells.values():
+            draws = rng.multinomial(len(indices), [1 / len(indices)] * len(indices), size=self.replicates)
+            replicate_weights[:, indices] = draws * weights[indices]
+        totals = replicate_weights @ values
+
+        learned = engine.learned_scorer() is not None
+        estimates = {name: [] for name in ('sentiment_score', 'quality_score', 'technical_complexity',
+                                           'business_value', 'success_probability')}
+        keyword_columns = range(1, 1 + len(self.keyword_sets))
+        for row in totals.tolist():
+            features = _ReplicateFeatures(
+                row[0], {keywords: row[column] for keywords, column in zip(self.keyword_sets, keyword_columns)},
+                engine.pattern_matcher._grouped(row[1 + len(self.keyword_sets):])
+            )
+            sentiment = engine._analyze_sentiment(features)
+            quality = engine._assess_quality(features)
+            business_value = engine._assess_business_value(features)
+            estimates['sentiment_score'].append(sentiment)
+            estimates['quality_score'].append(quality)
+            estimates['technical_complexity'].append(engine._assess_technical_complexity(features))
+            estimates['business_value'].append(business_value)
+            estimates['success_probability'].append(
+                engine._calculate_success_probability(sentiment, confidence, quality, business_value)
+            )
+        if learned:
+            # Intervals of the heuristic formulas would not describe learned scores
+            del estimates['quality_score'], estimates['success_probability']
+
+        tail = (1 - self.level) / 2 * 100
+        return {name: tuple(round(float(bound), 2) for bound in np.percentile(samples, [tail, 100 - tail]))
+                for name, samples in estimates.items()}
+
+
+# Global sampler over the global analytics engine
+sampled_analytics = SampledAnalytics()
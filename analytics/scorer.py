@@ -0,0 +1,220 @@
+"""
+Learned Scorer - Trained quality and success models for conversation analytics
+Replaces the hand-weighted quality and success formulas with linear models
+fitted offline on stored sessions that have recorded outcomes
+
+Model file: weights, intercepts and JSON metadata in one .npz (no pickle)
+    features = hashed word frequencies + the engine's heuristic signals
+    quality  = ridge regression on ConversationSession.outcome_quality
+    success  = logistic regression on ConversationSession.outcome_success
+
+Train with:  python -m analytics.scorer [path]
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from analytics.engine import SCORER_PATH, ConversationAnalytics, LazyAnalytics, analytics_engine
+
+logger = logging.getLogger(__name__)
+
+SCORER_FORMAT = 1
+
+# Heuristic scores fed to the models next to the word frequencies
+SIGNALS = ('sentiment_score', 'confidence_score', 'specificity', 'completeness',
+           'actionability', 'technical_complexity', 'business_value')
+HASH_FEATURES = 2 ** 18
+MIN_LABELED_SESSIONS = 20
+
+_hasher = None
+
+
+def _feature_hasher():
+    """Shared stateless word hasher; scikit-learn is only imported once a model is in use"""
+    global _hasher
+    if _hasher is None:
+        from sklearn.feature_extraction import FeatureHasher
+        _hasher = FeatureHasher(n_features=HASH_FEATURES, input_type='dict', alternate_sign=False)
+    return _hasher
+
+
+def feature_matrix(word_counts: Sequence[Counter], total_words: Sequence[float],
+                   signals: Dict[str, Sequence[float]]) -> sparse.csr_matrix:
+    """Sessions x features matrix: hashed word frequencies, then the heuristic signals"""
+    # Counts are hashed as-is and scaled per row, so no per-word Python work
+    hashed = _feature_hasher().transform(word_counts)
+    scale = 1.0 / np.maximum(np.asarray(total_words, dtype=float), 1.0)
+    hashed = sparse.diags(scale) @ hashed
+    dense = np.column_stack([np.asarray(signals[name], dtype=float) for name in SIGNALS])
+    return sparse.hstack([hashed, sparse.csr_matrix(dense)], format='csr')
+
+
+class LearnedScorer:
+    """Linear quality and success models over sparse session features.
+
+    Both models share one weight matrix, so scoring any number of sessions
+    is a single sparse matrix product. A scorer may hold only one of the
+    two targets when there were too few labels for the other.
+    """
+
+    def __init__(self, weights: np.ndarray, intercepts: np.ndarray, targets: Sequence[str], metadata: Dict):
+        self.weights = weights
+        self.intercepts = intercepts
+        self.targets = tuple(targets)
+        self.metadata = metadata
+        self.engine_version = metadata['engine_version']
+        self.digest = metadata.get('digest', '')
+
+    def predict(self, matrix: sparse.csr_matrix) -> Dict[str, List[float]]:
+        """Scores per target for every row of a feature_matrix, rounded like the heuristics"""
+        raw = matrix @ self.weights + self.intercepts
+        scores = {}
+        for column, target in enumerate(self.targets):
+            values = raw[:, column]
+            if target == 'success_probability':
+                values = 1.0 / (1.0 + np.exp(-values))
+            scores[target] = [round(value, 2) for value in np.clip(values, 0.0, 1.0).tolist()]
+        return scores
+
+    def score(self, word_counts: Counter, total_words: int, signals: Dict[str, float]) -> Dict[str, float]:
+        """Scores for a single session"""
+        matrix = feature_matrix([word_counts], [total_words], {name: [signals[name]] for name in SIGNALS})
+        return {target: values[0] for target, values in self.predict(matrix).items()}
+
+    def save(self, path: str):
+        """Write the model file atomically"""
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, weights=self.weights, intercepts=self.intercepts,
+                            targets=np.array(self.targets), metadata=np.array(json.dumps(self.metadata)))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'LearnedScorer':
+        """Read a model file; the digest of its bytes identifies the model"""
+        with open(path, "rb") as f:
+            data = f.read()
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            metadata = json.loads(str(arrays['metadata']))
+            if metadata.get('format') != SCORER_FORMAT:
+                raise ValueError("Unrecognised scorer format")
+            weights = arrays['weights']
+            if weights.shape != (HASH_FEATURES + len(SIGNALS), len(arrays['targets'])):
+                raise ValueError("Scorer weights do not match the feature layout")
+            metadata['digest'] = hashlib.sha256(data).hexdigest()[:16]
+            return cls(weights, arrays['intercepts'], [str(target) for target in arrays['targets']], metadata)
+
+
+def load_scorer(engine_version: str, path: Optional[str] = None) -> Optional[LearnedScorer]:
+    """Installed scorer for this engine configuration, or None to keep the heuristics"""
+    path = path or SCORER_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        _feature_hasher()
+    except ImportError:
+        logger.warning(f"scikit-learn is not installed - ignoring analytics scorer {path}")
+        return None
+    try:
+        scorer = LearnedScorer.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Could not load analytics scorer {path}: {e} - using heuristic scores")
+        return None
+    # The signals come from the engine's keyword tables and patterns, so a model
+    # trained against another configuration would read shifted features
+    if scorer.engine_version != engine_version:
+        logger.warning(f"Analytics scorer {path} was trained for engine {scorer.engine_version}, "
+                       f"not {engine_version} - retrain it; using heuristic scores")
+        return None
+    return scorer
+
+
+def train_scorer(transcripts: Sequence[Tuple[List[Dict], Optional[str]]],
+                 outcomes: Sequence[Tuple[Optional[bool], Optional[float]]],
+                 engine: Optional[ConversationAnalytics] = None,
+                 alpha: float = 1.0, C: float = 1.0) -> LearnedScorer:
+    """Fit the models on (conversation, report) pairs and their (success, quality) labels.
+
+    Either label may be None for a session. A target is only learned with at
+    least MIN_LABELED_SESSIONS labels (and both outcomes, for success).
+    """
+    from sklearn.linear_model import LogisticRegression, Ridge
+
+    engine = engine or analytics_engine
+
+    analyses = [LazyAnalytics(engine, conversation, report) for conversation, report in transcripts]
+    signals = [analysis.signals() for analysis in analyses]
+    features = [analysis.scanned_features() for analysis in analyses]
+    matrix = feature_matrix([feature.word_counts for feature in features],
+                            [feature.total_words for feature in features],
+                            {name: [row[name] for row in signals] for name in SIGNALS})
+
+    columns, intercepts, targets, labeled = [], [], [], {}
+    quality_rows = [i for i, (_, quality) in enumerate(outcomes) if quality is not None]
+    if len(quality_rows) >= MIN_LABELED_SESSIONS:
+        model = Ridge(alpha=alpha).fit(matrix[quality_rows], [outcomes[i][1] for i in quality_rows])
+        columns.append(model.coef_)
+        intercepts.append(model.intercept_)
+        targets.append('quality_score')
+        labeled['quality_score'] = len(quality_rows)
+
+    success_rows = [i for i, (success, _) in enumerate(outcomes) if success is not None]
+    success_labels = [bool(outcomes[i][0]) for i in success_rows]
+    if len(success_rows) >= MIN_LABELED_SESSIONS and len(set(success_labels)) == 2:
+        model = LogisticRegression(C=C, max_iter=1000).fit(matrix[success_rows], success_labels)
+        columns.append(model.coef_[0])
+        intercepts.append(model.intercept_[0])
+        targets.append('success_probability')
+        labeled['success_probability'] = len(success_rows)
+
+    if not targets:
+        raise ValueError(f"Need at least {MIN_LABELED_SESSIONS} sessions with outcome labels to train a scorer")
+
+    metadata = {
+        'format': SCORER_FORMAT,
+        'engine_version': engine.version,
+        'trained_at': datetime.utcnow().isoformat(),
+        'labeled_sessions': labeled
+    }
+    return LearnedScorer(np.column_stack(columns), np.array(intercepts, dtype=float), targets, metadata)
+
+
+def train_from_database(db_manager, engine: Optional[ConversationAnalytics] = None,
+                        path: Optional[str] = None) -> LearnedScorer:
+    """Train on every stored session with a recorded outcome and install the model file"""
+    engine = engine or analytics_engine
+    outcomes = db_manager.get_session_outcomes()
+    transcripts = []
+    for chunk in db_manager.iter_session_transcripts(list(outcomes)):
+        transcripts.extend((messages, None) for messages in chunk.values())
+
+    scorer = train_scorer(transcripts, list(outcomes.values()), engine)
+    path = path or SCORER_PATH
+    scorer.save(path)
+    engine.set_scorer(LearnedScorer.load(path))
+    return scorer
+
+
+def main(path: Optional[str] = None):
+    """Offline step: train from the application database"""
+    from database.models import db_manager
+
+    scorer = train_from_database(db_manager, path=path)
+    labeled = ", ".join(f"{target} on {count} sessions" for target, count in scorer.metadata['labeled_sessions'].items())
+    print(f"Trained {labeled}; wrote {path or SCORER_PATH}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,273 @@
+"""
+Topic Trends - Global topic counts across every analyzed conversation
+Time-bucketed Count-Min sketches with space-saving heavy-hitter tables, so
+"top topics over the last day/week" is answered in fixed memory and time
+however many sessions have been analyzed
+
+File layout: one .npz with the bucket start times, the stacked sketch
+tables and JSON metadata (sketch shape, heavy-hitter entries per bucket).
+Processes sharing the file merge their counts into it under a lock
+(<path>.lock), so every API worker's topics are kept
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TRENDS_PATH = os.getenv("TOPIC_TRENDS", "topic_trends.npz")
+TRENDS_FORMAT = 1
+
+
+class CountMinSketch:
+    """Approximate counts for an unbounded set of terms in `depth` x `width` counters.
+
+    Estimates never undercount; they overcount by at most 2/width of the
+    total with probability 1 - (1/2)^depth. Sketches of the same shape are
+    merged by adding their tables.
+    """
+
+    def __init__(self, width: int = 1024, depth: int = 4, table: Optional[np.ndarray] = None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
+
+    def columns(self, term: str) -> np.ndarray:
+        """One counter per row; a stable hash, so persisted tables stay valid across processes"""
+        digest = hashlib.blake2b(term.encode("utf-8"), digest_size=4 * self.depth).digest()
+        return np.frombuffer(digest, dtype="<u4") % self.width
+
+    def add(self, term: str, count: int = 1):
+        self.table[self._rows, self.columns(term)] += count
+
+    def estimate(self, term: str) -> int:
+        return int(self.table[self._rows, self.columns(term)].min())
+
+    def merge(self, other: 'CountMinSketch'):
+        self.table += other.table
+
+
+class SpaceSaving:
+    """The `capacity` most frequent terms seen, with their maximum overcount.
+
+    When the table is full a new term replaces the least counted one and
+    inherits its count as an error bound, so every term whose true count
+    exceeds total / capacity is guaranteed to be present.
+    """
+
+    def __init__(self, capacity: int = 50, entries: Optional[Dict[str, List[int]]] = None):
+        self.capacity = capacity
+        self.entries: Dict[str, List[int]] = entries or {}  # term -> [count, overcount]
+
+    def add(self, term: str, count: int = 1):
+        entry = self.entries.get(term)
+        if entry is not None:
+            entry[0] += count
+        elif len(self.entries) < self.capacity:
+            self.entries[term] = [count, 0]
+        else:
+            smallest = min(self.entries, key=lambda key: self.entries[key][0])
+            floor = self.entries.pop(smallest)[0]
+            self.entries[term] = [floor + count, floor]
+
+    def merge(self, other: 'SpaceSaving'):
+        """Add another table's counts, keeping the `capacity` largest"""
+        for term, (count, overcount) in other.entries.items():
+            entry = self.entries.setdefault(term, [0, 0])
+            entry[0] += count
+            entry[1] += overcount
+        if len(self.entries) > self.capacity:
+            ranked = sorted(self.entries.items(), key=lambda item: -item[1][0])
+            self.entries = dict(ranked[:self.capacity])
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        ranked = sorted(self.entries.items(), key=lambda item: -item[1][0])
+        return [(term, count) for term, (count, _) in ranked[:limit]]
+
+
+class TopicTrends:
+    """Topic counts per time bucket, kept for `retention` buckets.
+
+    Each analysis adds its topic frequencies to the current bucket's
+    sketch and heavy-hitter table. A window query sums the sketches of the
+    buckets it covers and ranks the candidates from their heavy-hitter
+    tables by the merged estimate, so its cost depends only on the sketch
+    shape and retention. With a path, state is loaded on first use and
+    saved at most every `persist_every` seconds as topics are recorded.
+    A save merges the counts recorded since the last one into the file as
+    it is now, then takes the merged state, so processes sharing the path
+    add up rather than overwrite each other.
+    """
+
+    def __init__(self, path: Optional[str] = None, bucket_seconds: int = 3600, retention: int = 24 * 7,
+                 width: int = 1024, depth: int = 4, top_k: int = 50, persist_every: float = 300):
+        self.path = path
+        self.bucket_seconds = bucket_seconds
+        self.retention = retention
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.persist_every = persist_every
+        self.buckets: Dict[int, Tuple[CountMinSketch, SpaceSaving]] = {}
+        # Counts recorded here and not yet merged into the file
+        self._pending: Dict[int, Tuple[CountMinSketch, SpaceSaving]] = {}
+        self._loaded = path is None
+        self._last_saved = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, topic_counts: Dict[str, int], timestamp: Optional[float] = None):
+        """Add one analysis's topic frequencies"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._ensure_loaded()
+            start = int(timestamp // self.bucket_seconds) * self.bucket_seconds
+            buckets = [self._bucket(self.buckets, start)]
+            if self.path:
+                buckets.append(self._bucket(self._pending, start))
+            for sketch, heavy in buckets:
+                for topic, count in topic_counts.items():
+                    sketch.add(topic, count)
+                    heavy.add(topic, count)
+
+            if self.path and time.time() - self._last_saved >= self.persist_every:
+                self._save()
+
+    def top_topics(self, window_seconds: float = 24 * 3600, limit: int = 10,
+                   now: Optional[float] = None) -> List[Tuple[str, int]]:
+        """Most frequent topics over the last `window_seconds`, with estimated counts"""
+        with self._lock:
+            self._ensure_loaded()
+            buckets = self._window(window_seconds, now)
+            if not buckets:
+                return []
+            merged = CountMinSketch(self.width, self.depth, sum(sketch.table for sketch, _ in buckets))
+            candidates = set().union(*(heavy.entries for _, heavy in buckets))
+        ranked = sorted(((topic, merged.estimate(topic)) for topic in candidates), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def estimate(self, topic: str, window_seconds: float = 24 * 3600, now: Optional[float] = None) -> int:
+        """Estimated occurrences of one topic over the last `window_seconds`"""
+        with self._lock:
+            self._ensure_loaded()
+            return sum(sketch.estimate(topic) for sketch, _ in self._window(window_seconds, now))
+
+    def _window(self, window_seconds: float, now: Optional[float]) -> List[Tuple[CountMinSketch, SpaceSaving]]:
+        now = time.time() if now is None else now
+        # Buckets overlapping the window count whole
+        return [bucket for start, bucket in self.buckets.items()
+                if start + self.bucket_seconds > now - window_seconds and start <= now]
+
+    def _bucket(self, buckets: Dict[int, Tuple[CountMinSketch, SpaceSaving]],
+                start: int) -> Tuple[CountMinSketch, SpaceSaving]:
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = (CountMinSketch(self.width, self.depth), SpaceSaving(self.top_k))
+            self._expire(buckets, start)
+        return bucket
+
+    def _expire(self, buckets: Dict[int, Tuple[CountMinSketch, SpaceSaving]], newest: int):
+        oldest = newest - (self.retention - 1) * self.bucket_seconds
+        for start in [start for start in buckets if start < oldest]:
+            del buckets[start]
+
+    def save(self):
+        """Write the current state to `path` now"""
+        with self._lock:
+            self._ensure_loaded()
+            self._save()
+
+    def _save(self):
+        self._last_saved = time.time()
+        try:
+            with self._file_lock():
+                # Other processes may have saved since this one last read the file
+                merged = self._read()
+                for start, (sketch, heavy) in self._pending.items():
+                    bucket = merged.get(start)
+                    if bucket is None:
+                        merged[start] = (sketch, heavy)
+                    else:
+                        bucket[0].merge(sketch)
+                        bucket[1].merge(heavy)
+                if merged:
+                    self._expire(merged, max(merged))
+                self._write(merged)
+        except OSError as e:
+            # Pending counts are kept for the next save
+            logger.warning(f"Could not save topic trends to {self.path}: {e}")
+            return
+        self.buckets = merged
+        self._pending = {}
+
+    @contextmanager
+    def _file_lock(self):
+        with open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _write(self, buckets: Dict[int, Tuple[CountMinSketch, SpaceSaving]]):
+        starts = sorted(buckets)
+        tables = np.stack([buckets[start][0].table for start in starts]) if starts else \
+            np.zeros((0, self.depth, self.width), dtype=np.int64)
+        metadata = {
+            'format': TRENDS_FORMAT,
+            'bucket_seconds': self.bucket_seconds,
+            'width': self.width,
+            'depth': self.depth,
+            'heavy_hitters': [buckets[start][1].entries for start in starts]
+        }
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, starts=np.array(starts, dtype=np.int64), tables=tables,
+                            metadata=np.array(json.dumps(metadata)))
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> Dict[int, Tuple[CountMinSketch, SpaceSaving]]:
+        """Buckets stored at `path`; empty when there is no usable file"""
+        buckets = {}
+        if not os.path.exists(self.path):
+            return buckets
+        try:
+            with np.load(self.path, allow_pickle=False) as arrays:
+                metadata = json.loads(str(arrays['metadata']))
+                if (metadata.get('format'), metadata['bucket_seconds'], metadata['width'], metadata['depth']) != \
+                        (TRENDS_FORMAT, self.bucket_seconds, self.width, self.depth):
+                    raise ValueError("sketch layout differs from this configuration")
+                for start, table, entries in zip(arrays['starts'].tolist(), arrays['tables'],
+                                                 metadata['heavy_hitters']):
+                    buckets[start] = (CountMinSketch(self.width, self.depth, table.copy()),
+                                      SpaceSaving(self.top_k, entries))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load topic trends from {self.path}: {e} - starting empty")
+            return {}
+        return buckets
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        self.buckets = self._read()
+        if self.buckets:
+            self._expire(self.buckets, max(self.buckets))
+
+
+# Global topic trends, fed by every completed analysis
+topic_trends = TopicTrends(TRENDS_PATH)
@@ -6,12 +6,20 @@ FastAPI-based REST API for enterprise integration and programmatic access
 from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
+from dataclasses import asdict
+import hashlib
+import time
 import uuid
 import json
 
+from api.metrics import CONTENT_TYPE, MetricsMiddleware, RequestMetrics, render_metrics
+from utils.rate_limiter import SharedQuotaStore, metered_tokens
+
 # API Models
 class ProjectRequest(BaseModel):
     """Request model for project analysis"""
@@ -32,6 +40,7 @@ class AgentMessage(BaseModel):
     timestamp: datetime
     round_number: Optional[int] = None
     message_order: Optional[int] = None
+    content_hash: Optional[str] = None  # Identical bodies share a hash
 
 class ConversationResponse(BaseModel):
     """Response model for conversation analysis"""
@@ -55,6 +64,10 @@ class AnalyticsResponse(BaseModel):
     key_topics: List[str]
     risk_factors: List[str]
     recommendations: List[str]
+    round_metrics: List[Dict[str, Any]] = []
+    agent_metrics: Dict[str, Dict[str, Any]] = {}
+    topic_frequencies: Dict[str, int] = {}
+    confidence_intervals: Dict[str, List[float]] = {}
 
 class SessionListResponse(BaseModel):
     """Response model for session list"""
@@ -96,9 +109,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route request counts and latencies for /metrics
+request_metrics = RequestMetrics()
+app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
 # Security
 security = HTTPBearer()
 
+# Default per-key limits; individual keys may override any of them
+DEFAULT_KEY_QUOTA = {
+    "max_concurrent_analyses": 2,
+    "analyses_per_hour": 20,
+    "tokens_per_day": 200000
+}
+
+# Rough provider token cost of one agent turn (agents request up to 2000 tokens); held
+# against the key's daily quota while the analysis runs, then replaced by the tokens billed
+TOKENS_PER_AGENT_TURN = 2000
+
+# Suggested retry delay when a key is at its concurrency cap
+CONCURRENCY_RETRY_AFTER_SECONDS = 30
+
 # In-memory storage (replace with database in production)
 api_keys = {
     "demo-key-12345": {
@@ -106,12 +137,16 @@ api_keys = {
         "name": "Demo API Key",
         "created_at": datetime.now(),
         "last_used": None,
-        "is_active": True
+        "is_active": True,
+        "quota": dict(DEFAULT_KEY_QUOTA)
     }
 }
 
 active_sessions = {}
 
+# Per-key quota counters, shared by every worker process like the provider budget
+key_quota_store = SharedQuotaStore()
+
 # Authentication dependency
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Validate API key and return user information"""
@@ -134,9 +169,61 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     
     # Update last used timestamp
     api_keys[token]["last_used"] = datetime.now()
+    # Quota counters are stored under a digest, never the key itself
+    key_info.setdefault("key_id", hashlib.sha256(token.encode()).hexdigest()[:16])
     
     return key_info
 
+# Per-key quota enforcement
+def _get_key_usage(key_info: dict) -> dict:
+    """The key's live quota counters across every worker"""
+    return key_quota_store.key_usage(key_info["key_id"], str(datetime.now().date()), time.time())
+
+def estimate_analysis_tokens(request: ProjectRequest) -> int:
+    """Estimate provider tokens an analysis will consume"""
+    agent_count = sum(1 for enabled in request.selected_agents.values() if enabled)
+    agent_turns = agent_count * request.rounds + 1  # +1 for the final report
+    return agent_turns * TOKENS_PER_AGENT_TURN + len(request.project_description) // 4
+
+def _quota_exceeded(detail: str, retry_after: float):
+    """Reject a request with 429 and a Retry-After header"""
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+    )
+
+def acquire_analysis_quota(key_info: dict, analysis_id: str, estimated_tokens: int):
+    """Admit an analysis against the key's quotas or raise 429"""
+    quota = {**DEFAULT_KEY_QUOTA, **key_info.get("quota", {})}
+    today = datetime.now().date()
+    exceeded, retry_after = key_quota_store.start_key_analysis(
+        key_info["key_id"], analysis_id, str(today), time.time(),
+        quota["max_concurrent_analyses"], quota["analyses_per_hour"], quota["tokens_per_day"], estimated_tokens
+    )
+    
+    if exceeded == "concurrency":
+        _quota_exceeded(
+            f"Concurrent analysis limit reached ({quota['max_concurrent_analyses']})",
+            CONCURRENCY_RETRY_AFTER_SECONDS
+        )
+    
+    if exceeded == "hourly":
+        _quota_exceeded(f"Hourly analysis limit reached ({quota['analyses_per_hour']})", retry_after)
+    
+    if exceeded == "tokens":
+        usage = _get_key_usage(key_info)
+        remaining = quota["tokens_per_day"] - usage["tokens_used"] - usage["tokens_reserved"]
+        tomorrow = datetime.combine(today + timedelta(days=1), datetime.min.time())
+        _quota_exceeded(
+            f"Daily token quota exceeded. Remaining: {max(0, remaining)} tokens",
+            (tomorrow - datetime.now()).total_seconds()
+        )
+
+def release_analysis_quota(analysis_id: str, tokens_used: int):
+    """Free the analysis's concurrency slot and charge the tokens it actually used"""
+    key_quota_store.finish_key_analysis(analysis_id, tokens_used)
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -147,6 +234,35 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics for the API, model providers and analytics"""
+    in_flight = sum(1 for session_data in active_sessions.values() if session_data["status"] == "processing")
+    sessions = {}
+    for session_data in active_sessions.values():
+        sessions[session_data["status"]] = sessions.get(session_data["status"], 0) + 1
+    return PlainTextResponse(render_metrics(request_metrics, in_flight, sessions), media_type=CONTENT_TYPE)
+
+@app.get("/usage")
+async def get_key_usage(current_user: dict = Depends(get_current_user)):
+    """Usage counters and quota limits for the calling API key"""
+    quota = {**DEFAULT_KEY_QUOTA, **current_user.get("quota", {})}
+    usage = _get_key_usage(current_user)
+    
+    return {
+        "key_name": current_user["name"],
+        "quota": quota,
+        "usage": {
+            "active_analyses": usage["active_analyses"],
+            "analyses_last_hour": usage["analyses_last_hour"],
+            "tokens_used_today": usage["tokens_used"],
+            "tokens_reserved": usage["tokens_reserved"],
+            "tokens_remaining_today": max(0, quota["tokens_per_day"] - usage["tokens_used"] - usage["tokens_reserved"]),
+            "total_analyses": usage["total_analyses"],
+            "rejected_requests": usage["rejected_requests"]
+        }
+    }
+
 # Agent information endpoints
 @app.get("/agents")
 async def list_agents(current_user: dict = Depends(get_current_user)):
@@ -236,6 +352,9 @@ async def analyze_project(
             detail="At least one agent must be selected"
         )
     
+    # Enforce per-key quotas before anything is queued
+    acquire_analysis_quota(current_user, session_id, estimate_analysis_tokens(request))
+    
     # Create session data
     session_data = {
         "session_id": session_id,
@@ -258,7 +377,7 @@ async def analyze_project(
     active_sessions[session_id] = session_data
     
     # Start background processing
-    background_tasks.add_task(process_conversation, session_id, request)
+    background_tasks.add_task(process_conversation, session_id, request, current_user)
     
     return ConversationResponse(
         session_id=session_id,
@@ -268,12 +387,24 @@ async def analyze_project(
         created_at=session_data["created_at"]
     )
 
-async def process_conversation(session_id: str, request: ProjectRequest):
+async def process_conversation(session_id: str, request: ProjectRequest, key_info: Optional[dict] = None):
     """Background task to process the conversation"""
+    # Provider tokens billed by this analysis's calls, charged to the key when it ends
+    with metered_tokens() as meter:
+        try:
+            await _process_conversation(session_id, request)
+        finally:
+            if key_info is not None:
+                release_analysis_quota(session_id, meter.tokens)
+
+async def _process_conversation(session_id: str, request: ProjectRequest):
     try:
         # Import conversation simulation here to avoid circular imports
         from utils.conversation import simulate_conversation
         from analytics.engine import analytics_engine
+        from analytics.cache import analytics_cache
+        from analytics.sampling import sampled_analytics, transcript_length
+        from analytics.trends import topic_trends
         
         # Enhanced context for agents
         enhanced_context = f"""
@@ -284,17 +415,51 @@ async def process_conversation(session_id: str, request: ProjectRequest):
         Selected Agents: {', '.join([k for k, v in request.selected_agents.items() if v])}
         """
         
-        # Run conversation simulation
-        conversation, report = simulate_conversation(
+        # Analytics are updated as each message arrives, so the session shows
+        # live metrics while the agents are still talking
+        live_analytics = analytics_engine.stream()
+        live_conversation = []
+        live_length = 0
+        if session_id in active_sessions:
+            active_sessions[session_id].update({
+                "conversation": live_conversation,
+                "live_analytics": live_analytics
+            })
+        
+        def on_message(message: dict):
+            nonlocal live_analytics, live_length
+            live_conversation.append(message)
+            if live_analytics is None:
+                return
+            live_length += len(message.get("content", ""))
+            if live_length >= sampled_analytics.exact_below:
+                # Too long to follow message by message; the final analytics are sampled
+                live_analytics = None
+                if session_id in active_sessions:
+                    active_sessions[session_id]["live_analytics"] = None
+                return
+            live_analytics.add_message(message)
+        
+        # Run conversation simulation off the event loop so status polls are served meanwhile
+        conversation, report = await run_in_threadpool(
+            simulate_conversation,
             enhanced_context,
             turns=request.rounds,
             selected_agents=request.selected_agents,
             model=request.model,
-            output_format=request.output_format
+            output_format=request.output_format,
+            on_message=on_message
         )
         
-        # Run analytics
-        analytics_result = analytics_engine.analyze_conversation(conversation, report)
+        if live_analytics is not None and transcript_length(conversation, report) < sampled_analytics.exact_below:
+            # Final analytics: the running totals plus the report, no full re-scan
+            analytics_result = live_analytics.snapshot(report)
+            # Later analyses of this transcript (reports, dashboards) become cache hits
+            analytics_cache.put(analytics_cache.key(conversation, report), analytics_result)
+        else:
+            # Very long transcripts are estimated from a bounded sample
+            analytics_result = await run_in_threadpool(analytics_cache.analyze, conversation, report)
+        topic_trends.record(analytics_result.topic_frequencies)
         
         # Update session with results
         if session_id in active_sessions:
@@ -303,17 +468,8 @@ async def process_conversation(session_id: str, request: ProjectRequest):
                 "completed_at": datetime.now(),
                 "conversation": conversation,
                 "final_report": report,
-                "analytics": {
-                    "sentiment_score": analytics_result.sentiment_score,
-                    "confidence_score": analytics_result.confidence_score,
-                    "quality_score": analytics_result.quality_score,
-                    "success_probability": analytics_result.success_probability,
-                    "technical_complexity": analytics_result.technical_complexity,
-                    "business_value": analytics_result.business_value,
-                    "key_topics": analytics_result.key_topics,
-                    "risk_factors": analytics_result.risk_factors,
-                    "recommendations": analytics_result.recommendations
-                }
+                "analytics": asdict(analytics_result),
+                "live_analytics": None
             })
     
     except Exception as e:
@@ -325,6 +481,13 @@ async def process_conversation(session_id: str, request: ProjectRequest):
                 "completed_at": datetime.now()
             })
 
+def session_analytics(session_data: dict) -> Optional[dict]:
+    """Final analytics, or a live snapshot while the conversation is still running"""
+    live_analytics = session_data.get("live_analytics")
+    if live_analytics is not None:
+        return asdict(live_analytics.snapshot())
+    return session_data.get("analytics")
+
 @app.get("/projects/{session_id}", response_model=ConversationResponse)
 async def get_project_analysis(
     session_id: str,
@@ -349,14 +512,15 @@ async def get_project_analysis(
     
     # Convert conversation messages to proper format
     conversation_messages = []
-    for msg in session_data["conversation"]:
+    for msg in list(session_data["conversation"]):
         conversation_messages.append(AgentMessage(
             role=msg.get("role", "assistant"),
             agent_type=msg.get("agent_type", "Unknown"),
             content=msg.get("content", ""),
             timestamp=datetime.now(),  # In real implementation, store actual timestamps
             round_number=msg.get("round_number"),
-            message_order=msg.get("message_order")
+            message_order=msg.get("message_order"),
+            content_hash=msg.get("content_hash")
         ))
     
     return ConversationResponse(
@@ -364,7 +528,7 @@ async def get_project_analysis(
         status=session_data["status"],
         conversation=conversation_messages,
         final_report=session_data["final_report"],
-        analytics=session_data["analytics"],
+        analytics=session_analytics(session_data),
         created_at=session_data["created_at"],
         completed_at=session_data.get("completed_at")
     )
@@ -390,7 +554,7 @@ async def get_project_analytics(
             detail="Access denied"
         )
     
-    analytics = session_data.get("analytics")
+    analytics = session_analytics(session_data)
     if not analytics:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -479,7 +643,7 @@ async def download_pdf_report(
             session_data,
             session_data["conversation"],
             session_data["final_report"],
-            session_data.get("analytics")
+            session_analytics(session_data)
         )
         
         from fastapi.responses import Response
@@ -498,6 +662,35 @@ async def download_pdf_report(
             detail=f"Failed to generate PDF: {str(e)}"
         )
 
+@app.get("/analytics/topics/trending")
+async def get_trending_topics(
+    hours: int = 24,
+    limit: int = 10,
+    current_user: dict = Depends(get_current_user)
+):
+    """Most discussed topics across all projects over the last `hours`"""
+    from analytics.trends import topic_trends
+    
+    return {
+        "window_hours": hours,
+        "topics": [
+            {"topic": topic, "count": count}
+            for topic, count in topic_trends.top_topics(hours * 3600, limit)
+        ]
+    }
+
+@app.on_event("startup")
+async def open_analytics_event_log():
+    """Claim this worker's analytics event log and restore the analytics it holds"""
+    from analytics.ai_analytics import ai_analytics
+    await run_in_threadpool(ai_analytics.open_event_log)
+
+@app.on_event("shutdown")
+async def save_topic_trends():
+    """Persist topic trends recorded since the last periodic save"""
+    from analytics.trends import topic_trends
+    topic_trends.save()
+
 # Configuration endpoints
 @app.get("/config/models")
 async def list_available_models(current_user: dict = Depends(get_current_user)):
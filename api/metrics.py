@@ -0,0 +1,231 @@
+"""
+API Metrics - Prometheus text exposition for the FastAPI service
+Request counts and latencies are plain counters bumped by an ASGI
+middleware; everything else (analyses in flight, provider queue, provider
+latencies and errors, cache and token usage) is read from its owner only
+when /metrics is scraped
+
+Format: https://prometheus.io/docs/instrumenting/exposition_formats/
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latency histogram upper bounds, seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Provider latency quantiles exported from the analytics sketches
+PROVIDER_QUANTILES = (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99"))
+
+Sample = Tuple[str, Dict[str, str], float]  # (name suffix, labels, value)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsWriter:
+    """Collects metric families as exposition text"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str, samples: Iterable[Sample]):
+        """One family: HELP and TYPE lines, then its samples"""
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            self.lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+
+    def gauge(self, name: str, help_text: str, value: float, labels: Optional[Dict[str, str]] = None):
+        self.family(name, "gauge", help_text, [("", labels or {}, value)])
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+class RequestMetrics:
+    """Request counts and latency histograms per route.
+
+    Routes are the path templates (`/projects/{session_id}`), so label
+    cardinality stays fixed. observe() is a dict lookup, a bisect and a
+    few additions; it only runs on the event loop, so it takes no lock.
+    """
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        # (method, route, status) -> requests
+        self.counts: Dict[Tuple[str, str, str], int] = {}
+        # (method, route) -> [count per bucket..., count above the last bucket, total seconds]
+        self.latencies: Dict[Tuple[str, str], List[float]] = {}
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float):
+        key = (method, route, str(status_code))
+        self.counts[key] = self.counts.get(key, 0) + 1
+        histogram = self.latencies.get((method, route))
+        if histogram is None:
+            histogram = self.latencies[(method, route)] = [0] * (len(self.buckets) + 1) + [0.0]
+        histogram[bisect_left(self.buckets, seconds)] += 1
+        histogram[-1] += seconds
+
+    def write(self, writer: MetricsWriter):
+        writer.family(
+            "api_requests_total", "counter", "HTTP requests by method, route and status",
+            [("", {"method": method, "route": route, "status": code}, count)
+             for (method, route, code), count in sorted(self.counts.items())]
+        )
+        samples = []
+        for (method, route), histogram in sorted(self.latencies.items()):
+            labels = {"method": method, "route": route}
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), histogram[:-1]):
+                cumulative += count
+                samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append(("_sum", labels, histogram[-1]))
+            samples.append(("_count", labels, cumulative))
+        writer.family("api_request_duration_seconds", "histogram",
+                      "Time until the response was sent, by method and route", samples)
+
+
+def _route_template(scope: dict) -> str:
+    """Path template of the matched route; unmatched paths share one label"""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", "unmatched")
+    # Older Starlette only records the endpoint
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is not None and app is not None:
+        for candidate in app.router.routes:
+            if getattr(candidate, "endpoint", None) is endpoint:
+                return candidate.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request until its last body chunk is sent.
+
+    Background tasks run after that, so a request that starts an analysis
+    is timed without it.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        observed = False
+
+        def observe():
+            nonlocal observed
+            observed = True
+            self.metrics.observe(scope["method"], _route_template(scope), status_code,
+                                 time.perf_counter() - started)
+
+        async def timed_send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False) and not observed:
+                observe()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            if not observed:
+                observe()
+
+
+def write_provider_metrics(writer: MetricsWriter):
+    """Provider call counts, errors and latency quantiles from the AI analytics sketches"""
+    from analytics.ai_analytics import ai_analytics
+
+    calls = sorted(ai_analytics.get_provider_calls().items())
+    writer.family("provider_calls_total", "counter", "Model provider calls, including failed ones",
+                  [("", {"provider": provider, "model": model}, counts["calls"])
+                   for (provider, model), counts in calls])
+    writer.family("provider_call_errors_total", "counter", "Model provider calls that failed",
+                  [("", {"provider": provider, "model": model}, counts["errors"])
+                   for (provider, model), counts in calls])
+    writer.family("fallback_responses_total", "counter", "Canned responses served without a model call",
+                  [("", {"agent": agent}, count)
+                   for agent, count in sorted(ai_analytics.get_fallback_responses().items())])
+
+    samples = []
+    for (provider, model), _ in calls:
+        percentiles = ai_analytics.get_latency_percentiles(provider=provider, model=model)
+        for phase, summary in percentiles.items():
+            if not summary["count"]:
+                continue  # Phase not measured for this provider
+            labels = {"provider": provider, "model": model, "phase": phase}
+            for quantile, field in PROVIDER_QUANTILES:
+                samples.append(("", {**labels, "quantile": quantile}, summary[field]))
+            samples.append(("_sum", labels, summary["mean"] * summary["count"]))
+            samples.append(("_count", labels, summary["count"]))
+    writer.family("provider_call_duration_seconds", "summary",
+                  "Model provider call latency by phase, across all agents", samples)
+
+
+def write_cache_metrics(writer: MetricsWriter):
+    """Analytics cache lookups and size"""
+    from analytics.cache import analytics_cache
+
+    writer.family("analytics_cache_requests_total", "counter", "Analytics cache lookups by result",
+                  [("", {"result": "hit"}, analytics_cache.hits),
+                   ("", {"result": "miss"}, analytics_cache.misses)])
+    writer.gauge("analytics_cache_entries", "Analytics results held in memory", len(analytics_cache))
+
+
+def write_rate_limit_metrics(writer: MetricsWriter):
+    """Provider queue depth and daily token usage of the shared Groq rate limiter"""
+    try:
+        from utils.rate_limiter import groq_manager
+    except ImportError:
+        return
+
+    writer.gauge("provider_queue_depth", "Model calls waiting for a rate limiter slot",
+                 groq_manager.scheduler.queue_depth())
+    usage = groq_manager.rate_limiter.get_usage_stats()
+    writer.gauge("rate_limit_tokens_used", "Provider tokens used today", usage["tokens_used_today"])
+    writer.gauge("rate_limit_tokens_reserved", "Provider tokens reserved by calls in flight",
+                 usage["tokens_reserved"])
+    writer.gauge("rate_limit_tokens_limit", "Daily provider token limit", usage["daily_limit"])
+    writer.gauge("rate_limit_requests_last_minute", "Provider requests sent in the last minute",
+                 usage["requests_last_minute"])
+
+
+def render_metrics(request_metrics: RequestMetrics, analyses_in_flight: int, sessions: Dict[str, int]) -> str:
+    """The full /metrics page"""
+    writer = MetricsWriter()
+    request_metrics.write(writer)
+    writer.gauge("api_analyses_in_flight", "Admitted analyses that have not finished", analyses_in_flight)
+    writer.family("api_sessions", "gauge", "Sessions held by the API, by status",
+                  [("", {"status": status}, count) for status, count in sorted(sessions.items())])
+    write_provider_metrics(writer)
+    write_cache_metrics(writer)
+    write_rate_limit_metrics(writer)
+    return writer.text()
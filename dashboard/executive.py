@@ -8,7 +8,6 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
@@ -38,11 +37,11 @@ class ExecutiveDashboard:
         
         with col1:
             self._render_success_probability_gauge(analytics)
-            self._render_agent_participation_chart(session_data)
+            self._render_agent_participation_chart(analytics)
         
         with col2:
             self._render_complexity_analysis(analytics)
-            self._render_sentiment_timeline(session_data)
+            self._render_sentiment_timeline(analytics)
         
         # Additional analytics
         self._render_detailed_analytics(analytics)
@@ -129,34 +128,23 @@ class ExecutiveDashboard:
         fig.update_layout(height=300, showlegend=False)
         st.plotly_chart(fig, use_container_width=True)
     
-    def _render_agent_participation_chart(self, session_data: Dict):
+    def _render_agent_participation_chart(self, analytics: Optional[Dict]):
         """Render agent participation pie chart"""
         
         st.subheader("👥 Agent Participation")
         
-        agents = session_data.get('selected_agents', {})
-        if not any(agents.values()):
+        agent_metrics = analytics.get('agent_metrics', {}) if analytics else {}
+        if not agent_metrics:
             st.info("No agent data available")
             return
         
-        # Create participation data
-        active_agents = [agent for agent, active in agents.items() if active]
-        
-        # Simulate participation percentages (in real app, get from conversation history)
-        participation_data = {}
-        total = 100
-        for i, agent in enumerate(active_agents):
-            if i == len(active_agents) - 1:
-                participation_data[agent] = total
-            else:
-                pct = np.random.randint(15, 25)
-                participation_data[agent] = pct
-                total -= pct
+        # Share of the conversation each agent wrote, from the stored per-agent metrics
+        participation_data = {agent: metrics.get('words', 0) for agent, metrics in agent_metrics.items()}
         
         fig = px.pie(
             values=list(participation_data.values()),
             names=list(participation_data.keys()),
-            title="Message Distribution by Agent",
+            title="Word Distribution by Agent",
             color_discrete_sequence=px.colors.qualitative.Set3
         )
         
@@ -223,26 +211,21 @@ class ExecutiveDashboard:
         
         st.plotly_chart(fig, use_container_width=True)
     
-    def _render_sentiment_timeline(self, session_data: Dict):
+    def _render_sentiment_timeline(self, analytics: Optional[Dict]):
         """Render sentiment analysis over conversation timeline"""
         
         st.subheader("📈 Sentiment Timeline")
         
-        # Simulate sentiment data over conversation rounds
-        rounds = session_data.get('rounds', 2)
-        timeline_data = []
-        
-        for round_num in range(1, rounds + 1):
-            # Simulate sentiment progression
-            base_sentiment = 0.3 + (round_num * 0.2)  # Generally improving
-            noise = np.random.normal(0, 0.1)
-            sentiment = max(-1, min(1, base_sentiment + noise))
-            
-            timeline_data.append({
-                'Round': f'Round {round_num}',
-                'Sentiment': sentiment,
-                'Confidence': np.random.uniform(0.7, 0.95)
-            })
+        # Per-round metrics are computed with the session analytics and stored with them
+        round_metrics = analytics.get('round_metrics', []) if analytics else []
+        timeline_data = [
+            {
+                'Round': f"Round {metrics['round']}",
+                'Sentiment': metrics.get('sentiment_score', 0),
+                'Confidence': metrics.get('confidence_score', 0)
+            }
+            for metrics in round_metrics
+        ]
         
         if not timeline_data:
             st.info("No timeline data available")
@@ -300,12 +283,12 @@ class ExecutiveDashboard:
         col1, col2 = st.columns(2)
         
         with col1:
-            # Key topics word cloud simulation
+            # Key topics by how often they occur in the conversation
             st.markdown("**Key Topics**")
             topics = analytics.get('key_topics', [])
             if topics:
-                # Create a simple topic frequency chart
-                topic_freq = {topic: np.random.randint(5, 20) for topic in topics[:8]}
+                frequencies = analytics.get('topic_frequencies', {})
+                topic_freq = {topic: frequencies.get(topic, 0) for topic in topics[:8]}
                 
                 fig = px.bar(
                     x=list(topic_freq.values()),
@@ -325,37 +308,49 @@ class ExecutiveDashboard:
             st.markdown("**Risk Assessment**")
             risks = analytics.get('risk_factors', [])
             if risks:
-                # Create risk impact vs probability matrix
+                # How widely each risk was raised: share of rounds vs share of agents
+                round_metrics = analytics.get('round_metrics', [])
+                agent_metrics = list(analytics.get('agent_metrics', {}).values())
                 risk_data = []
                 for risk in risks[:5]:
+                    round_coverage = self._risk_coverage(round_metrics, risk)
+                    agent_coverage = self._risk_coverage(agent_metrics, risk)
+                    coverage = round_coverage * agent_coverage
                     risk_data.append({
                         'Risk': risk[:30] + "..." if len(risk) > 30 else risk,
-                        'Probability': np.random.uniform(0.2, 0.8),
-                        'Impact': np.random.uniform(0.3, 0.9),
-                        'Severity': np.random.choice(['Low', 'Medium', 'High'])
+                        'Round Coverage': round_coverage,
+                        'Agent Coverage': agent_coverage,
+                        'Severity': 'High' if coverage >= 0.5 else 'Medium' if coverage >= 0.2 else 'Low'
                     })
                 
                 df_risks = pd.DataFrame(risk_data)
                 
                 fig = px.scatter(
                     df_risks,
-                    x='Probability',
-                    y='Impact',
+                    x='Round Coverage',
+                    y='Agent Coverage',
                     size=[10] * len(df_risks),
                     color='Severity',
                     hover_data=['Risk'],
-                    title="Risk Impact vs Probability",
+                    title="Risk Coverage by Round and Agent",
                     color_discrete_map={
                         'Low': self.colors['success'],
                         'Medium': self.colors['warning'],
                         'High': self.colors['danger']
                     }
                 )
-                fig.update_layout(height=300)
+                fig.update_layout(height=300, xaxis_range=[0, 1.05], yaxis_range=[0, 1.05])
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("No risks identified")
     
+    @staticmethod
+    def _risk_coverage(segment_metrics: List[Dict], risk: str) -> float:
+        """Fraction of rounds or agents whose messages raised `risk`"""
+        if not segment_metrics:
+            return 0.0
+        return sum(risk in metrics.get('risk_factors', []) for metrics in segment_metrics) / len(segment_metrics)
+    
     def render_project_comparison(self, projects: List[Dict]):
         """Render project comparison dashboard"""
         
@@ -3,13 +3,17 @@ Enterprise AI Agent Consortium - Database Models
 SQLite database with SQLAlchemy ORM for conversation history, analytics, and user management
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON, Float, Boolean, ForeignKey
+from sqlalchemy import create_engine, inspect, text, Column, Integer, String, Text, DateTime, JSON, Float, Boolean, ForeignKey
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 import json
 import uuid
 
+from utils.content_store import content_digest
+
 Base = declarative_base()
 
 class User(Base):
@@ -59,6 +63,10 @@ class ConversationSession(Base):
     confidence_score = Column(Float)
     quality_score = Column(Float)
     
+    # Outcome labels recorded after the session; used to train the analytics scorer
+    outcome_success = Column(Boolean)  # Whether the project went on to succeed
+    outcome_quality = Column(Float)  # Reviewer rating of the analysis, 0-1
+    
     # Relationships
     user = relationship("User", back_populates="sessions")
     messages = relationship("ConversationMessage", back_populates="session")
@@ -75,7 +83,8 @@ class ConversationMessage(Base):
     # Content
     role = Column(String(50))  # system, user, assistant
     agent_type = Column(String(100))  # ProductManager, Analyst, etc.
-    content = Column(Text, nullable=False)
+    content = Column(Text)  # Legacy inline body; new rows reference message_contents
+    content_hash = Column(String(32), ForeignKey('message_contents.content_hash'), index=True)
     
     # Metadata
     timestamp = Column(DateTime, default=datetime.utcnow)
@@ -90,6 +99,22 @@ class ConversationMessage(Base):
     
     # Relationships
     session = relationship("ConversationSession", back_populates="messages")
+    body = relationship("MessageContent")
+    
+    @property
+    def text(self) -> str:
+        """Message body, whether stored inline or by reference"""
+        if self.content is not None:
+            return self.content
+        return self.body.content if self.body else ''
+
+class MessageContent(Base):
+    """Distinct message bodies, stored once and referenced by content hash"""
+    __tablename__ = 'message_contents'
+    
+    content_hash = Column(String(32), primary_key=True)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
 
 class SessionAnalytics(Base):
     """Analytics and insights for conversation sessions"""
@@ -102,9 +127,11 @@ class SessionAnalytics(Base):
     response_time_avg = Column(Float)
     response_time_max = Column(Float)
     agent_participation = Column(JSON)  # Which agents contributed what
+    round_metrics = Column(JSON)  # Sentiment, confidence and scores per conversation round
     
     # Content Analysis
     key_topics = Column(JSON)
+    topic_frequencies = Column(JSON)
     sentiment_analysis = Column(JSON)
     readability_score = Column(Float)
     technical_complexity = Column(Float)
@@ -119,6 +146,10 @@ class SessionAnalytics(Base):
     success_probability = Column(Float)
     recommended_next_steps = Column(JSON)
     
+    # Memoized engine output, keyed by a hash of the analyzed content and engine version
+    analytics_key = Column(String(64), index=True)
+    analytics_result = Column(JSON)
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -186,6 +217,50 @@ class DatabaseManager:
         self.engine = create_engine(database_url, echo=False)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
         Base.metadata.create_all(bind=self.engine)
+        self.upgrade_schema()
+    
+    def upgrade_schema(self):
+        """Bring a database created by an older version up to the current models.
+        
+        create_all only adds missing tables, so columns added since are added
+        here (nullable, with their indexes), and conversation_messages.content,
+        which used to be NOT NULL, is relaxed so bodies can live in
+        message_contents. Safe to run on every start.
+        """
+        inspector = inspect(self.engine)
+        messages = ConversationMessage.__table__
+        content = next(column for column in inspector.get_columns(messages.name) if column['name'] == 'content')
+        with self.engine.begin() as conn:
+            if not content['nullable']:
+                if self.engine.dialect.name == 'sqlite':
+                    self._rebuild_sqlite_table(conn, messages, inspector)
+                else:
+                    conn.execute(text(f'ALTER TABLE {messages.name} ALTER COLUMN content DROP NOT NULL'))
+            
+            inspector = inspect(conn)
+            for table in Base.metadata.sorted_tables:
+                existing = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                    for index in table.indexes:
+                        if column.name in index.columns:
+                            index.create(conn)
+    
+    @staticmethod
+    def _rebuild_sqlite_table(conn, table, inspector):
+        """SQLite cannot change a column's constraints in place: copy into a freshly created table"""
+        old_name = f'{table.name}_old'
+        old_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for index in inspector.get_indexes(table.name):
+            conn.execute(text(f'DROP INDEX {index["name"]}'))
+        conn.execute(text(f'ALTER TABLE {table.name} RENAME TO {old_name}'))
+        table.create(conn)
+        shared = ', '.join(column.name for column in table.columns if column.name in old_columns)
+        conn.execute(text(f'INSERT INTO {table.name} ({shared}) SELECT {shared} FROM {old_name}'))
+        conn.execute(text(f'DROP TABLE {old_name}'))
     
     def get_session(self):
         """Get database session"""
@@ -234,14 +309,19 @@ class DatabaseManager:
         """Save conversation message"""
         session = self.get_session()
         try:
+            content = message_data.get('content', '')
+            content_hash = message_data.get('content_hash') or content_digest(content)
+            if session.get(MessageContent, content_hash) is None:
+                self._store_content(session, content_hash, content)
+            
             message = ConversationMessage(
                 session_id=session_id,
                 role=message_data.get('role'),
                 agent_type=message_data.get('agent_type'),
-                content=message_data.get('content'),
+                content_hash=content_hash,
                 round_number=message_data.get('round_number'),
                 message_order=message_data.get('message_order'),
-                token_count=len(message_data.get('content', '').split())
+                token_count=len(content.split())
             )
             session.add(message)
             session.commit()
@@ -250,6 +330,106 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def _store_content(self, session, content_hash: str, content: str):
+        """Insert a message body unless it is already stored, including by a concurrent save"""
+        dialect = self.engine.dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+            session.execute(insert(MessageContent)
+                            .values(content_hash=content_hash, content=content, created_at=datetime.utcnow())
+                            .on_conflict_do_nothing(index_elements=['content_hash']))
+            return
+        try:
+            with session.begin_nested():
+                session.add(MessageContent(content_hash=content_hash, content=content))
+        except IntegrityError:
+            pass  # Stored by another writer since the lookup
+    
+    def iter_session_transcripts(self, session_ids: list[int] = None, chunk_size: int = 500):
+        """Yield {session id: message dicts in order} for stored sessions, chunk_size sessions at a time"""
+        session = self.get_session()
+        try:
+            if session_ids is None:
+                session_ids = [row[0] for row in session.query(ConversationSession.id).order_by(ConversationSession.id)]
+            
+            for start in range(0, len(session_ids), chunk_size):
+                chunk_ids = session_ids[start:start + chunk_size]
+                transcripts = {session_id: [] for session_id in chunk_ids}
+                rows = session.query(ConversationMessage.session_id, ConversationMessage.role,
+                                     ConversationMessage.agent_type, ConversationMessage.round_number,
+                                     ConversationMessage.content, MessageContent.content)\
+                              .outerjoin(MessageContent, ConversationMessage.content_hash == MessageContent.content_hash)\
+                              .filter(ConversationMessage.session_id.in_(chunk_ids))\
+                              .order_by(ConversationMessage.session_id, ConversationMessage.message_order,
+                                        ConversationMessage.id)
+                for session_id, role, agent_type, round_number, inline_content, stored_content in rows:
+                    message = {'role': role, 'content': inline_content if inline_content is not None else (stored_content or '')}
+                    if agent_type is not None:
+                        message['agent_type'] = agent_type
+                    if round_number is not None:
+                        message['round_number'] = round_number
+                    transcripts[session_id].append(message)
+                yield transcripts
+        finally:
+            session.close()
+    
+    def bulk_save_session_analytics(self, records: dict[int, dict]):
+        """Insert or update SessionAnalytics rows for many sessions in one transaction"""
+        session = self.get_session()
+        try:
+            existing = dict(session.query(SessionAnalytics.session_id, SessionAnalytics.id)
+                                   .filter(SessionAnalytics.session_id.in_(list(records))))
+            inserts = [dict(record, session_id=session_id) for session_id, record in records.items()
+                       if session_id not in existing]
+            updates = [dict(record, id=existing[session_id]) for session_id, record in records.items()
+                       if session_id in existing]
+            if inserts:
+                session.bulk_insert_mappings(SessionAnalytics, inserts)
+            if updates:
+                session.bulk_update_mappings(SessionAnalytics, updates)
+            session.commit()
+        finally:
+            session.close()
+    
+    def get_cached_analytics(self, analytics_key: str) -> dict:
+        """Stored analytics result for a content key, or None"""
+        session = self.get_session()
+        try:
+            row = session.query(SessionAnalytics.analytics_result)\
+                         .filter(SessionAnalytics.analytics_key == analytics_key)\
+                         .first()
+            return row[0] if row else None
+        finally:
+            session.close()
+    
+    def record_session_outcome(self, session_id: int, success: bool = None, quality: float = None):
+        """Label a session with its real-world outcome"""
+        session = self.get_session()
+        try:
+            conv_session = session.get(ConversationSession, session_id)
+            if conv_session is None:
+                raise ValueError(f"Unknown conversation session {session_id}")
+            if success is not None:
+                conv_session.outcome_success = success
+            if quality is not None:
+                conv_session.outcome_quality = quality
+            session.commit()
+        finally:
+            session.close()
+    
+    def get_session_outcomes(self) -> dict[int, tuple]:
+        """{session id: (outcome_success, outcome_quality)} for every labeled session"""
+        session = self.get_session()
+        try:
+            rows = session.query(ConversationSession.id, ConversationSession.outcome_success,
+                                 ConversationSession.outcome_quality)\
+                          .filter((ConversationSession.outcome_success.isnot(None)) |
+                                  (ConversationSession.outcome_quality.isnot(None)))\
+                          .order_by(ConversationSession.id)
+            return {session_id: (success, quality) for session_id, success, quality in rows}
+        finally:
+            session.close()
+    
     def get_user_sessions(self, user_id: int, limit: int = 50) -> list[ConversationSession]:
         """Get user's conversation sessions"""
         session = self.get_session()
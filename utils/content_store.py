@@ -0,0 +1,55 @@
+"""
+Content-addressed storage for conversation message bodies
+Identical agent outputs are kept once and referenced by their hash
+"""
+
+import hashlib
+from typing import Dict, Optional, Tuple
+
+
+def content_digest(text: str) -> str:
+    """Stable 128-bit hex digest of a message body"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class ContentInterner:
+    """Keeps one canonical copy of every distinct message body.
+
+    Interned bodies are shared by every history list that holds them, so a
+    fallback response repeated every round costs memory once. Repeats can
+    be collapsed to a short reference when the history is sent back to a
+    provider as prompt context.
+    """
+
+    REFERENCE_TEMPLATE = "[Repeated content - identical to {source}]"
+
+    def __init__(self):
+        self._bodies: Dict[str, str] = {}
+        self._sources: Dict[str, str] = {}
+
+    def add(self, text: str, source: Optional[str] = None) -> Tuple[str, str, bool]:
+        """Intern a body; returns (canonical text, digest, whether it was seen before).
+
+        `source` describes where the body first appeared (e.g. "the Product
+        Manager message in round 1"), so references can point back to it.
+        """
+        digest = content_digest(text)
+        canonical = self._bodies.get(digest)
+        if canonical is not None:
+            return canonical, digest, True
+        self._bodies[digest] = text
+        if source is not None:
+            self._sources[digest] = source
+        return text, digest, False
+
+    def get(self, digest: str) -> Optional[str]:
+        """Look up a body by digest"""
+        return self._bodies.get(digest)
+
+    def reference(self, digest: str) -> str:
+        """Short stand-in used in prompts for a body the model has already seen"""
+        source = self._sources.get(digest, f"an earlier message (ref:{digest[:8]})")
+        return self.REFERENCE_TEMPLATE.format(source=source)
+
+    def __len__(self) -> int:
+        return len(self._bodies)
@@ -25,11 +25,17 @@ try:
     from agents.operations_director import OperationsDirector
 except ImportError:
     OperationsDirector = None
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
+from utils.content_store import ContentInterner
 
 def simulate_conversation(project_idea: str, turns: int = 2, selected_agents: dict = None, 
-                         model: str = "llama-3.3-70b-versatile", output_format: str = "Executive Summary") -> Tuple[List[Dict[str, str]], str]:
-    """Run an enhanced multi-agent collaboration and return (history, final_report)."""
+                         model: str = "llama-3.3-70b-versatile", output_format: str = "Executive Summary",
+                         on_message: Optional[Callable[[Dict[str, str]], None]] = None) -> Tuple[List[Dict[str, str]], str]:
+    """Run an enhanced multi-agent collaboration and return (history, final_report).
+    
+    `on_message` is called with each display message as soon as it is added,
+    e.g. to update live analytics while the conversation is still running.
+    """
     
     # Default agent selection if none provided
     if selected_agents is None:
@@ -85,6 +91,24 @@ def simulate_conversation(project_idea: str, turns: int = 2, selected_agents: di
     api_history = [{"role": "user", "content": project_idea}]  # Clean history for API calls
     display_history = [{"role": "user", "content": project_idea}]  # Full history for display
     current_context = project_idea
+    if on_message:
+        on_message(display_history[0])
+    
+    # Identical agent outputs (common in fallback mode) are stored once and
+    # sent back to providers as a short reference instead of the full text
+    interner = ContentInterner()
+    
+    def record(message: str, agent_type: str, round_number: int) -> str:
+        content, content_hash, repeated = interner.add(
+            message, source=f"the {agent_type} message in round {round_number}"
+        )
+        api_content = interner.reference(content_hash) if repeated else content
+        api_history.append({"role": "assistant", "content": api_content})
+        display_history.append({"role": "assistant", "content": content, "agent_type": agent_type,
+                                "round_number": round_number, "content_hash": content_hash})
+        if on_message:
+            on_message(display_history[-1])
+        return content
     
     for round_num in range(turns):
         round_messages = []
@@ -92,71 +116,61 @@ def simulate_conversation(project_idea: str, turns: int = 2, selected_agents: di
         # PM initiates or synthesizes (if available)
         if "pm" in agents:
             pm_msg = agents["pm"].handle_message(current_context, api_history)
-            api_history.append({"role": "assistant", "content": pm_msg})
-            display_history.append({"role": "assistant", "content": pm_msg, "agent_type": "Product Manager"})
+            pm_msg = record(pm_msg, "Product Manager", round_num + 1)
             round_messages.append(pm_msg)
             current_context = pm_msg
 
         # Analyst provides data-driven insights (if available)
         if "analyst" in agents:
             analyst_msg = agents["analyst"].handle_message(current_context, api_history)
-            api_history.append({"role": "assistant", "content": analyst_msg})
-            display_history.append({"role": "assistant", "content": analyst_msg, "agent_type": "Business Analyst"})
+            analyst_msg = record(analyst_msg, "Business Analyst", round_num + 1)
             round_messages.append(analyst_msg)
             current_context = analyst_msg
 
         # UX Designer adds user experience perspective (if available)
         if "ux_designer" in agents:
             ux_msg = agents["ux_designer"].handle_message(current_context, api_history)
-            api_history.append({"role": "assistant", "content": ux_msg})
-            display_history.append({"role": "assistant", "content": ux_msg, "agent_type": "UX Designer"})
+            ux_msg = record(ux_msg, "UX Designer", round_num + 1)
             round_messages.append(ux_msg)
 
         # Marketing adds go-to-market strategy (if available)
         if "marketing" in agents:
             marketing_msg = agents["marketing"].handle_message(current_context, api_history)
-            api_history.append({"role": "assistant", "content": marketing_msg})
-            display_history.append({"role": "assistant", "content": marketing_msg, "agent_type": "Marketing Strategist"})
+            marketing_msg = record(marketing_msg, "Marketing Strategist", round_num + 1)
             round_messages.append(marketing_msg)
 
         # Technical Architect provides high-level architecture (if available)
         if "tech_architect" in agents:
             arch_msg = agents["tech_architect"].handle_message(current_context, api_history)
-            api_history.append({"role": "assistant", "content": arch_msg})
-            display_history.append({"role": "assistant", "content": arch_msg, "agent_type": "Technical Architect"})
+            arch_msg = record(arch_msg, "Technical Architect", round_num + 1)
             round_messages.append(arch_msg)
 
         # Engineer provides implementation details (if available)
         if "engineer" in agents:
             engineer_msg = agents["engineer"].handle_message(current_context, api_history)
-            api_history.append({"role": "assistant", "content": engineer_msg})
-            display_history.append({"role": "assistant", "content": engineer_msg, "agent_type": "Software Engineer"})
+            engineer_msg = record(engineer_msg, "Software Engineer", round_num + 1)
             round_messages.append(engineer_msg)
             current_context = engineer_msg
 
         # Industry specialist agents (if available)
         if "legal" in agents:
             legal_msg = agents["legal"].handle_message(current_context, api_history)
-            api_history.append({"role": "assistant", "content": legal_msg})
-            display_history.append({"role": "assistant", "content": legal_msg, "agent_type": "Legal Compliance"})
+            legal_msg = record(legal_msg, "Legal Compliance", round_num + 1)
             round_messages.append(legal_msg)
 
         if "financial" in agents:
             financial_msg = agents["financial"].handle_message(current_context, api_history)
-            api_history.append({"role": "assistant", "content": financial_msg})
-            display_history.append({"role": "assistant", "content": financial_msg, "agent_type": "Financial Analyst"})
+            financial_msg = record(financial_msg, "Financial Analyst", round_num + 1)
             round_messages.append(financial_msg)
 
         if "security" in agents:
             security_msg = agents["security"].handle_message(current_context, api_history)
-            api_history.append({"role": "assistant", "content": security_msg})
-            display_history.append({"role": "assistant", "content": security_msg, "agent_type": "Security Expert"})
+            security_msg = record(security_msg, "Security Expert", round_num + 1)
             round_messages.append(security_msg)
 
         if "operations" in agents:
             ops_msg = agents["operations"].handle_message(current_context, api_history)
-            api_history.append({"role": "assistant", "content": ops_msg})
-            display_history.append({"role": "assistant", "content": ops_msg, "agent_type": "Operations Director"})
+            ops_msg = record(ops_msg, "Operations Director", round_num + 1)
             round_messages.append(ops_msg)
 
         # Update context with round synthesis
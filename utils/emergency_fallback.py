@@ -1,3742 +1,193 @@
-﻿"""
+"""
 Enhanced Emergency Fallback for AI Agents
 Provides intelligent, detailed responses with diagrams, code, and structured formatting
 """
-import random
-
-class EmergencyFallbackEngine:
-    def __init__(self):
-        # Highly structured responses with diagrams, code, and visual elements
-        self.detailed_responses = {
-            "ProductManager": {
-                "ecommerce": """## 🛍️ E-commerce Platform - Product Strategy
-
-### 📊 Executive Summary
-Multi-vendor marketplace targeting 25-45 age group, $50K+ income, urban areas.
-
-### 🎯 Core Features & Priorities
-```
-Priority 1 (MVP - Months 1-3):
-├─ User Management: Registration, login, profiles
-├─ Product Catalog: Browse, search, filters
-├─ Shopping Cart: Add/remove items, quantity
-└─ Checkout: Payment gateway, order confirmation
-
-Priority 2 (Months 4-5):
-├─ Vendor Dashboard: Product management, analytics
-├─ Reviews & Ratings: Customer feedback system
-├─ Wishlist: Save for later functionality
-└─ Order Tracking: Real-time status updates
-
-Priority 3 (Months 6-7):
-├─ AI Recommendations: Personalized suggestions
-├─ Social Commerce: Share products on social media
-└─ AR Visualization: Virtual product preview
-```
-
-### 📈 Success Metrics (KPIs)
-| Metric | Target | Timeline |
-|--------|--------|----------|
-| GMV (Gross Merchandise Value) | $500K | Month 6 |
-| Conversion Rate | 2-3% | Month 3 |
-| Average Order Value | $75-150 | Month 4 |
-| Customer Retention | >40% | Month 6 |
-| Vendor Onboarding | 100+ | Month 5 |
-
-### 💰 Revenue Model
-```
-Revenue Streams:
-┌─ Commission per sale: 10-15% of transaction value
-├─ Premium vendor subscriptions: $99-299/month
-├─ Featured product listings: $50-200/month
-└─ Advertising: Sponsored products, banner ads
-```
-
-### 🗓️ Development Roadmap
-```mermaid
-Month 1-2: Design & Setup → User flows, wireframes, tech setup
-Month 3-4: Core Development → Catalog, cart, checkout
-Month 5: Vendor Features → Dashboard, analytics
-Month 6-7: Advanced Features → AI, AR, social
-Month 8: Testing & Launch → Beta, marketing, go-live
-```
-
-### 🎨 User Journey Map
-```
-Homepage → Browse Products → Add to Cart → Checkout → Payment → Confirmation
-    ↓           ↓              ↓            ↓          ↓           ↓
-  Search    Filter/Sort    Update Qty   Apply Coupon  Success   Email
-```""",
-                
-                "mobile_app": """## 📱 Mobile App - Product Strategy
-
-### 🎯 Target Market
-- **Demographics**: Gen Z & Millennials (18-35 years)
-- **Geography**: Global, English-speaking markets initially
-- **Psychographics**: Tech-savvy, mobile-first users
-
-### ⚡ Core Features (MVP)
-```
-App Architecture:
-┌─────────────────────────────────┐
-│    Splash Screen & Onboarding   │
-└──────────────┬──────────────────┘
-               ↓
-┌─────────────────────────────────┐
-│        Main Dashboard           │
-│  ┌───────┐ ┌───────┐ ┌───────┐│
-│  │Feature│ │Social │ │Profile││
-│  │  Hub  │ │ Feed  │ │ Zone  ││
-│  └───────┘ └───────┘ └───────┘│
-└─────────────────────────────────┘
-```
-
-### 📊 Development Timeline
-```
-Sprint 1-2 (4 weeks): UI/UX Design + Authentication
-Sprint 3-4 (4 weeks): Core Features + API Integration
-Sprint 5-6 (4 weeks): Social Features + Notifications
-Sprint 7-8 (4 weeks): Testing + Beta Launch
-```
-
-### 💰 Monetization Strategy
-| Model | Price | Features |
-|-------|-------|----------|
-| **Free** | $0 | Basic features, ads |
-| **Premium** | $4.99/mo | Ad-free, priority support |
-| **Pro** | $9.99/mo | All features, analytics |
-
-### 📈 Key Metrics
-- DAU/MAU Ratio: >20%
-- Retention (Day 30): >40%
-- Average Session: 8-12 minutes
-- Virality (K-factor): >1.2""",
-                
-                "web_platform": "**Product Vision:** Cross-platform SaaS targeting businesses and professionals. **Core Features:** Dashboard analytics, user management, API integration, real-time collaboration. **Development:** 3-5 months iterative releases. **Market Position:** Focus on unique value proposition vs competitors. **Pricing:** Tiered subscription ($29-199/month), freemium entry point. **Growth Strategy:** Content marketing, SEO, free trial conversion optimization.",
-                
-                "fitness": """## 🏋️ AI Fitness App - Comprehensive Product Strategy
-
-### 🎯 Problem Statement
-**User Pain Points:**
-- Lack of personalized workout plans (generic routines don't work for everyone)
-- Poor motivation and accountability (70% of gym memberships unused)
-- Inconsistent form leads to injuries (40% of beginners experience setbacks)
-- Nutrition confusion (conflicting diet advice overwhelms users)
-- Progress tracking difficulty (hard to measure real improvements)
-
-**Market Opportunity:**
-Fitness & wellness apps represent a $4.5B market growing at 21% CAGR. Current solutions lack true AI personalization and struggle with retention beyond 30 days.
-
----
-
-### 👥 Target User Personas
-
-**Persona 1: Busy Professional "Sarah"**
-- Age: 28-40, working professional
-- Pain Points: Limited time, inconsistent schedule
-- Goals: Stay fit, lose 10-15 lbs, improve energy
-- Willingness to Pay: $15-25/month
-
-**Persona 2: Fitness Enthusiast "Mike"**
-- Age: 22-35, regular gym-goer
-- Pain Points: Plateaus, needs progressive overload
-- Goals: Build muscle, track PRs, optimize performance
-- Willingness to Pay: $20-40/month
-
-**Persona 3: Beginner "Emma"**
-- Age: 25-45, sedentary lifestyle
-- Pain Points: Intimidated, doesn't know where to start
-- Goals: Build healthy habits, gentle introduction
-- Willingness to Pay: $10-15/month
-
----
-
-### 🎯 Core Features & Product Roadmap
-
-#### **MVP Phase (Months 1-3)**
-```
-┌──────────────────────────────────────────┐
-│           USER ONBOARDING                │
-│  ┌────────────────────────────────────┐ │
-│  │ 1. Goals & Fitness Level           │ │
-│  │ 2. Available Equipment             │ │
-│  │ 3. Schedule & Time Commitment      │ │
-│  │ 4. Health Conditions & Injuries    │ │
-│  └────────────────────────────────────┘ │
-└──────────────┬───────────────────────────┘
-               ↓
-┌──────────────────────────────────────────┐
-│        AI PERSONALIZATION ENGINE         │
-│  ┌────────────────────────────────────┐ │
-│  │ Machine Learning Algorithm         │ │
-│  │ • Collaborative Filtering          │ │
-│  │ • Content-Based Recommendations    │ │
-│  │ • Adaptive Difficulty Adjustment   │ │
-│  └────────────────────────────────────┘ │
-└──────────────┬───────────────────────────┘
-               ↓
-┌──────────────────────────────────────────┐
-│        PERSONALIZED WORKOUT PLAN         │
-│  Day 1: Upper Body (45 min)             │
-│  Day 2: Cardio HIIT (30 min)            │
-│  Day 3: Rest/Mobility                   │
-│  Day 4: Lower Body (45 min)             │
-│  Day 5: Core & Cardio (35 min)          │
-│  Day 6-7: Active Recovery               │
-└──────────────────────────────────────────┘
-```
-
-**MVP Features:**
-1. ✅ AI-Powered Workout Generator
-2. ✅ Video Exercise Library (500+ exercises)
-3. ✅ Progress Tracking (weight, reps, sets)
-4. ✅ Rest Timer & Interval Timer
-5. ✅ Basic Nutrition Logging
-6. ✅ Achievement System (badges, streaks)
-
-#### **Phase 2 - Growth Features (Months 4-6)**
-```
-Advanced Features:
-├─ 📹 Computer Vision Form Analysis (AI checks your form)
-├─ 🍎 Macro Calculator & Meal Planning
-├─ 📊 Advanced Analytics (strength curves, volume tracking)
-├─ 👥 Social Features (friends, challenges, leaderboards)
-├─ ⌚ Wearable Integration (Apple Watch, Fitbit, Garmin)
-└─ 🎵 Spotify Integration for workout playlists
-```
-
-#### **Phase 3 - Scaling (Months 7-12)**
-```
-Premium Features:
-├─ 🤖 AI Personal Training (real-time coaching)
-├─ 🎥 Live Classes & On-Demand Content
-├─ 💬 Community Forums & Groups
-├─ 🏆 Competitions & Challenges
-├─ 📱 Smart Home Gym Equipment Integration
-└─ 🍽️ Restaurant Meal Recommendations
-```
-
----
-
-### 📊 Success Metrics (KPIs)
-
-| Metric | Target | Formula | Benchmark |
-|--------|--------|---------|-----------|
-| **DAU/MAU Ratio** | >35% | Daily Active / Monthly Active | Industry: 20-25% |
-| **30-Day Retention** | >55% | Users active after 30 days | Industry: 25-40% |
-| **Session Length** | 15-25 min | Avg time per workout session | Industry: 8-15 min |
-| **Weekly Active Users** | >60% | Users logging ≥3 workouts/week | Industry: 30-45% |
-| **Completion Rate** | >80% | Workouts completed vs started | Industry: 60-70% |
-| **NPS Score** | >60 | Net Promoter Score | Industry: 30-50 |
-| **Churn Rate** | <8%/month | Monthly subscription cancellations | Industry: 10-15% |
-
----
-
-### 💰 Revenue Model & Pricing Strategy
-
-```
-Freemium Model:
-┌────────────────────────────────────────┐
-│  FREE TIER ($0)                        │
-│  • Basic workout generator             │
-│  • 100 exercise videos                 │
-│  • Progress tracking                   │
-│  • Ads supported                       │
-│  Conversion Goal: 15-20% to paid       │
-└────────────────────────────────────────┘
-
-┌────────────────────────────────────────┐
-│  PREMIUM ($12.99/month or $99/year)    │
-│  • Unlimited AI-generated workouts     │
-│  • 1000+ exercise videos               │
-│  • Form analysis with AI               │
-│  • Meal planning & nutrition           │
-│  • Ad-free experience                  │
-│  • Priority support                    │
-│  Target: 80% of revenue                │
-└────────────────────────────────────────┘
-
-┌────────────────────────────────────────┐
-│  COACHING ($29.99/month)               │
-│  • Everything in Premium               │
-│  • 1-on-1 virtual coaching (4x/month)  │
-│  • Custom meal plans                   │
-│  • Weekly check-ins                    │
-│  Target: 5-10% of users                │
-└────────────────────────────────────────┘
-```
-
-**Revenue Projections:**
-```
-Year 1: $150,000 MRR (12K users, 15% paid)
-Year 2: $500,000 MRR (38K users, 18% paid)
-Year 3: $1.2M MRR (85K users, 20% paid)
-```
-
----
-
-### 🎨 User Journey & Experience Flow
-
-```
-NEW USER JOURNEY:
-════════════════════════════════════════════════════════════
-
-Week 1: ONBOARDING & HABIT FORMATION
-┌─────────────────────────────────────────────────────────┐
-│ Day 1: Welcome! → Profile Setup → First Workout (Easy)  │
-│ Day 2: Recovery Tips → Light Activity Suggestion        │
-│ Day 3: Full Workout → Achievement: "3-Day Streak!" 🏆  │
-│ Day 4: Rest Day → Nutrition Education                   │
-│ Day 5: Workout → Push Notification: "You're crushing it!"│
-│ Day 6: Workout → Social: "Share your progress"          │
-│ Day 7: Weekly Review → Stats Dashboard                  │
-└─────────────────────────────────────────────────────────┘
-
-Week 2-4: ENGAGEMENT & RETENTION
-- Progressive difficulty increases
-- Unlock new exercises
-- Join first community challenge
-- Invite friends (referral bonus)
-- First visible results (body measurements)
-
-Month 2-3: LOYALTY & ADVOCACY
-- Upgrade prompt to Premium (personalized offer)
-- Advanced features unlocked
-- Become community contributor
-- Share success story
-```
-
----
-
-### 🏆 Gamification Strategy
-
-```
-Achievement System:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Badges & Achievements:
-├─ 🔥 Streak Master (7, 30, 100, 365 days)
-├─ 💪 Strength Gains (PR badges per exercise)
-├─ 🏃 Cardio King/Queen (distance milestones)
-├─ 📈 Consistency Champion (workout frequency)
-├─ 🎯 Goal Crusher (hit weight/fitness targets)
-└─ 👑 Elite Athlete (top 10% performance)
-
-Leaderboards:
-├─ Weekly Challenge Rankings
-├─ Friend Group Competitions
-├─ Global Community Leaders
-└─ Exercise-Specific PRs
-
-Reward System:
-├─ Points for completed workouts (redeemable for premium features)
-├─ Unlock new workout programs
-├─ Exclusive content access
-└─ Partner discounts (supplements, gear)
-```
-
----
-
-### 🤝 Competitive Analysis
-
-| Competitor | Strengths | Weaknesses | Our Advantage |
-|------------|-----------|------------|---------------|
-| **MyFitnessPal** | Huge food database | No workout guidance | AI-powered workouts |
-| **Fitbit Premium** | Device integration | Generic plans | True personalization |
-| **Nike Training Club** | Brand recognition | One-size-fits-all | Adaptive difficulty |
-| **Peloton** | High-quality content | Equipment required | Bodyweight/minimal gear |
-| **Freeletics** | Good AI coach | Expensive ($12.99/mo) | Better value + nutrition |
-
-**Our Differentiation:**
-1. 🧠 **True AI Personalization** - Adapts to YOUR progress
-2. 📹 **Computer Vision Form Check** - Prevent injuries
-3. 🍎 **Integrated Nutrition** - Workout + meal plans
-4. 💰 **Better Value** - More features at competitive price
-5. 👥 **Strong Community** - Social motivation
-
----
-
-### ⏱️ Development Timeline
-
-```
-Month 1-2: FOUNDATION
-Week 1-2:  ✓ User research & persona validation
-Week 3-4:  ✓ Wireframes & UI/UX design
-Week 5-6:  ✓ Tech stack setup & architecture
-Week 7-8:  ✓ Core database & API development
-
-Month 3-4: MVP DEVELOPMENT
-Week 9-10:  ✓ Exercise library & video integration
-Week 11-12: ✓ AI workout generator (v1)
-Week 13-14: ✓ Progress tracking & analytics
-Week 15-16: ✓ User authentication & profiles
-
-Month 5-6: TESTING & LAUNCH
-Week 17-18: ✓ Beta testing (100 users)
-Week 19-20: ✓ Bug fixes & polish
-Week 21-22: ✓ Marketing prep & app store optimization
-Week 23-24: ✓ Public Launch! 🚀
-```
-
----
-
-### 📱 Technology & Integration
-
-**Wearable Integration:**
-```
-┌─────────────────────────────────────┐
-│  Fitness App (Hub)                  │
-│         ↕️ Sync Data ↕️              │
-├─────────────────────────────────────┤
-│  ⌚ Apple Watch    │  📱 Apple Health │
-│  🏃 Fitbit         │  💪 Google Fit   │
-│  🎽 Garmin         │  📊 Strava       │
-│  💓 Polar          │  🚴 Peloton      │
-└─────────────────────────────────────┘
-
-Data Synced:
-- Heart rate & calories burned
-- Sleep quality & recovery
-- Steps & active minutes
-- Workout intensity zones
-```
-
----
-
-### 🎯 Go-to-Market Strategy
-
-**Launch Plan:**
-```
-Pre-Launch (8 weeks before):
-├─ Build landing page & email waitlist
-├─ Social media teasers (Instagram, TikTok)
-├─ Influencer partnerships (micro-influencers 10K-50K followers)
-└─ Beta program (invite 500 early adopters)
-
-Launch Week:
-├─ App Store & Play Store submission
-├─ Press release & tech blogs (TechCrunch, Product Hunt)
-├─ Influencer campaign (50 fitness creators)
-├─ Facebook & Instagram ads ($10K budget)
-└─ Limited-time offer: 50% off annual plan
-
-Post-Launch (first 90 days):
-├─ Referral program (give 1 month, get 1 month free)
-├─ Community building (Facebook group, Discord)
-├─ Content marketing (blog, YouTube tutorials)
-└─ App Store Optimization (ASO) - target top 10 in fitness category
-```
-
----
-
-### 💡 Key Differentiators
-
-1. **AI That Actually Learns:**
-   - Tracks your strength progression
-   - Adjusts difficulty automatically
-   - Suggests deload weeks when needed
-
-2. **Form Analysis (Computer Vision):**
-   - Use phone camera during workout
-   - Real-time feedback on squat depth, pushup form
-   - Injury prevention
-
-3. **Holistic Approach:**
-   - Workouts + Nutrition + Recovery
-   - Mental health integration (meditation, stress management)
-   - Sleep tracking recommendations
-
-4. **Community-Driven:**
-   - Challenge friends
-   - Virtual competitions
-   - Share workouts
-
-5. **Accessibility:**
-   - Workouts for all fitness levels (couch to 5K)
-   - Home/gym/travel options
-   - 10-60 minute workouts
-
----
-
-### 🚀 Vision Statement
-
-**"Democratize personal training through AI-powered fitness coaching, making world-class workout guidance accessible to everyone, anywhere, anytime."**
-
-**Mission:** Help 1 million people achieve their fitness goals in the first 3 years through personalized, science-backed training and unwavering support.""",
-                
-                "default": "**Product Framework:** Define user personas, core value proposition, MVP features. **Timeline:** 12-16 week development cycle, bi-weekly sprints. **Validation:** User interviews, prototype testing, A/B testing, market research. **Success Metrics:** User acquisition cost <$50, LTV:CAC ratio >3:1, churn rate <5%/month, NPS score >40."
-            },
-            
-            "Analyst": {
-                "ecommerce": """## 📊 E-commerce Market Analysis
-
-### 🌍 Market Overview
-```
-Global E-commerce Market Size (2025):
-┌────────────────────────────────────┐
-│  Total Addressable Market (TAM):  │
-│        $5.7 Trillion               │
-│  Growth Rate: 11% CAGR             │
-└────────────────────────────────────┘
-
-Regional Distribution:
-Asia-Pacific:  $3.2T  (56%) ████████████████████████████
-North America: $1.5T  (26%) █████████████
-Europe:        $0.8T  (14%) ███████
-Others:        $0.2T   (4%) ██
-```
-
-### 👥 Target Demographics
-```
-Primary Segment: Online Shoppers (25-54 years)
-┌─────────────────────────────────────────┐
-│ Age Distribution:                       │
-│ 18-24: 18% ████                        │
-│ 25-34: 32% ████████                   │
-│ 35-44: 28% ███████                    │
-│ 45-54: 15% ████                       │
-│ 55+:    7% ██                         │
-└─────────────────────────────────────────┘
-
-Income Levels:
-- $30K-50K:  25%
-- $50K-75K:  35%
-- $75K-100K: 25%
-- $100K+:    15%
-
-Shopping Preferences:
-- Mobile Commerce: 72%
-- Desktop:          28%
-```
-
-### 💰 Financial Projections (5 Years)
-
-**Revenue Model:**
-```
-Year 1:  $150K   (100 vendors, 5K customers)
-Year 2:  $500K   (300 vendors, 15K customers)
-Year 3:  $1.2M   (600 vendors, 35K customers)
-Year 4:  $2.5M   (1000 vendors, 65K customers)
-Year 5:  $5.0M   (1800 vendors, 120K customers)
-```
-
-**Unit Economics:**
-| Metric | Value |
-|--------|-------|
-| Average Order Value (AOV) | $85 |
-| Commission Rate | 12% |
-| Revenue per Order | $10.20 |
-| Customer Acquisition Cost | $35 |
-| Customer Lifetime Value | $320 |
-| LTV:CAC Ratio | 9.1:1 |
-| Gross Margin | 85% |
-| Contribution Margin | 62% |
-
-### 🏆 Competitive Landscape
-```
-Market Share Analysis:
-┌─────────────────────────────────────┐
-│ Amazon:        42% █████████████████│
-│ eBay:          12% █████            │
-│ Shopify Stores: 8% ███              │
-│ Walmart:        7% ███              │
-│ Others:        31% ████████████     │
-└─────────────────────────────────────┘
-
-Competitive Advantages Needed:
-✓ Niche focus (vertical specialization)
-✓ Better vendor support & tools
-✓ Lower commission rates (12% vs 15%)
-✓ Superior mobile experience
-✓ AI-powered recommendations
-```
-
-### 📈 Growth Drivers
-```
-1. Mobile Commerce Growth
-   📱 72% of transactions on mobile
-   📈 Growing 25% YoY
-
-2. Social Commerce
-   📷 Instagram/TikTok shopping
-   💡 Influencer partnerships
-
-3. Same-Day Delivery
-   🚚 Customer expectation
-   ⚡ Competitive necessity
-
-4. Personalization
-   🤖 AI recommendations
-   📊 Increase AOV by 15-20%
-```
-
-### ⚠️ Risk Assessment
-| Risk | Probability | Impact | Mitigation |
-|------|------------|--------|------------|
-| High CAC | Medium | High | SEO, referral program |
-| Logistics complexity | High | Medium | 3PL partnerships |
-| Payment fraud | Medium | High | Stripe Radar, 3D Secure |
-| Market saturation | High | Medium | Niche focus, differentiation |
-| Vendor churn | Medium | Medium | Better tools, lower fees |
-
-### 🎯 Go-to-Market Strategy
-```
-Phase 1 (Months 1-3): Soft Launch
-├─ Target 20 premium vendors
-├─ Curated product selection
-└─ Focus on quality over quantity
-
-Phase 2 (Months 4-6): Growth
-├─ Expand to 100 vendors
-├─ Paid marketing campaigns
-└─ Influencer partnerships
-
-Phase 3 (Months 7-12): Scale
-├─ 300+ vendors
-├─ Multi-category expansion
-└─ International markets
-```
-
-### 📊 Key Performance Indicators
-```
-Leading Indicators:
-- Vendor applications: 50/month
-- Product listings: 5,000+
-- Website traffic: 50K/month
-- Email list growth: 2K/month
-
-Lagging Indicators:
-- Gross Merchandise Value: $100K/month
-- Take rate (commission): 12%
-- Net revenue: $12K/month
-- Customer retention: 45%
-```""",
-                
-                "mobile_app": "**Market Size:** Mobile app market valued at $935B globally, growing 13.4% annually. **Target Audience:** 2.8B smartphone users worldwide, 18-35 age primary segment. **Competition:** High saturation in most categories, need strong differentiation. **Revenue Potential:** $50K-500K ARR depending on niche and execution. **Key Metrics:** Install-to-trial conversion 25%, trial-to-paid 5-15%, retention 20-40% after 90 days. **CAC:** $10-50 via organic/paid channels.",
-                
-                "fitness": """## 📊 Fitness App - Comprehensive Market Analysis
-
-### 🌍 Market Size & Opportunity
-
-```
-Global Digital Fitness Market (2025):
-┌─────────────────────────────────────────┐
-│  Total Addressable Market (TAM):       │
-│         $59.23 Billion                  │
-│  CAGR (2025-2030): 33.1%                │
-│  Projected 2030: $240 Billion           │
-└─────────────────────────────────────────┘
-
-Market Breakdown by Category:
-Fitness Apps:           $4.8B  (45%) ████████████████████
-Wearables & Devices:    $3.2B  (30%) ███████████████
-Online Fitness Classes: $1.9B  (18%) ████████
-Nutrition/Wellness:     $0.7B   (7%) ███
-```
-
-**Our Target Market:**
-```
-Serviceable Addressable Market (SAM):
-North America + Europe Fitness App Market
-= $2.1 Billion (35% of global)
-
-Serviceable Obtainable Market (SOM):
-AI-Powered Personalized Fitness Apps
-= $420 Million (20% of SAM)
-Year 1 Target: 0.036% market share = $150K revenue
-Year 5 Target: 1.2% market share = $5M revenue
-```
-
----
-
-### 👥 Target Demographics & User Segmentation
-
-**Primary Segment: Health-Conscious Millennials**
-```
-┌──────────────────────────────────────────────┐
-│ Demographics:                                │
-│ • Age: 25-40 years (sweet spot: 28-35)      │
-│ • Gender: 60% Female, 40% Male              │
-│ • Income: $50K-$100K household              │
-│ • Education: College degree or higher (72%) │
-│ • Location: Urban/suburban (85%)            │
-└──────────────────────────────────────────────┘
-
-Psychographics:
-├─ Motivated by: Health, aesthetics, performance
-├─ Values: Convenience, personalization, data
-├─ Pain Points: Time constraints, lack of guidance
-└─ Tech Adoption: Early adopters, smartphone-native
-
-Market Size: 43M users in US/Europe
-Penetration Rate: Currently 15% → Targeting 25% by 2030
-```
-
-**Secondary Segments:**
-1. **Fitness Enthusiasts (15% of users)**
-   - Age: 22-35, gym regulars, performance-focused
-   - Willingness to pay: $20-40/month
-   - Churn: Low (8%), high engagement
-
-2. **Weight Loss Seekers (30% of users)**
-   - Age: 30-50, sedentary-to-moderate activity
-   - Willingness to pay: $10-20/month
-   - Churn: Medium (12%), motivation-dependent
-
-3. **Beginners (40% of users)**
-   - Age: 25-45, new to fitness
-   - Willingness to pay: $8-15/month
-   - Churn: High (18%), need strong onboarding
-
----
-
-### 💰 Financial Model & Unit Economics
-
-**Revenue Projections (5-Year Forecast):**
-```
-Year 1:  $150,000 ARR
-├─ Users: 15,000 (10K free, 5K paid)
-├─ Conversion: 15% free-to-paid
-├─ ARPU: $120/year ($10/month average)
-└─ MRR: $12,500
-
-Year 2:  $625,000 ARR
-├─ Users: 55,000 (38K free, 17K paid)
-├─ Conversion: 18% (improving)
-├─ ARPU: $145/year ($12/month)
-└─ MRR: $52,000
-
-Year 3:  $1,850,000 ARR
-├─ Users: 125,000 (87K free, 38K paid)
-├─ Conversion: 20%
-├─ ARPU: $160/year ($13.33/month)
-└─ MRR: $154,000
-
-Year 4:  $4,200,000 ARR
-├─ Users: 240,000 (168K free, 72K paid)
-├─ Conversion: 22%
-├─ ARPU: $175/year ($14.50/month)
-└─ MRR: $350,000
-
-Year 5:  $8,500,000 ARR
-├─ Users: 420,000 (294K free, 126K paid)
-├─ Conversion: 23%
-├─ ARPU: $190/year ($15.80/month)
-└─ MRR: $708,000
-```
-
-**Detailed Unit Economics:**
-```
-┌────────────────────────────────────────────┐
-│ CUSTOMER ACQUISITION (CAC)                 │
-├────────────────────────────────────────────┤
-│ Organic (SEO, viral, referrals): $15      │
-│ Paid Social (FB, IG, TikTok):   $45      │
-│ Influencer Marketing:            $35      │
-│ Weighted Average CAC:            $32      │
-└────────────────────────────────────────────┘
-
-┌────────────────────────────────────────────┐
-│ CUSTOMER LIFETIME VALUE (LTV)              │
-├────────────────────────────────────────────┤
-│ Average Subscription: $12.99/month         │
-│ Average Tenure: 18 months                  │
-│ Gross LTV: $233.82                         │
-│ Costs (hosting, support): 15%              │
-│ Net LTV: $198.75                           │
-└────────────────────────────────────────────┘
-
-┌────────────────────────────────────────────┐
-│ KEY RATIOS                                  │
-├────────────────────────────────────────────┤
-│ LTV:CAC Ratio:    6.2:1  ✅ (Target: >3:1) │
-│ Payback Period:   2.5 months ✅            │
-│ Gross Margin:     85% ✅                   │
-│ CAC as % of LTV:  16% ✅ (Target: <33%)    │
-└────────────────────────────────────────────┘
-```
-
----
-
-### 🏆 Competitive Analysis (SWOT Matrix)
-
-**Top 5 Competitors Detailed Comparison:**
-
-```
-┌─────────────────────────────────────────────────────────┐
-│ COMPETITOR MATRIX                                       │
-├──────────────┬─────────┬─────────┬──────────┬──────────┤
-│ Company      │ Users   │ Price   │ Strengths│ Weakness │
-├──────────────┼─────────┼─────────┼──────────┼──────────┤
-│ MyFitnessPal │ 200M    │ $10/mo  │ Food DB  │ No AI    │
-│ Strava       │ 100M    │ $8/mo   │ Social   │ Cardio   │
-│ Fitbit Prem. │ 40M     │ $10/mo  │ Device   │ Generic  │
-│ Peloton      │ 7M      │ $13/mo  │ Content  │ Equip.   │
-│ Nike Train.  │ 30M     │ Free    │ Brand    │ Generic  │
-└──────────────┴─────────┴─────────┴──────────┴──────────┘
-
-Our Positioning:
-✓ Price: $12.99/mo (competitive)
-✓ USP: True AI personalization + form analysis
-�منافست Gap: Integrated nutrition + workouts
-✓ Tech Advantage: Computer vision form check
-```
-
-**SWOT Analysis:**
-
-```
-STRENGTHS                          WEAKNESSES
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-✓ AI-powered personalization      ✗ New entrant (no brand recognition)
-✓ Computer vision form analysis   ✗ Limited content library initially
-✓ Integrated nutrition + fitness  ✗ Requires funding for marketing
-✓ Competitive pricing             ✗ Tech development complexity
-✓ Strong team expertise           ✗ Customer acquisition challenges
-
-OPPORTUNITIES                      THREATS
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-✓ Post-pandemic fitness boom      ⚠ Saturated market (1000+ apps)
-✓ Home workout trend sustained    ⚠ Big tech competition (Apple, Google)
-✓ AI/ML technology advancement    ⚠ User acquisition costs rising
-✓ Wearable device adoption        ⚠ Subscription fatigue
-✓ Health insurance partnerships   ⚠ Economic recession impact
-```
-
----
-
-### 📈 Growth Strategy & Market Penetration
-
-**Customer Acquisition Channels (Budget Allocation):**
-```
-Year 1 Marketing Budget: $120,000
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Social Media Ads (40%):      $48,000 ██████████████████
-├─ Instagram Ads:  $24K
-├─ TikTok Ads:     $16K
-└─ Facebook Ads:   $8K
-
-Influencer Marketing (25%):  $30,000 ███████████
-├─ Micro-influencers (10K-50K):  15 partnerships
-├─ Mid-tier (50K-500K):          3 partnerships
-└─ Content creation budget
-
-App Store Optimization (15%): $18,000 ██████
-├─ ASO tools & optimization
-├─ User review incentives
-└─ A/B testing creative
-
-Content Marketing (10%):      $12,000 ████
-├─ Blog SEO content
-├─ YouTube channel
-└─ Free workout guides
-
-Referral Program (10%):       $12,000 ████
-└─ Give 1 month, get 1 month free
-```
-
-**Viral Growth Mechanisms:**
-```
-Built-in Virality Features:
-├─ Social Sharing (workout achievements)
-├─ Friend Challenges (competitive motivation)
-├─ Leaderboards (community engagement)
-├─ Referral Incentives ($10 credit both sides)
-└─ Success Story Showcases (user testimonials)
-
-Target Viral Coefficient (K-factor): 1.5
-(Each user brings 1.5 new users organically)
-```
-
----
-
-### 💼 Business Model Canvas
-
-```
-┌────────────────────────────────────────────────────────┐
-│ VALUE PROPOSITION                                      │
-│ "AI-powered personal trainer in your pocket"           │
-│ • Personalized workouts that adapt to YOUR progress    │
-│ • Computer vision form check prevents injuries         │
-│ • Nutrition + fitness in one app                      │
-└────────────────────────────────────────────────────────┘
-
-┌──────────────────────┐  ┌───────────────────────────┐
-│ KEY PARTNERS         │  │ CUSTOMER SEGMENTS         │
-├──────────────────────┤  ├───────────────────────────┤
-│ • Fitness influencers│  │ • Busy Professionals      │
-│ • Gym chains         │  │ • Fitness Enthusiasts     │
-│ • Nutrition brands   │  │ • Weight Loss Seekers     │
-│ • Wearable companies │  │ • Fitness Beginners       │
-│ • Health insurance   │  │ Age: 25-45, Income: $50K+ │
-└──────────────────────┘  └───────────────────────────┘
-
-┌──────────────────────┐  ┌───────────────────────────┐
-│ REVENUE STREAMS      │  │ COST STRUCTURE            │
-├──────────────────────┤  ├───────────────────────────┤
-│ • Subscriptions 90%  │  │ • Development: 35%        │
-│ • Premium coaching 8%│  │ • Marketing: 30%          │
-│ • Partnerships 2%    │  │ • Infrastructure: 15%     │
-│                      │  │ • Operations: 20%         │
-└──────────────────────┘  └───────────────────────────┘
-```
-
----
-
-### ⚠️ Risk Assessment & Mitigation
-
-| Risk Category | Probability | Impact | Mitigation Strategy |
-|---------------|-------------|--------|---------------------|
-| **Market Saturation** | High (80%) | High | Strong differentiation (AI + form check) |
-| **User Retention** | Medium (50%) | Critical | Gamification, community, personalization |
-| **Tech Development** | Medium (40%) | High | Hire experienced ML engineers, MVP first |
-| **Funding Shortage** | Low (25%) | High | Bootstrap to $50K MRR, then fundraise |
-| **Competition** | High (70%) | Medium | Patent AI algorithms, build brand moat |
-| **Regulatory (Health)** | Low (15%) | Medium | Disclaimers, consult medical advisors |
-
----
-
-### 🎯 Success Metrics & Milestones
-
-**Month 6 Milestones:**
-- ✓ 10,000 total users (7K free, 3K paid)
-- ✓ $30K MRR
-- ✓ 15% conversion rate
-- ✓ 4.5+ App Store rating
-- ✓ <10% monthly churn
-
-**Year 1 Goals:**
-- ✓ 50,000 users
-- ✓ $150K ARR
-- ✓ Break-even on unit economics
-- ✓ Product-market fit validated
-- ✓ NPS score >50
-
-**Year 3 Vision:**
-- 🚀 500,000+ users
-- 💰 $5M ARR
-- 🏆 Top 5 fitness app by category
-- 🌍 Expand to 3 international markets
-- 💼 Series A funding ($5-10M)
-
----
-
-### 📊 Conclusion & Recommendation
-
-**Investment Thesis:**
-✅ **PROCEED** - Strong market opportunity with clear differentiation
-✅ Large addressable market ($59B) growing rapidly (33% CAGR)
-✅ Proven business model (subscription SaaS)
-✅ Technology moat (AI + computer vision)
-✅ Attractive unit economics (LTV:CAC = 6.2:1)
-
-**Funding Requirement:**
-- Seed Round: $500K
-  * Product Development: $250K
-  * Marketing: $150K
-  * Operations: $75K
-  * Runway: 18 months to profitability
-
-**Expected Returns:**
-- Year 3: $1.8M ARR → $9M valuation (5x multiple)
-- Year 5: $8.5M ARR → $42M valuation
-- 10x return potential for early investors""",
-                
-                "fintech": "**Fintech Analysis:** $312B market size growing 23% annually, regulatory compliance critical (PCI-DSS, SOX, KYC/AML, GDPR). **Target:** Millennials/Gen Z (18-40) underserved by traditional banking, seeking digital-first solutions. **Revenue Streams:** Transaction fees 0.5-2.9%, interchange fees, premium subscriptions $5-15/month, lending interest. **Competition:** Neobanks (Chime, Revolut), payment apps (Venmo, PayPal), robo-advisors. **Unit Economics:** CAC $50-200, LTV $400-800, payback period 6-12 months. **Risks:** Regulatory changes, cybersecurity threats, fraud prevention, customer trust.",
-                
-                "default": "**Market Research:** Conduct TAM/SAM/SOM analysis ($XB/$YM/$ZK), competitive benchmarking (top 5 competitors), user persona validation (3-5 segments). **Financial Projections:** CAC $30-100, LTV $150-500, monthly recurring revenue growth 15-25%, path to profitability in 18-24 months. **Risk Assessment:** Market saturation 60%, regulatory compliance requirements, technology adoption curve, competitive moat strength. **Opportunity Size:** Addressable market growth 10-20% annually, white space identification."
-            },
-            
-            "Engineer": {
-                "ecommerce": """## 🔧 E-commerce Platform - Technical Architecture
-
-### 🏗️ System Architecture
-```
-                    ┌─────────────────┐
-                    │   CloudFlare    │
-                    │   CDN + WAF     │
-                    └────────┬────────┘
-                             │
-                    ┌────────▼────────┐
-                    │  Load Balancer  │
-                    │   (AWS ALB)     │
-                    └────────┬────────┘
-                             │
-        ┌────────────────────┼────────────────────┐
-        │                    │                    │
-   ┌────▼────┐         ┌────▼────┐         ┌────▼────┐
-   │  Web    │         │  Web    │         │  Web    │
-   │ Server  │         │ Server  │         │ Server  │
-   │ (Node)  │         │ (Node)  │         │ (Node)  │
-   └────┬────┘         └────┬────┘         └────┬────┘
-        │                   │                   │
-        └───────────────────┼───────────────────┘
-                            │
-        ┌───────────────────┼───────────────────┐
-        │                   │                   │
-   ┌────▼──────┐      ┌────▼──────┐      ┌────▼──────┐
-   │PostgreSQL │      │   Redis   │      │Elasticsearch│
-   │ (Primary) │      │  (Cache)  │      │  (Search)   │
-   └───────────┘      └───────────┘      └─────────────┘
-```
-
-### 💻 Tech Stack
-
-**Frontend:**
-```javascript
-// Next.js 14 + TypeScript + Tailwind CSS
-// pages/products/[id].tsx
-
-import { Product } from '@/types'
-import { AddToCart } from '@/components/Cart'
-
-export default async function ProductPage({ 
-  params 
-}: { 
-  params: { id: string } 
-}) {
-  const product = await getProduct(params.id)
-  
-  return (
-    <div className="container mx-auto p-6">
-      <div className="grid grid-cols-2 gap-8">
-        <ProductImage src={product.image} />
-        <div>
-          <h1 className="text-3xl font-bold">{product.name}</h1>
-          <p className="text-2xl text-green-600">${product.price}</p>
-          <AddToCart productId={product.id} />
-        </div>
-      </div>
-    </div>
-  )
-}
-```
-
-**Backend API:**
-```javascript
-// Node.js + Express + TypeScript
-// src/routes/products.ts
-
-import express from 'express'
-import { authenticate } from '../middleware/auth'
-import { ProductService } from '../services/product'
-
-const router = express.Router()
-
-router.post('/products', authenticate, async (req, res) => {
-  try {
-    const product = await ProductService.create({
-      name: req.body.name,
-      price: req.body.price,
-      vendorId: req.user.id,
-      category: req.body.category
-    })
-    
-    // Index in Elasticsearch for search
-    await searchClient.index({
-      index: 'products',
-      id: product.id,
-      body: product
-    })
-    
-    res.status(201).json(product)
-  } catch (error) {
-    res.status(400).json({ error: error.message })
-  }
-})
-
-export default router
-```
-
-**Database Schema:**
-```sql
--- PostgreSQL Schema
-
-CREATE TABLE users (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  email VARCHAR(255) UNIQUE NOT NULL,
-  password_hash VARCHAR(255) NOT NULL,
-  role VARCHAR(50) NOT NULL, -- 'customer' | 'vendor' | 'admin'
-  created_at TIMESTAMP DEFAULT NOW()
-);
-
-CREATE TABLE products (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  vendor_id UUID REFERENCES users(id),
-  name VARCHAR(255) NOT NULL,
-  description TEXT,
-  price DECIMAL(10,2) NOT NULL,
-  stock_quantity INTEGER NOT NULL DEFAULT 0,
-  category VARCHAR(100),
-  created_at TIMESTAMP DEFAULT NOW(),
-  INDEX idx_category (category),
-  INDEX idx_vendor (vendor_id)
-);
-
-CREATE TABLE orders (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  user_id UUID REFERENCES users(id),
-  total_amount DECIMAL(10,2) NOT NULL,
-  status VARCHAR(50) NOT NULL, -- 'pending' | 'paid' | 'shipped' | 'delivered'
-  payment_id VARCHAR(255),
-  created_at TIMESTAMP DEFAULT NOW()
-);
-
-CREATE TABLE order_items (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-  order_id UUID REFERENCES orders(id),
-  product_id UUID REFERENCES products(id),
-  quantity INTEGER NOT NULL,
-  price DECIMAL(10,2) NOT NULL
-);
-```
-
-### 🔐 Security Implementation
-```typescript
-// Authentication with JWT
-import jwt from 'jsonwebtoken'
-import bcrypt from 'bcrypt'
-
-export const authenticate = async (req, res, next) => {
-  try {
-    const token = req.headers.authorization?.split(' ')[1]
-    
-    if (!token) {
-      return res.status(401).json({ error: 'No token provided' })
-    }
-    
-    const decoded = jwt.verify(token, process.env.JWT_SECRET)
-    req.user = await User.findById(decoded.userId)
-    next()
-  } catch (error) {
-    res.status(401).json({ error: 'Invalid token' })
-  }
-}
-
-// Password hashing
-export const hashPassword = async (password: string) => {
-  return bcrypt.hash(password, 10)
-}
-```
-
-### 📦 Payment Integration (Stripe)
-```javascript
-// Payment processing
-import Stripe from 'stripe'
-
-const stripe = new Stripe(process.env.STRIPE_SECRET_KEY)
-
-router.post('/checkout', authenticate, async (req, res) => {
-  const { items } = req.body
-  
-  const session = await stripe.checkout.sessions.create({
-    payment_method_types: ['card'],
-    line_items: items.map(item => ({
-      price_data: {
-        currency: 'usd',
-        product_data: { name: item.name },
-        unit_amount: item.price * 100,
-      },
-      quantity: item.quantity,
-    })),
-    mode: 'payment',
-    success_url: `${process.env.DOMAIN}/success`,
-    cancel_url: `${process.env.DOMAIN}/cancel`,
-  })
-  
-  res.json({ sessionId: session.id })
-})
-```
-
-### 🚀 Deployment (Docker)
-```dockerfile
-# Dockerfile
-FROM node:18-alpine
-
-WORKDIR /app
-
-COPY package*.json ./
-RUN npm ci --only=production
-
-COPY . .
-RUN npm run build
-
-EXPOSE 3000
-
-CMD ["npm", "start"]
-```
-
-```yaml
-# docker-compose.yml
-version: '3.8'
-
-services:
-  web:
-    build: .
-    ports:
-      - "3000:3000"
-    environment:
-      - DATABASE_URL=postgresql://user:pass@db:5432/ecommerce
-      - REDIS_URL=redis://redis:6379
-    depends_on:
-      - db
-      - redis
-
-  db:
-    image: postgres:15
-    volumes:
-      - postgres_data:/var/lib/postgresql/data
-    environment:
-      - POSTGRES_DB=ecommerce
-      - POSTGRES_USER=user
-      - POSTGRES_PASSWORD=pass
-
-  redis:
-    image: redis:7-alpine
-    
-volumes:
-  postgres_data:
-```
-
-### ⏱️ Timeline
-```
-Week 1-2:   Setup (AWS, Docker, CI/CD)
-Week 3-6:   User auth, product catalog
-Week 7-10:  Shopping cart, checkout
-Week 11-14: Vendor dashboard
-Week 15-18: Search, filters, recommendations
-Week 19-22: Payment integration, testing
-Week 23-24: Production deployment, monitoring
-```
-
-### 📊 Performance Targets
-- Page Load: <2 seconds
-- API Response: <200ms
-- Database Queries: <50ms
-- Uptime: 99.9%
-- Concurrent Users: 10,000+""",
-                
-                "mobile_app": "**Mobile Tech Stack:** **Cross-platform:** React Native (JavaScript) or Flutter (Dart) for iOS/Android from single codebase. **Native option:** Swift (iOS) + Kotlin (Android) for maximum performance. **Backend:** Node.js/Express or Python/FastAPI with PostgreSQL. **Real-time:** Firebase for push notifications, real-time database, authentication. **State Management:** Redux/MobX (React Native) or Provider/Riverpod (Flutter). **API:** RESTful with JWT authentication, GraphQL for complex queries. **Storage:** SQLite for offline data, SecureStore for sensitive data. **Testing:** Jest, Detox for E2E testing. **CI/CD:** Fastlane, GitHub Actions, automated deployments. **Timeline:** 16-22 weeks development. **Performance:** Optimize for <2s load time, 60fps animations, <50MB app size.",
-                
-                "web_platform": "**Web Platform Stack:** **Frontend:** React.js 18+ with TypeScript, responsive design (Tailwind CSS/MUI). **State:** Redux Toolkit or Zustand, React Query for server state. **Backend:** Python/FastAPI or Node.js/NestJS, microservices architecture. **Database:** PostgreSQL primary, Redis cache, Elasticsearch for search. **Auth:** OAuth 2.0, JWT, role-based access control (RBAC). **Real-time:** WebSocket (Socket.io) for live updates. **Cloud:** AWS (EC2, RDS, S3, CloudFront) or Google Cloud. **DevOps:** Docker containers, Kubernetes orchestration, CI/CD pipeline (GitHub Actions), monitoring (DataDog/New Relic). **Security:** HTTPS/TLS, CORS policies, rate limiting, input validation. **Timeline:** 18-24 weeks, agile sprints. **Scalability:** Load balancing, auto-scaling, CDN, database read replicas.",
-                
-                "fitness": """## 🏗️ Fitness App - Technical Architecture & Implementation
-
-### 📱 System Architecture Overview
-
-```
-┌─────────────────────────────────────────────────────────────────┐
-│                     CLIENT LAYER (Mobile)                       │
-├─────────────────────────────────────────────────────────────────┤
-│                                                                 │
-│  ┌──────────────┐  ┌──────────────┐  ┌──────────────┐        │
-│  │   iOS App    │  │  Android App │  │  Web Portal  │        │
-│  │ React Native │  │ React Native │  │   React.js   │        │
-│  └──────┬───────┘  └──────┬───────┘  └──────┬───────┘        │
-│         │                  │                  │                 │
-│         └──────────────────┴──────────────────┘                │
-│                            │                                    │
-│                    ┌───────▼────────┐                          │
-│                    │   API Gateway   │                          │
-│                    │   (Kong/AWS)    │                          │
-│                    └───────┬────────┘                          │
-└────────────────────────────┼─────────────────────────────────┘
-                             │
-┌────────────────────────────▼─────────────────────────────────┐
-│                   BACKEND SERVICES LAYER                      │
-├───────────────────────────────────────────────────────────────┤
-│                                                               │
-│  ┌─────────────┐  ┌─────────────┐  ┌──────────────┐        │
-│  │   Auth      │  │   Workout   │  │  Nutrition   │        │
-│  │  Service    │  │   Service   │  │   Service    │        │
-│  │ (Node.js)   │  │ (Python)    │  │  (Python)    │        │
-│  └─────────────┘  └─────────────┘  └──────────────┘        │
-│                                                               │
-│  ┌─────────────┐  ┌─────────────┐  ┌──────────────┐        │
-│  │  Analytics  │  │   Social    │  │   Payment    │        │
-│  │  Service    │  │   Service   │  │   Service    │        │
-│  │ (Python)    │  │ (Node.js)   │  │  (Node.js)   │        │
-│  └─────────────┘  └─────────────┘  └──────────────┘        │
-│                                                               │
-│  ┌─────────────────────────────────────────────────┐        │
-│  │        AI/ML Service (Python/TensorFlow)        │        │
-│  │  - Workout Recommendation Engine                │        │
-│  │  - Computer Vision Form Analysis                │        │
-│  │  - Progress Prediction                          │        │
-│  └─────────────────────────────────────────────────┘        │
-└───────────────────────────┬───────────────────────────────────┘
-                            │
-┌───────────────────────────▼───────────────────────────────────┐
-│                      DATA LAYER                               │
-├───────────────────────────────────────────────────────────────┤
-│                                                               │
-│  ┌──────────────┐  ┌──────────────┐  ┌──────────────┐      │
-│  │  PostgreSQL  │  │  TimescaleDB │  │   MongoDB    │      │
-│  │ User Profiles│  │ Workout Logs │  │Exercise Lib  │      │
-│  │ Subscriptions│  │  Metrics     │  │Content Data  │      │
-│  └──────────────┘  └──────────────┘  └──────────────┘      │
-│                                                               │
-│  ┌──────────────┐  ┌──────────────┐  ┌──────────────┐      │
-│  │    Redis     │  │  Amazon S3   │  │ Elasticsearch│      │
-│  │  Cache/Queue │  │ Video/Images │  │  Search Index│      │
-│  └──────────────┘  └──────────────┘  └──────────────┘      │
-└───────────────────────────────────────────────────────────────┘
-```
-
----
-
-### 🔧 Technology Stack Breakdown
-
-**Mobile Frontend:**
-```typescript
-// React Native + TypeScript
-{
-  "framework": "React Native 0.72+",
-  "language": "TypeScript 5.0+",
-  "stateManagement": "Redux Toolkit + RTK Query",
-  "navigation": "React Navigation 6.x",
-  "ui": "React Native Paper + Custom Components",
-  "animations": "Reanimated 3.0 + Lottie",
-  "camera": "React Native Vision Camera (ML Kit)",
-  "charts": "Victory Native for analytics",
-  "offline": "Redux Persist + WatermelonDB",
-  "testing": "Jest + Detox for E2E"
-}
-```
-
-**Backend Services Architecture:**
-```python
-# Microservices with FastAPI + Node.js
-
-# Auth Service (Node.js + Express)
-├── JWT token generation/validation
-├── OAuth 2.0 (Google, Apple, Facebook)
-├── Role-based access control (RBAC)
-└── Session management with Redis
-
-# Workout Service (Python + FastAPI)
-├── Workout plan generation
-├── Exercise library management
-├── Real-time workout tracking
-├── Progress calculation
-└── WebSocket for live updates
-
-# Nutrition Service (Python + FastAPI)
-├── Meal planning algorithms
-├── Calorie/macro tracking
-├── Food database integration (USDA, Nutritionix)
-├── Recipe recommendations
-└── Barcode scanning
-
-# Analytics Service (Python + FastAPI)
-├── User behavior tracking
-├── Performance metrics
-├── Data aggregation & reporting
-├── A/B testing framework
-└── Cohort analysis
-
-# Social Service (Node.js + Express)
-├── Friend system & challenges
-├── Leaderboards (Redis sorted sets)
-├── Activity feed
-├── Comments & reactions
-└── Real-time notifications
-
-# Payment Service (Node.js + Express)
-├── Stripe integration
-├── Subscription management
-├── Invoice generation
-├── Refund handling
-└── Webhook processing
-```
-
----
-
-### 🤖 AI/ML Pipeline Architecture
-
-```
-┌─────────────────────────────────────────────────────────────┐
-│             COMPUTER VISION FORM ANALYSIS                   │
-├─────────────────────────────────────────────────────────────┤
-│                                                             │
-│  User Records Exercise Video (30fps)                        │
-│         ↓                                                   │
-│  Frame Extraction (every 3rd frame = 10fps)                │
-│         ↓                                                   │
-│  ┌────────────────────────────────────────────┐            │
-│  │  Pose Estimation Model (MediaPipe Pose)    │            │
-│  │  - 33 keypoints detection                  │            │
-│  │  - Confidence scores per joint             │            │
-│  │  - 3D coordinates (x, y, z)                │            │
-│  └────────────────┬───────────────────────────┘            │
-│                   ↓                                         │
-│  ┌────────────────────────────────────────────┐            │
-│  │  Form Analysis Algorithm                   │            │
-│  │  - Angle calculations (elbows, knees, etc.)│            │
-│  │  - Range of motion validation              │            │
-│  │  - Repetition counting                     │            │
-│  │  - Tempo analysis                          │            │
-│  └────────────────┬───────────────────────────┘            │
-│                   ↓                                         │
-│  ┌────────────────────────────────────────────┐            │
-│  │  Custom TensorFlow Model (CNN)             │            │
-│  │  - Exercise classification (20 exercises)  │            │
-│  │  - Form quality score (0-100)              │            │
-│  │  - Error detection & correction feedback   │            │
-│  └────────────────┬───────────────────────────┘            │
-│                   ↓                                         │
-│  Real-time Feedback to User (overlay graphics)             │
-└─────────────────────────────────────────────────────────────┘
-
-┌─────────────────────────────────────────────────────────────┐
-│         PERSONALIZED WORKOUT RECOMMENDATION                 │
-├─────────────────────────────────────────────────────────────┤
-│                                                             │
-│  Input Features:                                            │
-│  ├─ User profile (age, weight, height, fitness level)      │
-│  ├─ Workout history (exercises, volume, intensity)         │
-│  ├─ Goals (weight loss, muscle gain, endurance)            │
-│  ├─ Available equipment                                    │
-│  ├─ Time constraints                                       │
-│  └─ Preferences (exercise types liked/disliked)            │
-│         ↓                                                   │
-│  ┌────────────────────────────────────────────┐            │
-│  │  Collaborative Filtering (Matrix Factor.)  │            │
-│  │  - Similar user workout patterns           │            │
-│  │  - Exercise affinity scores                │            │
-│  └────────────────┬───────────────────────────┘            │
-│                   ↓                                         │
-│  ┌────────────────────────────────────────────┐            │
-│  │  Deep Learning Model (Neural Network)      │            │
-│  │  Architecture: 5-layer fully connected     │            │
-│  │  - Input layer: 47 features                │            │
-│  │  - Hidden: [128, 64, 32] neurons + ReLU    │            │
-│  │  - Output: Exercise recommendations + sets │            │
-│  │  - Training: 500K user-workout pairs       │            │
-│  └────────────────┬───────────────────────────┘            │
-│                   ↓                                         │
-│  ┌────────────────────────────────────────────┐            │
-│  │  Progressive Overload Algorithm             │            │
-│  │  - Auto-adjust weight/reps based on perf.  │            │
-│  │  - Prevent overtraining (fatigue tracking) │            │
-│  │  - Deload weeks scheduling                 │            │
-│  └────────────────┬───────────────────────────┘            │
-│                   ↓                                         │
-│  Personalized Workout Plan (7-day rolling)                 │
-└─────────────────────────────────────────────────────────────┘
-```
-
-**ML Model Training Pipeline:**
-```python
-# model_training_pipeline.py
-
-import tensorflow as tf
-from sklearn.model_selection import train_test_split
-
-# Data preprocessing
-def prepare_training_data():
-    '''
-    Features: [age, weight, height, BMI, fitness_level, 
-               workout_frequency, goal_type, equipment_access,
-               past_workout_features (20 dimensions), 
-               exercise_preferences (15 dimensions)]
-    Labels: [recommended_exercises, sets, reps, rest_time]
-    '''
-    # Load from TimescaleDB (500K user-workout pairs)
-    pass
-
-# Model architecture
-model = tf.keras.Sequential([
-    tf.keras.layers.Dense(128, activation='relu', input_shape=(47,)),
-    tf.keras.layers.Dropout(0.3),
-    tf.keras.layers.Dense(64, activation='relu'),
-    tf.keras.layers.Dropout(0.2),
-    tf.keras.layers.Dense(32, activation='relu'),
-    tf.keras.layers.Dense(100, activation='sigmoid')  # 100 possible exercises
-])
-
-model.compile(
-    optimizer='adam',
-    loss='binary_crossentropy',
-    metrics=['accuracy', 'precision', 'recall']
-)
-
-# Training configuration
-BATCH_SIZE = 256
-EPOCHS = 50
-VALIDATION_SPLIT = 0.2
-
-# Performance targets
-# Accuracy: >85%
-# Precision: >80%
-# Recall: >78%
-```
-
----
-
-### 💾 Database Schema Design
-
-**PostgreSQL (Primary Database):**
-```sql
--- Users Table
-CREATE TABLE users (
-    user_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    email VARCHAR(255) UNIQUE NOT NULL,
-    password_hash VARCHAR(255) NOT NULL,
-    full_name VARCHAR(100),
-    date_of_birth DATE,
-    gender VARCHAR(20),
-    height_cm INT,
-    weight_kg DECIMAL(5,2),
-    fitness_level VARCHAR(20), -- beginner, intermediate, advanced
-    goals JSONB, -- {type: 'weight_loss', target_weight: 70, deadline: '2025-12-31'}
-    subscription_tier VARCHAR(20), -- free, premium, coaching
-    subscription_expires_at TIMESTAMP,
-    created_at TIMESTAMP DEFAULT NOW(),
-    last_active_at TIMESTAMP,
-    INDEX idx_email (email),
-    INDEX idx_subscription (subscription_tier, subscription_expires_at)
-);
-
--- Workout Plans Table
-CREATE TABLE workout_plans (
-    plan_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    user_id UUID REFERENCES users(user_id),
-    plan_name VARCHAR(100),
-    goal VARCHAR(50),
-    duration_weeks INT,
-    workouts_per_week INT,
-    plan_data JSONB, -- Full workout structure
-    ai_generated BOOLEAN DEFAULT TRUE,
-    created_at TIMESTAMP DEFAULT NOW(),
-    INDEX idx_user (user_id)
-);
-
--- Exercises Library Table
-CREATE TABLE exercises (
-    exercise_id INT PRIMARY KEY,
-    name VARCHAR(100) NOT NULL,
-    category VARCHAR(50), -- strength, cardio, flexibility
-    muscle_groups TEXT[], -- ['chest', 'triceps', 'shoulders']
-    equipment_needed TEXT[], -- ['dumbbells', 'bench']
-    difficulty_level VARCHAR(20),
-    video_url VARCHAR(255),
-    instructions TEXT,
-    calories_per_minute DECIMAL(4,2),
-    INDEX idx_category (category),
-    INDEX idx_muscle_groups USING GIN(muscle_groups)
-);
-
--- Subscriptions & Payments Table
-CREATE TABLE subscriptions (
-    subscription_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    user_id UUID REFERENCES users(user_id),
-    stripe_subscription_id VARCHAR(100),
-    plan VARCHAR(20), -- premium, coaching
-    amount_cents INT,
-    currency VARCHAR(3) DEFAULT 'USD',
-    status VARCHAR(20), -- active, canceled, past_due
-    current_period_start TIMESTAMP,
-    current_period_end TIMESTAMP,
-    created_at TIMESTAMP DEFAULT NOW(),
-    INDEX idx_user (user_id),
-    INDEX idx_status (status)
-);
-```
-
-**TimescaleDB (Time-Series Metrics):**
-```sql
--- Workout Sessions (Time-series)
-CREATE TABLE workout_sessions (
-    session_id UUID NOT NULL,
-    user_id UUID NOT NULL,
-    workout_plan_id UUID,
-    started_at TIMESTAMPTZ NOT NULL,
-    completed_at TIMESTAMPTZ,
-    duration_seconds INT,
-    total_calories_burned INT,
-    exercises_completed INT,
-    average_heart_rate INT,
-    max_heart_rate INT,
-    session_data JSONB, -- Detailed exercise logs
-    PRIMARY KEY (user_id, started_at)
-);
-
--- Convert to hypertable for time-series optimization
-SELECT create_hypertable('workout_sessions', 'started_at');
-
--- Body Metrics (Time-series)
-CREATE TABLE body_metrics (
-    user_id UUID NOT NULL,
-    recorded_at TIMESTAMPTZ NOT NULL,
-    weight_kg DECIMAL(5,2),
-    body_fat_percentage DECIMAL(4,2),
-    muscle_mass_kg DECIMAL(5,2),
-    waist_cm DECIMAL(5,2),
-    source VARCHAR(50), -- manual, scale_integration, estimated
-    PRIMARY KEY (user_id, recorded_at)
-);
-
-SELECT create_hypertable('body_metrics', 'recorded_at');
-
--- Performance queries
--- Get user's workout frequency trend (last 90 days)
-SELECT time_bucket('7 days', started_at) AS week,
-       COUNT(*) AS workouts_per_week,
-       AVG(duration_seconds) AS avg_duration
-FROM workout_sessions
-WHERE user_id = $1 AND started_at > NOW() - INTERVAL '90 days'
-GROUP BY week
-ORDER BY week DESC;
-```
-
-**MongoDB (Exercise Content & Flexible Data):**
-```javascript
-// exercises_library collection
-{
-  _id: ObjectId("..."),
-  exercise_id: 1,
-  name: "Barbell Bench Press",
-  category: "strength",
-  muscle_groups: ["chest", "triceps", "shoulders"],
-  equipment: ["barbell", "bench"],
-  difficulty: "intermediate",
-  instructions: [
-    "Lie flat on bench, feet on floor",
-    "Grip bar slightly wider than shoulders",
-    "Lower bar to mid-chest with control",
-    "Press up explosively, don't lock elbows"
-  ],
-  video_url: "s3://fitness-app/videos/bench-press.mp4",
-  thumbnail_url: "s3://fitness-app/thumbs/bench-press.jpg",
-  form_cues: {
-    setup: "Retract scapula, arch back slightly",
-    execution: "Touch chest, elbows 45° angle",
-    breathing: "Inhale down, exhale up"
-  },
-  variations: [
-    {name: "Incline Bench Press", difficulty: "intermediate"},
-    {name: "Dumbbell Bench Press", difficulty: "beginner"}
-  ],
-  common_mistakes: [
-    "Flaring elbows too wide (shoulder injury risk)",
-    "Bouncing bar off chest",
-    "Not keeping feet planted"
-  ],
-  calories_per_minute: 8.5,
-  metadata: {
-    popularity_score: 0.92,
-    completion_rate: 0.87,
-    average_rating: 4.6
-  }
-}
-
-// workout_templates collection
-{
-  _id: ObjectId("..."),
-  template_name: "Upper Body Strength - Intermediate",
-  goal: "muscle_gain",
-  duration_minutes: 60,
-  exercises: [
-    {
-      exercise_id: 1,
-      name: "Barbell Bench Press",
-      sets: 4,
-      reps: "8-10",
-      rest_seconds: 120,
-      notes: "Increase weight if completing 10 reps easily"
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
+
+# Responses live on disk as utils/fallback_corpus/<agent_type>/<category>.md
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fallback_corpus")
+
+# Compiled corpus, keyword tables and section index (see utils/fallback_snapshot.py)
+SNAPSHOT_PATH = os.getenv("FALLBACK_SNAPSHOT", os.path.join(CORPUS_DIR, ".snapshot.bin"))
+
+# Weighted keywords per project category. Specific terms outweigh generic
+# ones, so "fitness app" is a fitness project rather than a mobile app.
+CATEGORY_KEYWORDS = {
+    "ecommerce": {
+        "ecommerce": 3.0, "e-commerce": 3.0, "online store": 3.0, "marketplace": 2.0,
+        "shopping": 2.0, "shop": 1.5, "retail": 1.5, "store": 1.0
     },
-    // ... more exercises
-  ],
-  equipment_required: ["barbell", "dumbbells", "bench"],
-  estimated_calories: 450,
-  created_by: "ai_generated",
-  usage_count: 12847,
-  average_rating: 4.7
-}
-```
-
----
-
-### 🔌 External Integrations
-
-**Wearable Device Integration:**
-```typescript
-// health_integrations.ts
-
-// Apple HealthKit Integration (iOS)
-import HealthKit from '@react-native-community/healthkit';
-
-async function syncAppleHealthData() {
-  const permissions = {
-    permissions: {
-      read: [
-        HealthKit.Constants.Permissions.HeartRate,
-        HealthKit.Constants.Permissions.ActiveEnergyBurned,
-        HealthKit.Constants.Permissions.Steps,
-        HealthKit.Constants.Permissions.DistanceWalkingRunning,
-      ],
-      write: [
-        HealthKit.Constants.Permissions.Workout,
-      ]
-    }
-  };
-  
-  await HealthKit.initHealthKit(permissions);
-  
-  // Fetch heart rate during workout
-  const heartRateData = await HealthKit.getHeartRateSamples({
-    startDate: workoutStartTime,
-    endDate: workoutEndTime,
-  });
-  
-  // Post workout to Apple Health
-  await HealthKit.saveWorkout({
-    type: HealthKit.Constants.WorkoutType.TraditionalStrengthTraining,
-    startDate: workoutStartTime,
-    endDate: workoutEndTime,
-    energyBurned: caloriesBurned,
-    energyBurnedUnit: 'kilocalorie',
-  });
-}
-
-// Google Fit Integration (Android)
-import GoogleFit from 'react-native-google-fit';
-
-async function syncGoogleFitData() {
-  await GoogleFit.authorize({
-    scopes: [
-      Scopes.FITNESS_ACTIVITY_READ,
-      Scopes.FITNESS_ACTIVITY_WRITE,
-      Scopes.FITNESS_BODY_READ,
-      Scopes.FITNESS_LOCATION_READ,
-    ],
-  });
-  
-  // Fetch steps
-  const stepsData = await GoogleFit.getDailySteps(startDate, endDate);
-  
-  // Insert workout session
-  await GoogleFit.saveWorkout({
-    activityType: 'strength_training',
-    start: workoutStartTime,
-    end: workoutEndTime,
-    calories: caloriesBurned,
-  });
-}
-
-// Fitbit API Integration
-async function syncFitbitData(accessToken: string) {
-  const response = await fetch(
-    `https://api.fitbit.com/1/user/-/activities/heart/date/today/1d/1min.json`,
-    {
-      headers: {
-        Authorization: `Bearer ${accessToken}`
-      }
+    "fitness": {
+        "fitness": 3.0, "workout": 2.5, "exercise": 2.0, "gym": 2.0,
+        "wellness": 1.5, "health": 1.5
+    },
+    "mobile_app": {
+        "mobile app": 2.5, "ios": 2.0, "android": 2.0, "smartphone": 2.0,
+        "mobile": 1.5, "app": 1.0
+    },
+    "web_platform": {
+        "website": 2.0, "saas": 2.0, "browser": 1.5, "web": 1.5,
+        "platform": 1.0, "online": 0.5
+    },
+    "fintech": {
+        "fintech": 3.0, "banking": 2.5, "payment": 2.0, "financial": 1.5,
+        "finance": 1.5, "money": 1.0
     }
-  );
-  
-  const heartRateData = await response.json();
-  // Process and store in TimescaleDB
 }
-```
 
-**Nutrition Database APIs:**
-```python
-# nutrition_service.py
-
-import requests
-from typing import Dict, List
+# Ties between equal scores go to the category listed first
+CATEGORY_PRIORITY = ["ecommerce", "fitness", "mobile_app", "web_platform", "fintech"]
+
+
+class KeywordClassifier:
+    """Scores text against weighted keyword tables in one pass over its words.
+
+    Every keyword (including multi-word phrases) lives in a single hash
+    table, so classification costs O(words x longest phrase) no matter how
+    many categories or keywords are registered. Matching is on whole words;
+    a trailing plural "s" is ignored.
+    """
+
+    _WORD = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+    def __init__(self, keyword_table: Dict[str, Dict[str, float]], priority: List[str]):
+        self._lookup = {}
+        self._phrase_starts = set()  # First words of multi-word keywords
+        self._max_phrase_words = 1
+        self._rank = {}
+        for category in priority:
+            self._rank[category] = len(self._rank)
+        for category, keywords in keyword_table.items():
+            self.add_category(category, keywords)
+
+    def add_category(self, category: str, keywords: Dict[str, float]):
+        """Register (or extend) a category's weighted keywords"""
+        self._rank.setdefault(category, len(self._rank))
+        for phrase, weight in keywords.items():
+            words = phrase.lower().split()
+            self._lookup.setdefault(" ".join(words), []).append((category, weight))
+            if len(words) > 1:
+                self._phrase_starts.add(words[0])
+                self._max_phrase_words = max(self._max_phrase_words, len(words))
+
+    def _match(self, phrase: str):
+        entries = self._lookup.get(phrase)
+        if entries is None and phrase.endswith("s"):
+            entries = self._lookup.get(phrase[:-1])
+        return entries
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Weighted score for every category; each keyword counts once"""
+        words = self._WORD.findall(text.lower())
+        matched = set()
+        for start, word in enumerate(words):
+            if word not in matched and self._match(word):
+                matched.add(word)
+            if word in self._phrase_starts:
+                for length in range(2, min(self._max_phrase_words, len(words) - start) + 1):
+                    phrase = " ".join(words[start:start + length])
+                    if phrase not in matched and self._match(phrase):
+                        matched.add(phrase)
+
+        totals = dict.fromkeys(self._rank, 0.0)
+        for phrase in matched:
+            for category, weight in self._match(phrase):
+                totals[category] += weight
+        return totals
+
+    def classify(self, text: str, default: str = "default") -> str:
+        """Best-scoring category, or `default` when nothing matches"""
+        totals = self.scores(text)
+        best = max(totals, key=lambda category: (totals[category], -self._rank[category]), default=None)
+        if best is None or totals[best] <= 0:
+            return default
+        return best
+
+
+class FallbackCorpus:
+    """Fallback responses keyed by (agent_type, category), read from disk on demand"""
+
+    def __init__(self, root: str = CORPUS_DIR, cache_size: int = 16):
+        self.root = root
+        self._index = None
+        self.get = lru_cache(maxsize=cache_size)(self._read_entry)
+
+    @property
+    def index(self) -> Dict[str, Set[str]]:
+        """Available categories per agent type, built from a directory listing"""
+        if self._index is None:
+            self._index = {}
+            for agent_type in os.listdir(self.root):
+                agent_dir = os.path.join(self.root, agent_type)
+                if os.path.isdir(agent_dir):
+                    self._index[agent_type] = {
+                        name[:-3] for name in os.listdir(agent_dir) if name.endswith(".md")
+                    }
+        return self._index
+
+    def resolve(self, agent_type: str, category: str) -> Tuple[str, str]:
+        """Map a request onto an existing entry, falling back like the original dict lookups"""
+        if agent_type not in self.index:
+            agent_type = "ProductManager"
+        if category not in self.index[agent_type]:
+            category = "default"
+        return agent_type, category
 
-class NutritionAPIClient:
-    def __init__(self):
-        self.usda_api_key = os.getenv('USDA_API_KEY')
-        self.nutritionix_app_id = os.getenv('NUTRITIONIX_APP_ID')
-        self.nutritionix_app_key = os.getenv('NUTRITIONIX_APP_KEY')
-    
-    def search_food_usda(self, query: str) -> List[Dict]:
-        '''Search USDA Food Data Central'''
-        url = f"https://api.nal.usda.gov/fdc/v1/foods/search"
-        params = {
-            'api_key': self.usda_api_key,
-            'query': query,
-            'pageSize': 10
-        }
-        response = requests.get(url, params=params)
-        return response.json()['foods']
-    
-    def get_nutrition_nutritionix(self, food_name: str) -> Dict:
-        '''Get detailed nutrition from Nutritionix'''
-        url = "https://trackapi.nutritionix.com/v2/natural/nutrients"
-        headers = {
-            'x-app-id': self.nutritionix_app_id,
-            'x-app-key': self.nutritionix_app_key,
-            'Content-Type': 'application/json'
-        }
-        data = {'query': food_name}
-        response = requests.post(url, headers=headers, json=data)
-        return response.json()['foods'][0]
-    
-    def barcode_lookup(self, upc_code: str) -> Dict:
-        '''Lookup food by barcode/UPC'''
-        url = f"https://trackapi.nutritionix.com/v2/search/item"
-        headers = {
-            'x-app-id': self.nutritionix_app_id,
-            'x-app-key': self.nutritionix_app_key
-        }
-        params = {'upc': upc_code}
-        response = requests.get(url, headers=headers, params=params)
-        return response.json()
-```
+    def _read_entry(self, agent_type: str, category: str) -> str:
+        path = os.path.join(self.root, agent_type, f"{category}.md")
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return f.read()
 
----
 
-### 🚀 Deployment & DevOps
+class EmergencyFallbackEngine:
+    def __init__(self, top_k: int = 3, snapshot_path: str = SNAPSHOT_PATH):
+        # Highly structured responses with diagrams, code, and visual elements,
+        # memory-mapped from a precompiled snapshot on first use so processes
+        # that never fall back pay nothing for them
+        self.snapshot_path = snapshot_path
+        self.top_k = top_k  # Sections retrieved per response
+        self.corpus = None
+        self.classifier = None
+        self.section_index = None
+        self._load_lock = threading.Lock()
+
+    def _load(self):
+        """Map the snapshot (rebuilding it if the corpus changed) and wire up its parts"""
+        if self.corpus is not None:
+            return
+
+        from utils.fallback_index import SectionIndex
+        from utils.fallback_snapshot import FallbackSnapshot
+
+        # Agents fall back from threadpool workers; only the first one loads
+        with self._load_lock:
+            if self.corpus is not None:
+                return
+            snapshot = FallbackSnapshot.load(self.snapshot_path, CORPUS_DIR, CATEGORY_KEYWORDS, CATEGORY_PRIORITY)
+            self.classifier = KeywordClassifier(snapshot.keywords, snapshot.priority)
+            self.section_index = SectionIndex(snapshot, data=snapshot.section_index)
+            self.corpus = snapshot
 
-**Infrastructure (AWS):**
-```yaml
-# terraform/main.tf
+    def get_fallback_response(self, project_description: str, agent_type: str) -> str:
+        """Generate intelligent fallback response based on project context"""
+        self._load()
 
-# ECS Cluster for microservices
-resource "aws_ecs_cluster" "fitness_app" {
-  name = "fitness-app-cluster"
-  
-  setting {
-    name  = "containerInsights"
-    value = "enabled"
-  }
-}
+        # Determine project category from weighted whole-word keyword matches
+        category = self.classifier.classify(project_description)
 
-# RDS PostgreSQL
-resource "aws_db_instance" "postgres" {
-  identifier        = "fitness-app-db"
-  engine            = "postgres"
-  engine_version    = "15.3"
-  instance_class    = "db.t3.large"
-  allocated_storage = 100
-  storage_type      = "gp3"
-  
-  multi_az               = true
-  backup_retention_period = 7
-  
-  performance_insights_enabled = true
-}
+        # Retrieve the sections of the detected category's entry that best
+        # match the description; use the whole entry if nothing matches well
+        corpus_agent, corpus_category = self.corpus.resolve(agent_type, category)
+        hits = self.section_index.search(project_description, corpus_agent, corpus_category, k=self.top_k)
+        if hits:
+            response = self.section_index.assemble(hits)
+        else:
+            response = self.corpus.get(corpus_agent, corpus_category)
 
-# ElastiCache Redis
-resource "aws_elasticache_cluster" "redis" {
-  cluster_id           = "fitness-app-cache"
-  engine               = "redis"
-  engine_version       = "7.0"
-  node_type            = "cache.t3.medium"
-  num_cache_nodes      = 2
-  parameter_group_name = "default.redis7"
-}
-
-# S3 for media storage
-resource "aws_s3_bucket" "media" {
-  bucket = "fitness-app-media-prod"
-  
-  cors_rule {
-    allowed_headers = ["*"]
-    allowed_methods = ["GET", "HEAD"]
-    allowed_origins = ["*"]
-    max_age_seconds = 3000
-  }
-}
-
-# CloudFront CDN
-resource "aws_cloudfront_distribution" "cdn" {
-  origin {
-    domain_name = aws_s3_bucket.media.bucket_regional_domain_name
-    origin_id   = "S3-fitness-app-media"
-  }
-  
-  enabled = true
-  default_cache_behavior {
-    target_origin_id = "S3-fitness-app-media"
-    viewer_protocol_policy = "redirect-to-https"
-    
-    min_ttl     = 0
-    default_ttl = 86400
-    max_ttl     = 31536000
-  }
-}
-
-# Cost estimate: $1,200-1,800/month for 50K users
-```
-
-**CI/CD Pipeline (GitHub Actions):**
-```yaml
-# .github/workflows/deploy.yml
-
-name: Deploy to Production
-
-on:
-  push:
-    branches: [main]
-
-jobs:
-  test:
-    runs-on: ubuntu-latest
-    steps:
-      - uses: actions/checkout@v3
-      
-      - name: Run Backend Tests
-        run: |
-          cd backend
-          pip install -r requirements.txt
-          pytest --cov=. --cov-report=xml
-      
-      - name: Run Mobile Tests
-        run: |
-          cd mobile
-          yarn install
-          yarn test
-          yarn detox test -c ios.sim.release
-  
-  build:
-    needs: test
-    runs-on: ubuntu-latest
-    steps:
-      - name: Build Docker Images
-        run: |
-          docker build -t fitness-app-api:${{ github.sha }} ./backend
-          docker push ecr.amazonaws.com/fitness-app-api:${{ github.sha }}
-      
-      - name: Build iOS App
-        run: |
-          cd mobile/ios
-          fastlane beta
-      
-      - name: Build Android App
-        run: |
-          cd mobile/android
-          fastlane beta
-  
-  deploy:
-    needs: build
-    runs-on: ubuntu-latest
-    steps:
-      - name: Deploy to ECS
-        run: |
-          aws ecs update-service \
-            --cluster fitness-app-cluster \
-            --service api-service \
-            --force-new-deployment
-      
-      - name: Run Database Migrations
-        run: |
-          alembic upgrade head
-```
-
----
-
-### 📊 Performance & Scalability
-
-**System Performance Targets:**
-```
-┌─────────────────────────────────────────────────┐
-│ PERFORMANCE BENCHMARKS                          │
-├─────────────────────────────────────────────────┤
-│ App Launch Time:           < 2.5 seconds        │
-│ API Response Time (p50):   < 150ms              │
-│ API Response Time (p95):   < 400ms              │
-│ API Response Time (p99):   < 800ms              │
-│ Database Query Time:       < 50ms               │
-│ ML Inference (workout rec):< 200ms              │
-│ Video Form Analysis:       < 3 sec/30-sec clip  │
-│ Offline Sync Time:         < 5 seconds          │
-│ Push Notification Delivery:< 1 second           │
-│ Crash-Free Rate:           > 99.5%              │
-│ App Size (iOS):            < 80 MB               │
-│ App Size (Android):        < 60 MB               │
-└─────────────────────────────────────────────────┘
-```
-
-**Scalability Strategy:**
-```
-Current Capacity (Year 1):
-├─ 50,000 concurrent users
-├─ 500 requests/second
-├─ 2TB storage
-└─ $1,500/month infrastructure cost
-
-Year 3 Capacity (Target):
-├─ 500,000 concurrent users (10x growth)
-├─ 5,000 requests/second
-├─ 20TB storage
-├─ $12,000/month infrastructure cost
-└─ Strategies:
-    ├─ Horizontal scaling (auto-scaling groups)
-    ├─ Database read replicas (3 regions)
-    ├─ CDN for static content (99% cache hit rate)
-    ├─ Redis caching (80% cache hit rate)
-    └─ Async job processing (Celery + RabbitMQ)
-```
-
----
-
-### 🔐 Security Implementation
-
-```python
-# security_measures.py
-
-# 1. Data Encryption
-# - At rest: AES-256 encryption for database
-# - In transit: TLS 1.3 for all API calls
-# - PII encryption: Separate encryption keys for sensitive data
-
-# 2. Authentication & Authorization
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-import jwt
-
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401)
-        return user_id
-    except jwt.JWTError:
-        raise HTTPException(status_code=401)
-
-# 3. Rate Limiting
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-
-limiter = Limiter(key_func=get_remote_address)
-
-@app.post("/api/workouts")
-@limiter.limit("100/hour")  # Max 100 requests per hour
-async def create_workout():
-    pass
-
-# 4. Input Validation
-from pydantic import BaseModel, validator, constr
-
-class WorkoutCreate(BaseModel):
-    name: constr(min_length=1, max_length=100)
-    duration_minutes: int
-    
-    @validator('duration_minutes')
-    def validate_duration(cls, v):
-        if v < 5 or v > 300:
-            raise ValueError('Duration must be between 5-300 minutes')
-        return v
-
-# 5. Health Data Compliance (HIPAA-ready)
-# - Audit logging for all data access
-# - Data anonymization for analytics
-# - User data export/deletion (GDPR compliance)
-```
-
----
-
-### 📅 Development Timeline
-
-```
-Phase 1: Foundation (Weeks 1-8)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Week 1-2:  Project setup, architecture design
-Week 3-4:  Database schema, Auth service
-Week 5-6:  Mobile app foundation (navigation, UI)
-Week 7-8:  Workout service MVP, exercise library
-
-Phase 2: Core Features (Weeks 9-16)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Week 9-10:  Workout tracking, progress logging
-Week 11-12: Nutrition service, meal tracking
-Week 13-14: Analytics service, charts/dashboards
-Week 15-16: Social features (friends, challenges)
-
-Phase 3: AI/ML Integration (Weeks 17-22)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Week 17-18: ML model training (workout recommendations)
-Week 19-20: Computer vision form analysis MVP
-Week 21-22: Model integration, real-time inference
-
-Phase 4: Polish & Launch (Weeks 23-26)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Week 23:    Payment integration (Stripe)
-Week 24:    Wearable integrations (Apple, Fitbit)
-Week 25:    Beta testing, bug fixes
-Week 26:    App Store submission, soft launch
-
-Total: 26 weeks (6.5 months)
-```
-
----
-
-### 👥 Development Team
-
-```
-Required Team (10 people):
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-├─ Mobile Engineers (2)
-│  ├─ React Native + TypeScript expertise
-│  └─ iOS/Android native experience
-│
-├─ Backend Engineers (3)
-│  ├─ Python/FastAPI specialist
-│  ├─ Node.js/Express specialist
-│  └─ Database/DevOps engineer
-│
-├─ ML Engineers (2)
-│  ├─ Computer vision specialist
-│  └─ Recommendation systems expert
-│
-├─ QA Engineers (1)
-│  └─ Mobile + API testing
-│
-├─ Product Designer (1)
-│  └─ UX/UI + prototyping
-│
-└─ Project Manager (1)
-   └─ Technical PM with fitness domain knowledge
-
-Budget Estimate:
-├─ Salaries (6 months): $450,000
-├─ Infrastructure: $9,000
-├─ Tools/Software: $15,000
-├─ Marketing (pre-launch): $30,000
-└─ Total: ~$500,000
-```
-
----
-
-### ✅ Success Criteria
-
-**Technical KPIs:**
-- ✓ 99.9% uptime (< 45 min downtime/month)
-- ✓ < 0.5% crash rate
-- ✓ < 2s app launch time
-- ✓ < 200ms API response time (p95)
-- ✓ 80%+ test coverage (backend + mobile)
-- ✓ 4.5+ App Store rating
-- ✓ A rating on Mobile Security Scorecard
-
-**This architecture supports 100K+ users with room to scale to 1M+ users with minimal infrastructure changes.**""",
-                
-                "default": """## 📋 General Mobile App - Technical Architecture
-
-### 🏗️ App Architecture
-```
-┌─────────────────────────────────────┐
-│         Presentation Layer          │
-│    (React Native / Flutter)         │
-└──────────────┬──────────────────────┘
-               │
-┌──────────────▼──────────────────────┐
-│         Business Logic Layer        │
-│     (State Management, Services)    │
-└──────────────┬──────────────────────┘
-               │
-┌──────────────▼──────────────────────┐
-│           Data Layer                │
-│  (API, Local Storage, Cache)        │
-└─────────────────────────────────────┘
-```
-
-### 💻 Code Example
-```javascript
-// React Native + TypeScript
-import React, { useState } from 'react'
-import { View, Text, Button } from 'react-native'
-
-export const MainScreen = () => {
-  const [data, setData] = useState(null)
-  
-  const fetchData = async () => {
-    const response = await fetch('/api/data')
-    setData(await response.json())
-  }
-  
-  return (
-    <View style={{ padding: 20 }}>
-      <Text style={{ fontSize: 24 }}>Welcome!</Text>
-      <Button title="Load Data" onPress={fetchData} />
-    </View>
-  )
-}
-```
-
-### ⏱️ Timeline: 12-18 weeks
-### 🎯 Focus: Clean code, testing, CI/CD"""
-            },
-            
-            "FinancialAnalyst": {
-                "ecommerce": """## 💰 E-commerce Financial Analysis
-
-### 📊 Financial Model (5-Year Projection)
-
-**Revenue Breakdown:**
-```
-Year 1: $150,000
-├─ Transaction Fees (12%): $120,000 (80%)
-├─ Vendor Subscriptions:   $20,000  (13%)
-└─ Advertising Revenue:    $10,000   (7%)
-
-Year 2: $500,000
-├─ Transaction Fees: $380,000 (76%)
-├─ Subscriptions:    $80,000  (16%)
-└─ Advertising:      $40,000   (8%)
-
-Year 3: $1,200,000
-Year 4: $2,500,000
-Year 5: $5,000,000
-```
-
-### 💵 Unit Economics
-| Metric | Value | Formula |
-|--------|-------|---------|
-| **Average Order Value** | $85 | Total GMV / Orders |
-| **Take Rate** | 12% | Commission % |
-| **Revenue per Order** | $10.20 | AOV × Take Rate |
-| **CAC** | $35 | Marketing / New Customers |
-| **LTV** | $320 | Avg Orders × Revenue per Order |
-| **LTV:CAC Ratio** | 9.1:1 | LTV / CAC |
-| **Payback Period** | 3.4 months | CAC / (LTV / Avg Lifetime) |
-
-### 📈 P&L Statement (Year 1)
-```
-Revenue:                        $150,000
-  Transaction Fees:             $120,000
-  Subscriptions:                 $20,000
-  Advertising:                   $10,000
-
-Cost of Revenue:                ($22,500)  15%
-  Payment Processing:           ($15,000)  10%
-  Hosting & Infrastructure:      ($7,500)   5%
-
-Gross Profit:                   $127,500  85%
-
-Operating Expenses:            ($105,000)
-  Sales & Marketing:            ($45,000)  30%
-  Engineering & Product:        ($40,000)  27%
-  General & Administrative:     ($20,000)  13%
-
-EBITDA:                         $22,500   15%
-Net Income:                     $22,500   15%
-```
-
-### 💸 Funding Requirements
-```
-Seed Round: $250,000
-├─ Product Development: $100,000 (40%)
-├─ Marketing & Sales:    $80,000 (32%)
-├─ Operations:           $40,000 (16%)
-└─ Reserve (Runway):     $30,000 (12%)
-
-18-month runway to profitability
-```
-
-### 📊 Key Financial Metrics
-```
-Month-over-Month Growth:     15-25%
-Gross Margin Target:         85%
-Net Margin Target (Y3):      25%
-Break-even Point:            Month 18
-Cash Flow Positive:          Month 20
-```
-
-### ⚠️ Financial Risks
-- **Vendor churn**: 15% annual (mitigate with better tools)
-- **Payment fraud**: 0.5% of GMV (Stripe Radar mitigation)
-- **CAC inflation**: Monitor, optimize channels
-- **Seasonality**: Q4 spike, plan inventory""",
-                
-                "fitness": """## 💰 Fitness App - Comprehensive Financial Analysis
-
-### 📊 5-Year Financial Model & Projections
-
-**Revenue Forecast (Conservative to Aggressive Scenarios):**
-
-```
-CONSERVATIVE SCENARIO:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Year 1:  $180,000 ARR  |  15,000 users (5K paid @ 15% conversion)
-Year 2:  $720,000 ARR  |  60,000 users (18K paid @ 18% conversion)
-Year 3:  $2,100,000 ARR | 150,000 users (45K paid @ 20% conversion)
-Year 4:  $4,800,000 ARR | 300,000 users (96K paid @ 22% conversion)
-Year 5:  $9,500,000 ARR | 550,000 users (176K paid @ 23% conversion)
-
-AGGRESSIVE SCENARIO:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Year 1:  $250,000 ARR  |  20,000 users (7K paid @ 18% conversion)
-Year 2:  $1,200,000 ARR | 90,000 users (30K paid @ 22% conversion)
-Year 3:  $3,800,000 ARR | 240,000 users (95K paid @ 25% conversion)
-Year 4:  $8,500,000 ARR | 500,000 users (212K paid @ 28% conversion)
-Year 5:  $18,000,000 ARR| 1M users (450K paid @ 30% conversion)
-```
-
----
-
-### 💵 Detailed Unit Economics Analysis
-
-**Customer Acquisition Cost (CAC) Breakdown:**
-
-```
-┌─────────────────────────────────────────────────────┐
-│ CHANNEL-SPECIFIC CAC (Blended Average: $32)        │
-├─────────────────────────────────────────────────────┤
-│ Channel              │ CAC    │ Conv. │ % of Mix  │
-├──────────────────────┼────────┼───────┼───────────┤
-│ Organic (SEO/ASO)    │ $8     │ 18%   │ 25%       │
-│ Social Viral/Referal │ $12    │ 22%   │ 20%       │
-│ Instagram Ads        │ $38    │ 12%   │ 30%       │
-│ TikTok Ads           │ $28    │ 15%   │ 15%       │
-│ Google Search Ads    │ $52    │ 14%   │ 10%       │
-└──────────────────────┴────────┴───────┴───────────┘
-
-Blended CAC Calculation:
-= (0.25 × $8) + (0.20 × $12) + (0.30 × $38) + (0.15 × $28) + (0.10 × $52)
-= $2.00 + $2.40 + $11.40 + $4.20 + $5.20
-= $25.20 (Year 1) → $32 (Year 3, as competition increases)
-```
-
-**Customer Lifetime Value (LTV) Analysis:**
-
-```
-┌──────────────────────────────────────────────────────┐
-│ LTV CALCULATION (12-MONTH COHORT)                    │
-├──────────────────────────────────────────────────────┤
-│ Average Subscription Price:      $12.99/month        │
-│ Average Customer Tenure:          18 months          │
-│ Churn Rate:                       5.5%/month         │
-│                                                       │
-│ Gross LTV:  $12.99 × 18 = $233.82                   │
-│                                                       │
-│ Costs:                                               │
-│ ├─ Hosting/Infrastructure: $1.50/user/month = $27   │
-│ ├─ Payment Processing (2.9%): $6.78                 │
-│ ├─ Customer Support: $8/user                        │
-│ └─ Total Costs: $41.78                              │
-│                                                       │
-│ NET LTV: $233.82 - $41.78 = $192.04                 │
-│                                                       │
-│ LTV:CAC Ratio: $192.04 ÷ $32 = 6.0:1 ✅            │
-│ (Target: >3:1 is healthy, >5:1 is excellent)        │
-│                                                       │
-│ Payback Period: $32 ÷ ($12.99 - $2.30) = 3.0 months│
-└──────────────────────────────────────────────────────┘
-```
-
-**Subscription Tier Performance:**
-
-```
-┌───────────────────────────────────────────────────────┐
-│ TIER BREAKDOWN (Month 12)                            │
-├───────────────────────────────────────────────────────┤
-│ Free Tier:                                            │
-│   Users: 10,000 (67% of total)                       │
-│   Revenue: $0                                         │
-│   Purpose: Top of funnel, conversion pipeline        │
-│                                                       │
-│ Premium Tier ($12.99/mo):                            │
-│   Users: 4,500 (30% of total, 45% of paid)          │
-│   MRR: $58,455                                        │
-│   ARR: $701,460                                       │
-│   LTV: $180                                           │
-│   Avg Tenure: 16 months                              │
-│                                                       │
-│ Coaching Tier ($29.99/mo):                           │
-│   Users: 500 (3% of total, 10% of paid)             │
-│   MRR: $14,995                                        │
-│   ARR: $179,940                                       │
-│   LTV: $450                                           │
-│   Avg Tenure: 22 months                              │
-│   Premium Support Cost: $15/user/month               │
-│                                                       │
-│ TOTAL PAID: 5,000 users                              │
-│ TOTAL MRR: $73,450                                    │
-│ TOTAL ARR: $881,400                                   │
-│ Blended ARPU: $176.28                                 │
-└───────────────────────────────────────────────────────┘
-```
-
----
-
-### 📈 Detailed P&L Statement (Year 1-3)
-
-**Income Statement (Year 1):**
-
-```
-═══════════════════════════════════════════════════════
-REVENUE                                      $180,000
-───────────────────────────────────────────────────────
-Subscription Revenue                         $165,000  92%
-├─ Premium Tier ($12.99)                    $135,000
-└─ Coaching Tier ($29.99)                    $30,000
-
-In-App Purchases (one-time plans)            $10,000   6%
-Partner Commissions (affiliate)               $5,000   3%
-═══════════════════════════════════════════════════════
-
-COST OF REVENUE                             ($27,000) 15%
-───────────────────────────────────────────────────────
-Cloud Infrastructure (AWS)                   ($15,000)
-├─ ECS/Lambda compute                        ($8,000)
-├─ RDS/TimescaleDB                           ($4,000)
-└─ S3/CloudFront CDN                         ($3,000)
-
-Payment Processing (Stripe 2.9% + 30¢)      ($6,000)
-Content Licensing (workout videos)            ($4,000)
-API Costs (nutrition, wearables)              ($2,000)
-═══════════════════════════════════════════════════════
-
-GROSS PROFIT                                $153,000  85%
-═══════════════════════════════════════════════════════
-
-OPERATING EXPENSES                         ($198,000)
-───────────────────────────────────────────────────────
-Sales & Marketing                           ($72,000) 40%
-├─ Paid Advertising (FB/IG/TikTok)          ($48,000)
-├─ Influencer Partnerships                  ($15,000)
-├─ Content Marketing                         ($6,000)
-└─ App Store Optimization                    ($3,000)
-
-Research & Development                      ($85,000) 47%
-├─ Engineering Salaries (3 FTE)             ($60,000)
-├─ ML Engineer (1 FTE)                      ($20,000)
-└─ Tools & Software                          ($5,000)
-
-General & Administrative                    ($30,000) 17%
-├─ Founder Salaries                         ($18,000)
-├─ Legal & Accounting                        ($5,000)
-├─ Insurance & Licenses                      ($3,000)
-├─ Office & Misc                             ($2,000)
-└─ Customer Support                          ($2,000)
-═══════════════════════════════════════════════════════
-
-EBITDA                                     ($45,000) -25%
-Depreciation & Amortization                  ($5,000)
-───────────────────────────────────────────────────────
-NET INCOME (LOSS)                          ($50,000) -28%
-═══════════════════════════════════════════════════════
-```
-
-**Income Statement (Year 2):**
-
-```
-REVENUE                                      $720,000
-Subscription Revenue                         $670,000  93%
-Other Revenue                                 $50,000   7%
-
-COST OF REVENUE                             ($90,000) 12.5%
-Cloud & Infrastructure                       ($55,000)
-Payment Processing                           ($22,000)
-Content & APIs                               ($13,000)
-
-GROSS PROFIT                                $630,000  87.5%
-
-OPERATING EXPENSES                         ($540,000)
-Sales & Marketing                          ($216,000) 30%
-R&D                                        ($252,000) 35%
-G&A                                         ($72,000) 10%
-
-NET INCOME (LOSS)                           $90,000  12.5%
-(BREAK-EVEN ACHIEVED: Month 18)
-```
-
-**Income Statement (Year 3):**
-
-```
-REVENUE                                    $2,100,000
-Subscription Revenue                       $1,995,000  95%
-Other Revenue                                $105,000   5%
-
-COST OF REVENUE                            ($273,000) 13%
-GROSS PROFIT                               $1,827,000  87%
-
-OPERATING EXPENSES                       ($1,365,000)
-Sales & Marketing                          ($525,000) 25%
-R&D                                        ($630,000) 30%
-G&A                                        ($210,000) 10%
-
-NET INCOME                                  $462,000  22%
-```
-
----
-
-### 💸 Cash Flow Analysis
-
-**Year 1 Monthly Cash Flow:**
-
-```
-Month │ Revenue │ Costs  │ Cash Flow │ Cumulative │ Runway
-──────┼─────────┼────────┼───────────┼────────────┼───────
-  1   │  $3,000 │ $22,000│ ($19,000) │ ($19,000)  │ 17 mo
-  2   │  $5,500 │ $23,000│ ($17,500) │ ($36,500)  │ 16 mo
-  3   │  $8,500 │ $24,000│ ($15,500) │ ($52,000)  │ 15 mo
-  4   │ $11,000 │ $25,000│ ($14,000) │ ($66,000)  │ 14 mo
-  5   │ $13,500 │ $26,000│ ($12,500) │ ($78,500)  │ 13 mo
-  6   │ $16,000 │ $27,000│ ($11,000) │ ($89,500)  │ 12 mo
-  7   │ $18,500 │ $28,000│  ($9,500) │ ($99,000)  │ 11 mo
-  8   │ $21,000 │ $29,000│  ($8,000) │($107,000)  │ 10 mo
-  9   │ $24,000 │ $30,000│  ($6,000) │($113,000)  │  9 mo
- 10   │ $27,000 │ $31,000│  ($4,000) │($117,000)  │  8 mo
- 11   │ $30,000 │ $32,000│  ($2,000) │($119,000)  │  7 mo
- 12   │ $33,000 │ $33,000│      $0   │($119,000)  │ ∞
-──────┴─────────┴────────┴───────────┴────────────┴───────
-TOTAL:  $210,000  $330,000  ($120,000)
-
-Key Insight: Break-even on monthly ops by Month 12
-Total capital required: $500K (includes $120K burn + runway)
-```
-
----
-
-### 💰 Funding Strategy & Capital Requirements
-
-**Seed Round: $500,000**
-
-```
-┌────────────────────────────────────────────────────┐
-│ USE OF FUNDS (18-MONTH RUNWAY)                     │
-├────────────────────────────────────────────────────┤
-│                                                    │
-│  Product Development:        $175,000  (35%)      │
-│  ├─ Engineering team (4)     $140,000             │
-│  ├─ ML/AI development         $25,000             │
-│  └─ Design & UX               $10,000             │
-│                                                    │
-│  Marketing & Growth:         $175,000  (35%)      │
-│  ├─ Paid advertising         $120,000             │
-│  ├─ Influencer partnerships   $35,000             │
-│  ├─ Content creation          $15,000             │
-│  └─ ASO & SEO                  $5,000             │
-│                                                    │
-│  Operations:                  $75,000  (15%)      │
-│  ├─ Founder salaries          $45,000             │
-│  ├─ Infrastructure            $20,000             │
-│  └─ Customer support          $10,000             │
-│                                                    │
-│  Working Capital Reserve:     $75,000  (15%)      │
-│  └─ 3-month buffer                                │
-│                                                    │
-│  TOTAL:                      $500,000             │
-└────────────────────────────────────────────────────┘
-
-Expected Dilution: 15-20% equity
-Pre-money Valuation: $2-2.5M
-Post-money Valuation: $2.5-3M
-```
-
-**Series A (Year 2): $3-5M**
-- Timing: After reaching $50K MRR, 20% free-to-paid conversion
-- Use: Geographic expansion, team scaling (25 FTE), AI/ML enhancement
-- Valuation: $15-20M pre-money
-
----
-
-### 📊 Key Financial Metrics Dashboard
-
-**Critical KPIs (Monthly Tracking):**
-
-```
-┌──────────────────────────────────────────────────┐
-│ GROWTH METRICS                                   │
-├──────────────────────────────────────────────────┤
-│ MRR Growth Rate:              15-25% MoM         │
-│ ARR:                          $[MRR × 12]        │
-│ New Users:                    Target 2,000/mo    │
-│ Free → Paid Conversion:       15% → 20%         │
-│ Revenue Churn:                <5% monthly        │
-│ Net Revenue Retention:        110-115%           │
-└──────────────────────────────────────────────────┘
-
-┌──────────────────────────────────────────────────┐
-│ UNIT ECONOMICS                                    │
-├──────────────────────────────────────────────────┤
-│ CAC:                          $32                │
-│ LTV:                          $192               │
-│ LTV:CAC Ratio:                6.0:1 ✅           │
-│ Payback Period:               3.0 months ✅      │
-│ ARPU:                         $12.99             │
-│ Gross Margin:                 85%                │
-└──────────────────────────────────────────────────┘
-
-┌──────────────────────────────────────────────────┐
-│ EFFICIENCY METRICS                                │
-├──────────────────────────────────────────────────┤
-│ CAC Payback:                  3 months           │
-│ Magic Number (Sales Eff.):   0.8-1.2            │
-│   = (New ARR × GM%) / Sales & Marketing $       │
-│ Rule of 40:                   [Growth% + Margin%]│
-│   Target: >40% (Year 3+)                         │
-│ Burn Multiple:                <1.5x              │
-│   = Net Burn ÷ Net New ARR                       │
-└──────────────────────────────────────────────────┘
-```
-
----
-
-### 🎯 Path to Profitability
-
-**Break-Even Analysis:**
-
-```
-Fixed Costs (Monthly):               $18,000
-├─ Team Salaries                     $12,000
-├─ Infrastructure                     $2,500
-├─ SaaS Tools                         $1,500
-└─ G&A                                $2,000
-
-Variable Costs per User:             $2.30
-├─ Hosting                            $1.50
-├─ Payment Processing                 $0.50
-├─ Support                            $0.30
-
-Contribution Margin per Paid User:   $10.69
-= $12.99 (ARPU) - $2.30 (Variable Cost)
-
-Break-even Point:
-= Fixed Costs ÷ Contribution Margin
-= $18,000 ÷ $10.69
-= 1,684 paid users needed to break even
-
-At 18% conversion: 9,356 total users needed
-Timeline: Month 12-14 (achievable ✅)
-```
-
----
-
-### ⚠️ Financial Risks & Mitigation
-
-**Risk Assessment Matrix:**
-
-| Risk Category | Probability | Impact | Mitigation Strategy |
-|---------------|-------------|--------|---------------------|
-| **CAC Inflation** | High (70%) | High | Diversify channels, focus on organic growth, implement referral program |
-| **Churn Increase** | Medium (40%) | Critical | Improve onboarding, personalization, community features |
-| **Payment Fraud** | Low (15%) | Medium | Stripe Radar, velocity checks, manual review |
-| **Platform Fees** | Medium (50%) | Medium | Direct web signups, negotiate with app stores |
-| **Competition** | High (80%) | High | Differentiate with AI, build moat through data |
-| **Funding Gap** | Medium (30%) | High | Bootstrap to $50K MRR, maintain 6-mo runway |
-
-**Contingency Plans:**
-
-1. **If Growth < Target:**
-   - Reduce marketing spend by 30%
-   - Focus on organic channels
-   - Extend runway to 24 months with lean team
-
-2. **If Churn > 8%:**
-   - Implement win-back campaigns
-   - Enhance onboarding UX
-   - Add community features
-   - Personal coaching upsell
-
-3. **If Funding Delayed:**
-   - Revenue-based financing ($50K-100K)
-   - Extend founder runway (lower salaries)
-   - Outsource non-core functions
-
----
-
-### 📈 Investor Pitch - Key Financials
-
-**Investment Highlights:**
-
-```
-✅ TAM: $59B digital fitness market, 33% CAGR
-✅ Unit Economics: 6:1 LTV:CAC, 85% gross margin
-✅ Growth: 20% MoM revenue growth, 18% conversion
-✅ Differentiation: AI personalization + form analysis
-✅ Scalability: Marginal cost near zero, global ready
-✅ Exit Potential: $100M+ valuation at $15M ARR (Year 5)
-
-Return Potential:
-├─ Investment: $500K @ $2.5M post-money (20%)
-├─ Year 5 Value: $20M (20% of $100M valuation)
-└─ 40x Return in 5 years (IRR: 120%)
-```
-
-**Comparable Exit Valuations:**
-
-| Company | Acquisition Price | Revenue Multiple |
-|---------|------------------|------------------|
-| MyFitnessPal | $475M | 15x ARR |
-| Strava (implied) | $1.5B | 12x ARR |
-| Fitbit | $2.1B | 8x ARR |
-| Peloton (IPO) | $8.1B | 10x ARR |
-
-Conservative Exit: 8-10x ARR = $80-100M (Year 5)
-Optimistic Exit: 12-15x ARR = $120-150M (Year 5)
-
----
-
-### ✅ Financial Recommendations
-
-**Immediate Actions (Month 1-3):**
-1. ✓ Raise $500K seed round (target: 15-18% dilution)
-2. ✓ Implement financial dashboards (Baremetrics, ChartMogul)
-3. ✓ Establish banking relationships (SVB, Mercury)
-4. ✓ Set up accounting (QuickBooks, Pilot.com)
-5. ✓ Monitor cohort economics weekly
-
-**Short-term Goals (Month 4-12):**
-1. ✓ Reach $50K MRR (break-even on ops)
-2. ✓ Maintain 85%+ gross margin
-3. ✓ Achieve 18%+ free-to-paid conversion
-4. ✓ Keep CAC under $35
-5. ✓ Prepare Series A materials
-
-**Long-term Strategy (Year 2-3):**
-1. ✓ Series A at $50K+ MRR ($3-5M raise)
-2. ✓ Geographic expansion (UK, Germany, Australia)
-3. ✓ Revenue diversification (B2B corporate wellness)
-4. ✓ Path to profitability (25% net margin by Year 3)
-5. ✓ Exit readiness (strategic or IPO)
-
-**Financial Health Score: 8.5/10**
-- Strong unit economics ✅
-- Clear path to profitability ✅
-- Attractive market opportunity ✅
-- Differentiated product ✅
-- Execution risk (mitigated with experienced team) ⚠️
-
-This fitness app represents a compelling financial opportunity with strong fundamentals and clear path to generating significant returns.""",
-                
-                "default": "**Financial Projections:** Revenue $50K-500K Year 1 depending on model. **Unit Economics:** CAC $30-100, LTV $150-500, LTV:CAC >3:1. **Funding:** Seed $100K-500K for 12-18 month runway. **Break-even:** Month 12-18. **Key Metrics:** MRR growth 15-25%, gross margin 70-85%, burn rate optimization."
-            },
-            
-            "LegalCompliance": {
-                "ecommerce": """## ⚖️ E-commerce Legal & Compliance
-
-### 📋 Regulatory Requirements
-
-**Essential Compliance (Pre-Launch):**
-```
-✓ Business Registration
-  ├─ LLC/Corporation formation
-  ├─ EIN (Tax ID) from IRS
-  └─ State business license
-
-✓ E-commerce Specific
-  ├─ Terms of Service
-  ├─ Privacy Policy (GDPR/CCPA compliant)
-  ├─ Cookie Policy
-  ├─ Return/Refund Policy
-  └─ Shipping Policy
-
-✓ Payment Compliance
-  ├─ PCI-DSS Level 1 (via Stripe)
-  ├─ Payment processor agreements
-  └─ Fraud prevention measures
-
-✓ Data Protection
-  ├─ GDPR (EU customers)
-  ├─ CCPA (California residents)
-  ├─ Data encryption standards
-  └─ Data retention policies
-```
-
-### 🔐 Data Privacy Implementation
-```python
-# GDPR Compliance Example
-
-class UserDataController:
-    def handle_data_request(self, user_id: str, request_type: str):
-        # Handle GDPR data subject requests
-        
-        if request_type == 'access':
-            # Right to Access (Article 15)
-            return self.export_user_data(user_id)
-            
-        elif request_type == 'delete':
-            # Right to Erasure (Article 17)
-            return self.anonymize_user_data(user_id)
-            
-        elif request_type == 'portability':
-            # Right to Data Portability (Article 20)
-            return self.generate_data_export(user_id, format='json')
-```
-
-### 📄 Required Legal Documents
-
-**Terms of Service Template:**
-```
-1. Account Registration
-2. User Conduct & Prohibited Activities
-3. Intellectual Property Rights
-4. Payment Terms & Refunds
-5. Limitation of Liability
-6. Dispute Resolution & Arbitration
-7. Governing Law
-8. Contact Information
-```
-
-### ⚠️ Legal Risks & Mitigation
-| Risk | Impact | Mitigation |
-|------|--------|------------|
-| **Product Liability** | High | Vendor agreements, insurance |
-| **Copyright Infringement** | High | DMCA takedown process |
-| **Data Breach** | Critical | Encryption, security audits |
-| **Consumer Protection** | Medium | Clear policies, fair practices |
-| **Tax Compliance** | High | Automated tax calculation (Avalara) |
-
-### 💰 Compliance Costs (Year 1)
-```
-Legal Counsel:           $15,000
-Privacy Compliance:       $8,000
-Insurance (E&O, Cyber):   $5,000
-Security Audits:          $4,000
-──────────────────────────────────
-Total:                   $32,000
-```
-
-### 📅 Compliance Timeline
-```
-Week 1-2:  Business formation, EIN
-Week 3-4:  Draft T&C, Privacy Policy
-Week 5-6:  PCI-DSS validation
-Week 7-8:  GDPR/CCPA implementation
-Week 9-10: Security audit
-Week 11-12: Launch preparation
-```""",
-                
-                "default": "**Key Regulations:** GDPR (EU), CCPA (California), industry-specific compliance. **Required:** Terms of Service, Privacy Policy, Cookie Policy. **Data Protection:** Encryption, access controls, breach notification. **Costs:** Legal counsel $10K-30K, compliance tools $5K-15K/year. **Timeline:** 8-12 weeks pre-launch preparation."
-            },
-            
-            "SecurityExpert": {
-                "ecommerce": """## 🔐 E-commerce Security Architecture
-
-### 🛡️ Security Framework
-
-**Defense-in-Depth Strategy:**
-```
-Layer 1: Network Security
-├─ WAF (Web Application Firewall)
-├─ DDoS Protection (CloudFlare)
-└─ Rate Limiting (API Gateway)
-
-Layer 2: Application Security
-├─ Input Validation & Sanitization
-├─ SQL Injection Prevention
-├─ XSS Protection
-└─ CSRF Tokens
-
-Layer 3: Authentication & Authorization
-├─ JWT with short expiration (15 min)
-├─ Refresh tokens (secure HTTP-only cookies)
-├─ MFA (Two-Factor Authentication)
-└─ Role-Based Access Control (RBAC)
-
-Layer 4: Data Security
-├─ Encryption at Rest (AES-256)
-├─ Encryption in Transit (TLS 1.3)
-├─ Database encryption
-└─ Secrets management (HashiCorp Vault)
-
-Layer 5: Monitoring & Response
-├─ SIEM (Security Information Event Management)
-├─ Intrusion Detection System (IDS)
-├─ Log aggregation & analysis
-└─ Incident response plan
-```
-
-### 💻 Security Implementation Code
-
-**Authentication System:**
-```typescript
-// Secure JWT implementation
-import jwt from 'jsonwebtoken'
-import bcrypt from 'bcrypt'
-
-export class AuthService {
-  // Password hashing
-  async hashPassword(password: string): Promise<string> {
-    const salt = await bcrypt.genSalt(12)
-    return bcrypt.hash(password, salt)
-  }
-  
-  // Generate JWT with short expiration
-  generateAccessToken(userId: string, role: string): string {
-    return jwt.sign(
-      { userId, role },
-      process.env.JWT_SECRET!,
-      { expiresIn: '15m', algorithm: 'HS256' }
-    )
-  }
-  
-  // Secure refresh token
-  generateRefreshToken(userId: string): string {
-    return jwt.sign(
-      { userId, type: 'refresh' },
-      process.env.REFRESH_SECRET!,
-      { expiresIn: '7d' }
-    )
-  }
-}
-```
-
-**Input Validation:**
-```typescript
-// Prevent SQL injection & XSS
-import { body, validationResult } from 'express-validator'
-import DOMPurify from 'isomorphic-dompurify'
-
-export const validateProduct = [
-  body('name')
-    .trim()
-    .isLength({ min: 3, max: 200 })
-    .customSanitizer(value => DOMPurify.sanitize(value)),
-    
-  body('price')
-    .isFloat({ min: 0.01, max: 999999 })
-    .toFloat(),
-    
-  body('description')
-    .trim()
-    .isLength({ max: 5000 })
-    .customSanitizer(value => DOMPurify.sanitize(value)),
-]
-```
-
-**Rate Limiting:**
-```typescript
-// Prevent brute force attacks
-import rateLimit from 'express-rate-limit'
-
-export const authLimiter = rateLimit({
-  windowMs: 15 * 60 * 1000, // 15 minutes
-  max: 5, // 5 requests per window
-  message: 'Too many login attempts, try again later'
-})
-
-export const apiLimiter = rateLimit({
-  windowMs: 1 * 60 * 1000, // 1 minute
-  max: 100, // 100 requests per minute
-  message: 'Too many requests'
-})
-```
-
-### 🔍 Security Audit Checklist
-```
-✓ OWASP Top 10 Compliance
-  ├─ Injection flaws
-  ├─ Broken authentication
-  ├─ Sensitive data exposure
-  ├─ XML External Entities (XXE)
-  ├─ Broken access control
-  ├─ Security misconfiguration
-  ├─ Cross-Site Scripting (XSS)
-  ├─ Insecure deserialization
-  ├─ Using components with vulnerabilities
-  └─ Insufficient logging & monitoring
-
-✓ Payment Security
-  ├─ PCI-DSS Level 1 compliance
-  ├─ No storage of card data
-  ├─ Secure payment tokens only
-  └─ 3D Secure authentication
-
-✓ Infrastructure Security
-  ├─ Regular security patches
-  ├─ Minimal attack surface
-  ├─ Least privilege access
-  └─ Network segmentation
-```
-
-### 📊 Security Metrics
-```
-Security KPIs:
-├─ Vulnerability scan: Weekly
-├─ Penetration testing: Quarterly
-├─ Security patches: <48 hours
-├─ Incident response time: <1 hour
-├─ False positive rate: <5%
-└─ Mean time to detect: <15 minutes
-```
-
-### 💰 Security Budget (Year 1)
-```
-Security Tools:          $12,000/year
-  ├─ WAF (CloudFlare):    $2,400
-  ├─ SIEM (Datadog):      $4,800
-  ├─ Secrets Mgmt:        $1,200
-  └─ Vulnerability Scanner: $3,600
-
-Penetration Testing:     $8,000
-Security Audits:         $6,000
-Compliance (SOC 2):     $15,000
-──────────────────────────────────
-Total:                  $41,000
-```
-
-### ⚠️ Threat Model
-```
-High Priority Threats:
-1. Payment fraud
-2. Account takeover
-3. Data breach
-4. DDoS attacks
-5. Supply chain attacks
-```""",
-                
-                "default": "**Security Essentials:** Authentication (JWT, OAuth), encryption (TLS 1.3, AES-256), input validation, rate limiting. **Best Practices:** OWASP Top 10 compliance, penetration testing, security audits. **Tools:** WAF, SIEM, vulnerability scanning. **Compliance:** SOC 2, ISO 27001, PCI-DSS. **Budget:** $20K-50K/year for SMB."
-            },
-            
-            "DataScientist": {
-                "ecommerce": """## 🤖 E-commerce AI/ML Strategy
-
-### 🎯 AI/ML Use Cases
-
-**Personalization Engine:**
-- Product recommendations (collaborative filtering + content-based)
-- Personalized search results
-- Dynamic pricing optimization
-- Customer segmentation (K-means, hierarchical clustering)
-
-**Predictive Analytics:**
-- Demand forecasting (LSTM, Prophet)
-- Inventory optimization
-- Churn prediction (XGBoost, Random Forest)
-- Customer lifetime value prediction
-
-**Computer Vision:**
-- Visual search (ResNet, EfficientNet)
-- Product image quality assessment
-- AR try-on features (pose estimation)
-
-### 🧠 Model Architecture
-
-**Recommendation System:**
-```python
-# Hybrid Recommendation Model
-- Collaborative Filtering: Matrix Factorization (ALS)
-- Content-Based: TF-IDF + Cosine Similarity
-- Deep Learning: Two-Tower Neural Network
-- Framework: TensorFlow Recommenders
-- Expected Accuracy: 75-85% precision@10
-```
-
-**Customer Segmentation:**
-- Algorithm: K-Means + RFM Analysis
-- Features: Purchase history, browsing behavior, demographics
-- Clusters: 5-7 customer segments
-- Update Frequency: Weekly batch processing
-
-**Demand Forecasting:**
-- Model: LSTM + Prophet (ensemble)
-- Time Horizon: 30-90 days ahead
-- Accuracy Target: MAPE < 15%
-- Training Data: 2+ years historical sales
-
-### 📊 Data Requirements
-
-**Data Sources:**
-```
-User Behavior:
-├─ Clickstream data (1M events/day)
-├─ Purchase history (transactions)
-├─ Search queries
-└─ Session recordings
-
-Product Data:
-├─ Product catalog (attributes, images)
-├─ Inventory levels
-├─ Pricing history
-└─ Vendor information
-
-External Data:
-├─ Market trends (APIs)
-├─ Weather data (seasonal patterns)
-└─ Competitor pricing
-```
-
-**Storage:** 500GB-2TB (first year), PostgreSQL + S3
-
-### 🚀 Training & Deployment
-
-**Training Pipeline:**
-- Infrastructure: AWS SageMaker / GCP Vertex AI
-- Training Schedule: 
-  * Recommendations: Daily incremental
-  * Segmentation: Weekly
-  * Forecasting: Monthly
-- Training Time: 2-6 hours per model
-- Cost: $500-2000/month compute
-
-**Deployment:**
-- Serving: TensorFlow Serving / FastAPI
-- Latency: <100ms for recommendations
-- A/B Testing: 10% traffic for new models
-- Monitoring: Prometheus + Grafana
-
-### 📈 Performance Metrics
-
-| Model | Metric | Target | Business Impact |
-|-------|--------|--------|-----------------|
-| Recommendations | CTR | 8-12% | +25% revenue |
-| Personalization | Conversion | +15-25% | +$50K/month |
-| Churn Prediction | AUC-ROC | >0.85 | Save 30% users |
-| Demand Forecast | MAPE | <15% | -20% overstock |
-
-### 💰 ML Infrastructure Cost
-
-```
-Monthly Costs:
-Training Compute:        $1,500
-Inference Serving:       $800
-Data Storage (S3):       $200
-MLOps Tools:             $300
-Third-party APIs:        $500
-────────────────────────────────
-Total:                   $3,300/month
-```
-
-### 🔐 Data Privacy & Ethics
-
-- **PII Handling:** Anonymize user IDs, encrypt features
-- **Bias Detection:** Fairness metrics across demographics
-- **Model Explainability:** SHAP values for recommendations
-- **GDPR Compliance:** Right to deletion, data portability""",
-                
-                "fitness": """## 🤖 Fitness App - AI/ML & Data Science Strategy
-
-### 🎯 Machine Learning Use Cases
-
-**1. Personalized Workout Recommendation Engine**
-
-```
-ML Model Architecture:
-┌────────────────────────────────────────────────────┐
-│ INPUT FEATURES (47 dimensions)                     │
-├────────────────────────────────────────────────────┤
-│ User Profile (10):                                 │
-│ ├─ Age, weight, height, BMI, gender              │
-│ ├─ Fitness level (1-10 scale)                    │
-│ ├─ Goals (weight_loss, muscle_gain, endurance)   │
-│ └─ Available equipment, time constraints          │
-│                                                    │
-│ Workout History (20):                             │
-│ ├─ Exercise completion rate (30/60/90 days)      │
-│ ├─ Average workout duration                       │
-│ ├─ Preferred exercise types (cardio/strength/yoga)│
-│ ├─ Time of day preferences                        │
-│ └─ Intensity progression                          │
-│                                                    │
-│ Biometric Data (12):                              │
-│ ├─ Resting heart rate, max heart rate            │
-│ ├─ Body fat %, muscle mass                       │
-│ ├─ Sleep quality (from wearables)                │
-│ └─ Stress levels, recovery rate                  │
-│                                                    │
-│ Behavioral (5):                                    │
-│ ├─ App engagement frequency                       │
-│ ├─ Social features usage                          │
-│ └─ Content interaction patterns                   │
-└────────────────────────────────────────────────────┘
-          ↓
-┌────────────────────────────────────────────────────┐
-│ DEEP NEURAL NETWORK                                │
-├────────────────────────────────────────────────────┤
-│ Layer 1: Dense(128, activation='relu')            │
-│ Dropout(0.3)                                       │
-│ Layer 2: Dense(64, activation='relu')             │
-│ Dropout(0.2)                                       │
-│ Layer 3: Dense(32, activation='relu')             │
-│ Output: Dense(100, activation='sigmoid')          │
-│ (100 possible exercises, multi-label)             │
-└────────────────────────────────────────────────────┘
-          ↓
-┌────────────────────────────────────────────────────┐
-│ POST-PROCESSING LOGIC                              │
-├────────────────────────────────────────────────────┤
-│ ├─ Apply equipment constraints                    │
-│ ├─ Balance muscle groups                          │
-│ ├─ Progressive overload calculation               │
-│ ├─ Volume & intensity optimization                │
-│ └─ Recovery time consideration                    │
-└────────────────────────────────────────────────────┘
-          ↓
-     7-Day Personalized Workout Plan
-```
-
-**Model Performance:**
-- Training Data: 500,000 user-workout pairs
-- Accuracy: 87% (exercises user completes)
-- Precision: 84%, Recall: 82%
-- Inference Time: <150ms
-- Re-training: Weekly with new data
-
----
-
-**2. Computer Vision Form Analysis**
-
-```
-EXERCISE FORM DETECTION PIPELINE:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Video Input (30 FPS)
-     ↓
-Frame Sampling (10 FPS)
-     ↓
-┌──────────────────────────────────────────────┐
-│ MediaPipe Pose Estimation                    │
-│ • 33 body keypoints (x, y, z, confidence)   │
-│ • Runs on-device (mobile GPU)               │
-│ • Latency: 16ms per frame                   │
-└──────────────────┬───────────────────────────┘
-                   ↓
-┌──────────────────────────────────────────────┐
-│ Angle Calculation Engine                     │
-│ • Elbow angle, knee angle, hip angle        │
-│ • Spine alignment                            │
-│ • Range of motion metrics                   │
-└──────────────────┬───────────────────────────┘
-                   ↓
-┌──────────────────────────────────────────────┐
-│ Custom CNN Classifier                        │
-│ Architecture:                                │
-│ ├─ Input: 33 keypoints × 30 frames = 990    │
-│ ├─ Conv1D layers (temporal features)        │
-│ ├─ LSTM (sequence modeling)                 │
-│ └─ Output: Form score (0-100) + corrections │
-│                                              │
-│ Training Data: 50,000 labeled exercise vids │
-│ Accuracy: 91% (good/bad form classification)│
-└──────────────────┬───────────────────────────┘
-                   ↓
-Real-time Feedback Overlay
-• Green: Good form (score >85)
-• Yellow: Adjust (score 65-85)
-• Red: Incorrect (score <65)
-• Text: "Lower your hips", "Keep back straight"
-```
-
-**Exercises Supported:**
-- Squats, Push-ups, Planks, Lunges
-- Deadlifts, Bench Press, Rows
-- Burpees, Mountain Climbers, Sit-ups
-- 20 exercises total (expanding to 50)
-
----
-
-**3. Progress Prediction & Motivation**
-
-```python
-# Progress Forecasting Model (XGBoost Regressor)
-
-import xgboost as xgb
-from sklearn.metrics import mean_absolute_error
-
-# Features for prediction
-features = [
-    'current_weight', 'starting_weight', 'goal_weight',
-    'workout_frequency_30d', 'avg_workout_duration',
-    'avg_calories_burned', 'nutrition_compliance',
-    'sleep_hours_avg', 'age', 'gender', 'height_cm'
-]
-
-# Target: weight_loss_kg_next_30_days
-model = xgb.XGBRegressor(
-    n_estimators=200,
-    max_depth=6,
-    learning_rate=0.05,
-    subsample=0.8
-)
-
-# Model performance
-# MAE: 0.8 kg (very accurate predictions)
-# R²: 0.82
-
-# Example prediction
-user_data = {
-    'current_weight': 75,
-    'goal_weight': 68,
-    'workout_frequency_30d': 12,
-    'avg_workout_duration': 45,
-    # ... other features
-}
-
-predicted_weight_30d = model.predict([user_data])
-# Output: 73.2 kg (1.8 kg loss predicted)
-
-# Motivational messaging
-if predicted_weight_30d <= goal_weight:
-    message = "🎉 You're on track! Keep it up!"
-elif predicted_weight_30d < current_weight:
-    message = f"💪 Great progress! {weight_loss} kg down"
-else:
-    message = "📈 Let's increase intensity this week"
-```
-
----
-
-**4. Nutrition Recommendation (Macro Calculator)**
-
-```
-MACRO CALCULATION ML MODEL:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Inputs:
-├─ Goal (weight loss, maintenance, muscle gain)
-├─ TDEE (Total Daily Energy Expenditure)
-├─ Activity level
-├─ Body composition
-└─ Workout intensity
-
-Algorithm:
-1. Calculate Basal Metabolic Rate (BMR):
-   Men: BMR = 10 × weight(kg) + 6.25 × height(cm) - 5 × age + 5
-   Women: BMR = 10 × weight(kg) + 6.25 × height(cm) - 5 × age - 161
-
-2. Apply Activity Multiplier:
-   Sedentary: BMR × 1.2
-   Light: BMR × 1.375
-   Moderate: BMR × 1.55
-   Very Active: BMR × 1.725
-   Extremely Active: BMR × 1.9
-
-3. Adjust for Goals:
-   Weight Loss: TDEE - 500 cal (1 lb/week loss)
-   Muscle Gain: TDEE + 300 cal (lean bulk)
-   Maintenance: TDEE
-
-4. Macro Split (ML-optimized based on 100K user outcomes):
-   
-   Weight Loss:
-   ├─ Protein: 40% (1.8g/kg bodyweight)
-   ├─ Carbs: 30%
-   └─ Fats: 30%
-   
-   Muscle Gain:
-   ├─ Protein: 30% (2.2g/kg bodyweight)
-   ├─ Carbs: 50%
-   └─ Fats: 20%
-
-Output Example:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Daily Calorie Target: 1,800 cal
-├─ Protein: 720 cal (180g)  ████████████████
-├─ Carbs:   540 cal (135g)  ████████████
-└─ Fats:    540 cal (60g)   ████████████
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Meal Plan Generation:
-- Breakfast: 450 cal (25% of total)
-- Lunch: 540 cal (30%)
-- Dinner: 540 cal (30%)
-- Snacks: 270 cal (15%)
-```
-
----
-
-### 📊 Data Pipeline Architecture
-
-**ETL Pipeline:**
-
-```
-DATA SOURCES:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-1. App Events (user actions)
-   ├─ Workout completed
-   ├─ Exercise skipped
-   ├─ Meal logged
-   └─ Weight updated
-   → Stream to Apache Kafka
-
-2. Wearable Data (Apple Health, Fitbit)
-   ├─ Heart rate (continuous)
-   ├─ Steps, calories burned
-   ├─ Sleep data
-   └─ Active minutes
-   → Batch import via APIs (hourly)
-
-3. Video Data (form analysis)
-   ├─ Exercise recordings
-   ├─ Pose keypoints
-   └─ Form scores
-   → Store in S3, metadata in PostgreSQL
-
-DATA PROCESSING:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-┌────────────────────────────────────────────┐
-│ Apache Airflow (Orchestration)             │
-├────────────────────────────────────────────┤
-│                                            │
-│ DAG 1: Daily Feature Engineering          │
-│ ├─ Extract user workout data              │
-│ ├─ Calculate metrics (frequency, volume)  │
-│ ├─ Join with biometric data               │
-│ └─ Write to Feature Store (Redis)         │
-│                                            │
-│ DAG 2: Weekly Model Training               │
-│ ├─ Load training data (500K samples)      │
-│ ├─ Train XGBoost & Neural Network         │
-│ ├─ Validate on holdout set                │
-│ ├─ If accuracy > baseline, deploy         │
-│ └─ Log metrics to MLflow                  │
-│                                            │
-│ DAG 3: Real-time Scoring                   │
-│ ├─ Load models from S3                    │
-│ ├─ Serve via FastAPI endpoints            │
-│ └─ Cache predictions in Redis (15min TTL) │
-└────────────────────────────────────────────┘
-
-DATA STORAGE:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-├─ TimescaleDB: Time-series (workout metrics)
-├─ PostgreSQL: User profiles, subscriptions
-├─ Redis: Feature store, real-time cache
-├─ S3: Video files, model artifacts
-└─ Snowflake: Analytics data warehouse
-```
-
----
-
-### 🧪 A/B Testing Framework
-
-**Experiment Infrastructure:**
-
-| Experiment ID | Hypothesis | Metrics | Duration |
-|---------------|------------|---------|----------|
-| **EXP-001** | Personalized workouts improve retention | 30-day retention, workout frequency | 4 weeks |
-| **EXP-002** | Form analysis increases premium conversion | Free-to-paid rate, engagement | 6 weeks |
-| **EXP-003** | Social features boost engagement | DAU/MAU, session length | 3 weeks |
-| **EXP-004** | Gamification improves completion rate | Workout completion %, streaks | 4 weeks |
-
-**Statistical Rigor:**
-- Minimum Sample Size: 1,000 users per variant
-- Statistical Power: 80%
-- Significance Level: α = 0.05
-- Minimum Detectable Effect: 5% relative change
-
-**Example Result:**
-```
-Experiment: Personalized Workouts (EXP-001)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Control Group (Generic Workouts):
-├─ Users: 5,000
-├─ 30-day Retention: 42.3%
-├─ Avg Workouts/Week: 2.1
-└─ Engagement Score: 6.2/10
-
-Treatment Group (AI Personalized):
-├─ Users: 5,000
-├─ 30-day Retention: 51.8% (+9.5pp) ✅
-├─ Avg Workouts/Week: 2.8 (+33%) ✅
-└─ Engagement Score: 7.4/10 (+19%) ✅
-
-Statistical Significance: p < 0.001 ✅
-Decision: SHIP to 100% of users
-Expected Impact: +2,250 retained users/month
-```
-
----
-
-### 🔬 Model Monitoring & MLOps
-
-**Production Monitoring Dashboard:**
-
-```
-┌────────────────────────────────────────────────┐
-│ MODEL PERFORMANCE METRICS (Real-time)          │
-├────────────────────────────────────────────────┤
-│ Workout Recommendation Model:                  │
-│ ├─ Latency (p95): 142ms ✅ (target <200ms)   │
-│ ├─ Accuracy: 86.2% ✅ (target >85%)           │
-│ ├─ Requests/sec: 450                          │
-│ └─ Error Rate: 0.08% ✅                       │
-│                                                │
-│ Form Analysis Model:                           │
-│ ├─ Latency (p95): 2.1s ⚠️ (target <3s)       │
-│ ├─ Accuracy: 90.5% ✅                         │
-│ ├─ GPU Utilization: 72%                       │
-│ └─ Cost: $180/day                             │
-│                                                │
-│ Progress Prediction Model:                     │
-│ ├─ MAE: 0.9 kg ✅ (target <1.2 kg)           │
-│ ├─ Requests/hour: 12,000                      │
-│ └─ Cache Hit Rate: 78%                        │
-└────────────────────────────────────────────────┘
-
-ALERTS CONFIGURED:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-├─ Model Drift: If accuracy drops >5% → Re-train
-├─ Latency Spike: If p95 >500ms → Auto-scale
-├─ Error Rate: If >1% → Rollback to previous
-└─ Cost Anomaly: If daily cost >$250 → Alert
-```
-
-**Continuous Training Pipeline:**
-```
-Weekly Re-training Schedule:
-Monday 2 AM UTC:
-├─ Extract new data (past 7 days)
-├─ Validate data quality
-├─ Retrain models with updated data
-├─ Evaluate on validation set
-├─ A/B test new model vs current (10% traffic)
-├─ If new model wins → Deploy to 100%
-└─ Archive old model to S3
-```
-
----
-
-### 💻 Tech Stack
-
-```
-ML Frameworks:
-├─ TensorFlow 2.13 (neural networks)
-├─ PyTorch 2.0 (computer vision)
-├─ XGBoost 2.0 (gradient boosting)
-├─ scikit-learn 1.3 (preprocessing, metrics)
-└─ MediaPipe (pose estimation)
-
-ML Infrastructure:
-├─ AWS SageMaker (model training, deployment)
-├─ MLflow (experiment tracking, model registry)
-├─ Apache Airflow (workflow orchestration)
-├─ Redis (feature store, caching)
-└─ Docker + Kubernetes (containerization)
-
-Data Tools:
-├─ Apache Kafka (event streaming)
-├─ dbt (data transformations)
-├─ Great Expectations (data validation)
-└─ Snowflake (data warehouse)
-
-Monitoring:
-├─ Prometheus + Grafana (metrics)
-├─ DataDog (APM, logging)
-└─ Evidently AI (ML monitoring)
-```
-
----
-
-### 💰 ML Infrastructure Cost
-
-```
-Monthly ML Costs (Year 1):
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Model Training:
-├─ SageMaker (ml.p3.2xlarge, 20 hrs/week)  $800
-├─ Data storage (S3)                        $50
-└─ Data transfer                            $30
-
-Model Serving:
-├─ SageMaker endpoints (2 instances)        $600
-├─ Redis (cache.r5.large)                   $120
-└─ API Gateway                              $40
-
-Data Processing:
-├─ Airflow (EC2 t3.medium)                  $50
-├─ Kafka (MSK, 2 brokers)                   $300
-└─ Snowflake (storage + compute)            $200
-
-Total: $2,190/month
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Cost Optimization:
-├─ Use spot instances for training (-70%)
-├─ Implement model caching (saves $200/mo)
-├─ Batch predictions where possible
-└─ Right-size infrastructure quarterly
-```
-
----
-
-### ✅ Data Science Roadmap
-
-**Phase 1 (Months 1-3): MVP**
-- ✓ Basic recommendation algorithm (collaborative filtering)
-- ✓ Rule-based workout generation
-- ✓ Simple progress tracking
-
-**Phase 2 (Months 4-6): AI Integration**
-- ✓ Deep learning recommendation model
-- ✓ Computer vision form analysis (5 exercises)
-- ✓ A/B testing infrastructure
-
-**Phase 3 (Months 7-12): Advanced Features**
-- ✓ Expand form analysis to 20 exercises
-- ✓ Progress prediction models
-- ✓ Nutrition recommendations
-- ✓ MLOps pipeline (auto-retraining)
-
-**Phase 4 (Year 2): Scale & Optimize**
-- ✓ Real-time personalization
-- ✓ Advanced NLP chatbot (workout Q&A)
-- ✓ Injury risk prediction
-- ✓ Multi-language support
-
-**KPIs:**
-- Model Accuracy: >85% (workout recommendations)
-- Form Analysis: >90% (good/bad classification)
-- Latency: <200ms (p95 recommendation serving)
-- Cost: <$5K/month ML infrastructure (Year 1)
-
-This comprehensive ML strategy will differentiate the app and drive 15-20% higher engagement compared to rule-based competitors.""",
-                
-                "default": "**AI/ML Applications:** Recommendation systems, personalization, predictive analytics, NLP chatbots. **Models:** Neural networks, Random Forest, XGBoost, pre-trained transformers. **Infrastructure:** Cloud ML services (AWS SageMaker, GCP Vertex AI), Docker, Kubernetes. **Data:** ETL pipelines, feature stores, data versioning. **Metrics:** Model accuracy, latency, A/B test results. **Cost:** $2K-10K/month depending on scale."
-            },
-            
-            "OperationsDirector": {
-                "ecommerce": """## ⚙️ E-commerce Operations Strategy
-
-### 🎯 Operational Excellence Framework
-
-**Core Operations:**
-- Supply Chain Management
-- Inventory & Fulfillment
-- Quality Assurance
-- Customer Service Operations
-- Process Optimization
-
-### 📦 Supply Chain & Logistics
-
-**Vendor Management:**
-```
-Tier 1 Vendors (Strategic Partners):
-├─ Monthly business reviews
-├─ Volume commitments
-├─ Net-30 payment terms
-└─ Quality SLAs (99% defect-free)
-
-Tier 2 Vendors:
-├─ Quarterly reviews
-├─ Flexible ordering
-├─ Net-15 payment terms
-```
-
-**Fulfillment Strategy:**
-- **In-House Warehouse:** 0-6 months (bootstrap phase)
-- **3PL Partnership:** 6+ months (scale phase)
-  * Fulfillment by Amazon (FBA) for marketplace
-  * ShipBob/ShipMonk for direct-to-consumer
-  * 2-day shipping standard, next-day premium
-
-**Inventory Management:**
-- System: NetSuite / Odoo ERP
-- Reorder Points: ABC analysis
-  * A items (80% revenue): 30-day stock
-  * B items (15% revenue): 45-day stock
-  * C items (5% revenue): 60-day stock
-- Dead Stock: <5% target
-
-### 📊 KPIs & Performance Metrics
-
-| Category | KPI | Target | Monitoring |
-|----------|-----|--------|------------|
-| **Fulfillment** | Order Accuracy | 99.5% | Daily |
-| | Ship Time | <24 hours | Real-time |
-| | On-Time Delivery | 95% | Daily |
-| **Inventory** | Stock-out Rate | <2% | Daily |
-| | Inventory Turnover | 6-8x/year | Monthly |
-| | Carrying Cost | <20% of inventory value | Monthly |
-| **Customer Service** | First Response Time | <2 hours | Hourly |
-| | Resolution Rate | >90% first contact | Daily |
-| | CSAT Score | >4.5/5 | Weekly |
-| **Quality** | Return Rate | <5% | Weekly |
-| | Defect Rate | <1% | Daily |
-
-### 🔄 Process Optimization
-
-**Order Processing Workflow:**
-```
-Order Received
-  ↓
-Payment Verification (2 min)
-  ↓
-Inventory Check (auto)
-  ↓
-Pick & Pack (4 hours)
-  ↓
-Shipping Label (auto)
-  ↓
-Carrier Pickup (same day)
-  ↓
-Tracking Update (auto)
-```
-
-**Automation Opportunities:**
-- Inventory alerts (low stock, dead stock)
-- Automated reordering (80% of SKUs)
-- Smart routing (nearest fulfillment center)
-- Returns processing (RMA automation)
-- Customer service (chatbot for 60% of queries)
-
-### 👥 Team & Resource Planning
-
-**Operational Team (Year 1):**
-```
-Months 0-3 (Launch):
-├─ Operations Manager: 1 FTE
-├─ Warehouse Staff: 2 FTE
-└─ Customer Support: 2 FTE (contractors)
-
-Months 4-12 (Growth):
-├─ Operations Manager: 1 FTE
-├─ Fulfillment Lead: 1 FTE
-├─ Warehouse Staff: 5 FTE
-├─ Customer Support: 4 FTE
-└─ QA Specialist: 1 FTE
-```
-
-### 💰 Operational Costs (Year 1)
-
-```
-Personnel:                   $300,000
-Warehouse/Office:            $60,000
-Inventory (initial):         $100,000
-Fulfillment & Shipping:      $150,000
-Customer Service Tools:      $12,000
-ERP/Ops Software:            $18,000
-Quality Assurance:           $10,000
-────────────────────────────────────
-Total Operational Costs:     $650,000
-```
-
-### 🚀 Scalability Roadmap
-
-**Phase 1 (0-6 months):** Manual processes, small warehouse
-**Phase 2 (6-12 months):** 3PL integration, automation begins
-**Phase 3 (12-24 months):** Multi-warehouse, advanced automation
-**Phase 4 (24+ months):** International expansion, full automation
-
-### 📈 Continuous Improvement
-
-- **Lean Six Sigma:** Reduce waste, improve efficiency
-- **Kaizen Events:** Monthly process improvement sessions
-- **Technology Adoption:** Robotics, AI for demand planning
-- **Vendor Scorecards:** Quarterly performance reviews
-- **Customer Feedback Loop:** NPS surveys, issue tracking""",
-                
-                "default": "**Core Operations:** Supply chain, inventory management, quality assurance, customer service. **KPIs:** Order accuracy, fulfillment time, inventory turnover, CSAT. **Automation:** ERP systems, warehouse management, automated reordering. **Team:** Operations manager, fulfillment staff, customer support. **Costs:** Personnel, facilities, software, logistics. **Focus:** Process optimization, efficiency, scalability."
-            }
-        }
-    
-    def get_fallback_response(self, project_description: str, agent_type: str) -> str:
-        """Generate intelligent fallback response based on project context"""
-        
-        # Analyze project type from keywords
-        description_lower = project_description.lower()
-        
-        # Determine project category with more specific matching
-        if any(word in description_lower for word in ['ecommerce', 'e-commerce', 'shop', 'store', 'marketplace', 'retail', 'online store', 'shopping']):
-            category = "ecommerce"
-        elif any(word in description_lower for word in ['fitness', 'health', 'workout', 'exercise', 'gym', 'wellness']):
-            category = "fitness"
-        elif any(word in description_lower for word in ['mobile', 'app', 'ios', 'android', 'smartphone']):
-            category = "mobile_app"
-        elif any(word in description_lower for word in ['web', 'website', 'platform', 'browser', 'online', 'saas']):
-            category = "web_platform"
-        elif any(word in description_lower for word in ['fintech', 'finance', 'banking', 'payment', 'money', 'financial']):
-            category = "fintech"
-        else:
-            category = "default"
-        
-        # Get appropriate response
-        agent_responses = self.detailed_responses.get(agent_type, self.detailed_responses["ProductManager"])
-        response = agent_responses.get(category, agent_responses["default"])
-        
         return f"💡 **{agent_type} Analysis:**\n\n{response}"
 
 emergency_engine = EmergencyFallbackEngine()
@@ -0,0 +1,179 @@
+"""
+Section-level TF-IDF retrieval over the emergency fallback corpus
+Picks the parts of each canned response that best match a project description
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+STOP_WORDS = {
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'an',
+    'is', 'are', 'be', 'as', 'it', 'this', 'that', 'from', 'we', 'our', 'you', 'your',
+    'will', 'can', 'should', 'into', 'per', 'vs'
+}
+
+_WORD = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stop words or single characters.
+
+    Hyphenated words yield both the joined form and their parts, so
+    "e-commerce" matches "ecommerce" and "real-time" matches "time".
+    """
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        if "-" in word:
+            tokens.extend(word.split("-"))
+            word = word.replace("-", "")
+        tokens.append(word)
+    return [token for token in tokens if len(token) > 1 and token not in STOP_WORDS]
+
+
+def split_sections(text: str) -> Tuple[int, List[Tuple[int, int]]]:
+    """Split a markdown entry at its ### headings.
+
+    Returns (preamble_end, sections) where sections are (start, end) offsets.
+    Headings inside ``` code fences are ignored. An entry without headings
+    is a single section and has no preamble.
+    """
+    starts = []
+    in_fence = False
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        if line.startswith("```"):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith("### "):
+            starts.append(offset)
+        offset += len(line)
+
+    if not starts:
+        return 0, [(0, len(text))]
+
+    ends = starts[1:] + [len(text)]
+    return starts[0], list(zip(starts, ends))
+
+
+class SectionIndex:
+    """Sparse TF-IDF index of corpus sections with an inverted posting list per term.
+
+    Sections are stored as offsets into corpus entries, so the index itself
+    stays small and entry text is still read lazily through the corpus.
+    The index data is plain lists and dicts so it can be stored in the
+    precompiled fallback snapshot and handed back in via `data`.
+    """
+
+    def __init__(self, corpus, data: Optional[Dict] = None):
+        self.corpus = corpus
+        self._data = data
+        self._entry_ranges = None
+
+    @property
+    def data(self) -> Dict:
+        if self._data is None:
+            self._data = self.build()
+        return self._data
+
+    def build(self) -> Dict:
+        """Tokenize every corpus section and compute its TF-IDF postings"""
+        sections = []      # (agent_type, category, start, end)
+        preambles = {}     # (agent_type, category) -> preamble end offset
+        agent_ranges = {}  # agent_type -> (first section, last section + 1)
+        term_counts = []
+
+        for agent_type in sorted(self.corpus.index):
+            first = len(sections)
+            for category in sorted(self.corpus.index[agent_type]):
+                text = self.corpus.get(agent_type, category)
+                preamble_end, spans = split_sections(text)
+                preambles[(agent_type, category)] = preamble_end
+                for start, end in spans:
+                    sections.append((agent_type, category, start, end))
+                    term_counts.append(Counter(tokenize(text[start:end])))
+            agent_ranges[agent_type] = (first, len(sections))
+
+        document_frequency = Counter()
+        for counts in term_counts:
+            document_frequency.update(counts.keys())
+
+        section_count = len(sections)
+        idf = {
+            term: math.log((1 + section_count) / (1 + df)) + 1.0
+            for term, df in document_frequency.items()
+        }
+
+        # Inverted index of L2-normalised, sublinear TF-IDF weights
+        postings = {}
+        for section_id, counts in enumerate(term_counts):
+            weights = {term: (1.0 + math.log(tf)) * idf[term] for term, tf in counts.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                postings.setdefault(term, []).append((section_id, weight / norm))
+
+        return {
+            "sections": sections,
+            "preambles": preambles,
+            "agent_ranges": agent_ranges,
+            "idf": idf,
+            "postings": postings
+        }
+
+    def entry_sections(self, agent_type: str, category: str) -> range:
+        """Section ids of one corpus entry (they are numbered contiguously)"""
+        if self._entry_ranges is None:
+            ranges = {}
+            for section_id, (section_agent, section_category, _, _) in enumerate(self.data["sections"]):
+                first, _ = ranges.get((section_agent, section_category), (section_id, section_id))
+                ranges[(section_agent, section_category)] = (first, section_id + 1)
+            self._entry_ranges = ranges
+        return range(*self._entry_ranges.get((agent_type, category), (0, 0)))
+
+    def search(self, query: str, agent_type: str, category: str, k: int = 3,
+               min_score: float = 0.05) -> List[Tuple[float, int]]:
+        """Top-k (score, section_id) pairs of one entry, by cosine similarity to the query.
+
+        Only the resolved entry is searched, so sections written for another
+        project category never leak into a response. Sections scoring below
+        `min_score` are dropped; no hits means the caller uses the whole entry.
+        """
+        data = self.data
+        sections = self.entry_sections(agent_type, category)
+        if not sections:
+            return []
+
+        query_counts = Counter(term for term in tokenize(query) if term in data["idf"])
+        if not query_counts:
+            return []
+        query_weights = {term: (1.0 + math.log(tf)) * data["idf"][term] for term, tf in query_counts.items()}
+        norm = math.sqrt(sum(w * w for w in query_weights.values()))
+
+        scores = {}
+        for term, query_weight in query_weights.items():
+            for section_id, weight in data["postings"][term]:
+                if section_id in sections:
+                    scores[section_id] = scores.get(section_id, 0.0) + query_weight * weight / norm
+
+        ranked = sorted(((score, section_id) for section_id, score in scores.items() if score >= min_score),
+                        reverse=True)
+        return ranked[:k]
+
+    def assemble(self, hits: List[Tuple[float, int]]) -> str:
+        """Join retrieved sections in document order under their entry's title"""
+        data = self.data
+        section_ids = sorted(section_id for _, section_id in hits)
+
+        parts = []
+        seen_entries = set()
+        for section_id in section_ids:
+            agent_type, category, start, end = data["sections"][section_id]
+            text = self.corpus.get(agent_type, category)
+            if (agent_type, category) not in seen_entries:
+                seen_entries.add((agent_type, category))
+                preamble = text[:data["preambles"][(agent_type, category)]].strip()
+                if preamble:
+                    parts.append(preamble)
+            parts.append(text[start:end].strip())
+
+        return "\n\n".join(parts)
@@ -0,0 +1,304 @@
+"""
+Precompiled snapshot of the emergency fallback corpus
+Packs corpus text, category keyword tables and the section index into one
+versioned binary file that is memory-mapped at runtime
+
+Layout: header | marshalled metadata | packed arrays | UTF-8 corpus text
+    header   = magic (8s), format version (I), source checksum (32s), metadata length (Q)
+    metadata = entry offsets, keyword tables, section layout, vocabulary,
+               array offsets, source fingerprint
+    arrays   = per-term idf (float64), posting offsets (int32) and the
+               concatenated posting lists (int32 section ids, float32 weights)
+
+Rebuild manually with:  python -m utils.fallback_snapshot
+"""
+
+import logging
+import marshal
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"FBSNAP\x00\x00"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<8sI32sQ")
+
+# Edits to the keyword tables or indexing code invalidate a snapshot just like corpus edits
+_UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+_CODE_SOURCES = [
+    os.path.join(_UTILS_DIR, "emergency_fallback.py"),
+    os.path.join(_UTILS_DIR, "fallback_index.py")
+]
+
+
+def _corpus_files(corpus_root: str) -> List[Tuple[str, str, str]]:
+    """(agent_type, category, path) for every corpus entry, in a stable order"""
+    files = []
+    for agent_type in sorted(os.listdir(corpus_root)):
+        agent_dir = os.path.join(corpus_root, agent_type)
+        if not os.path.isdir(agent_dir):
+            continue
+        for name in sorted(os.listdir(agent_dir)):
+            if name.endswith(".md"):
+                files.append((agent_type, name[:-3], os.path.join(agent_dir, name)))
+    return files
+
+
+def _source_files(corpus_root: str) -> List[str]:
+    """Every file a snapshot is compiled from"""
+    return _CODE_SOURCES + [path for _, _, path in _corpus_files(corpus_root)]
+
+
+def source_fingerprint(corpus_root: str) -> str:
+    """Cheap change detector built from source file names, sizes and modification times"""
+    parts = []
+    for path in _source_files(corpus_root):
+        stat = os.stat(path)
+        parts.append(f"{os.path.relpath(path, _UTILS_DIR)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def source_checksum(corpus_root: str, keyword_table: Dict[str, Dict[str, float]],
+                    priority: List[str]) -> bytes:
+    """SHA-256 over the corpus, indexing code, keyword tables and snapshot format version"""
+    import hashlib  # Only needed on the slow path; keeps snapshot loading import-light
+
+    digest = hashlib.sha256(f"v{SNAPSHOT_VERSION}".encode())
+    digest.update(repr(sorted((category, sorted(keywords.items())) for category, keywords in keyword_table.items())).encode())
+    digest.update(repr(priority).encode())
+    for path in _source_files(corpus_root):
+        digest.update(f"{os.path.relpath(path, _UTILS_DIR)}\0".encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+class _PackedTermTable:
+    """Read-only term -> value mapping over arrays that live in the mapped file"""
+
+    def __init__(self, term_ids: Dict[str, int], lookup):
+        self._term_ids = term_ids
+        self._lookup = lookup
+
+    def __getitem__(self, term):
+        return self._lookup(self._term_ids[term])
+
+    def __contains__(self, term):
+        return term in self._term_ids
+
+    def __iter__(self):
+        return iter(self._term_ids)
+
+    def __len__(self):
+        return len(self._term_ids)
+
+
+def _padding(offset: int) -> int:
+    """Bytes needed to align the packed arrays to 8 bytes"""
+    return -offset % 8
+
+
+def build_snapshot(corpus_root: str, keyword_table: Dict[str, Dict[str, float]],
+                   priority: List[str]) -> bytes:
+    """Compile the corpus, keyword tables and section index into snapshot bytes"""
+    from utils.emergency_fallback import FallbackCorpus
+    from utils.fallback_index import SectionIndex
+
+    corpus = FallbackCorpus(corpus_root)
+    text_parts = []
+    entries = {}
+    offset = 0
+    for agent_type, category, _ in _corpus_files(corpus_root):
+        encoded = corpus.get(agent_type, category).encode("utf-8")
+        entries[(agent_type, category)] = (offset, len(encoded))
+        text_parts.append(encoded)
+        offset += len(encoded)
+
+    # Flatten the per-term postings so they are read straight from the mapped file
+    section_index = SectionIndex(corpus).build()
+    vocabulary = sorted(section_index["idf"])
+    idf = array("d", (section_index["idf"][term] for term in vocabulary))
+    posting_starts = array("i", [0])
+    posting_sections = array("i")
+    posting_weights = array("f")
+    for term in vocabulary:
+        for section_id, weight in section_index["postings"][term]:
+            posting_sections.append(section_id)
+            posting_weights.append(weight)
+        posting_starts.append(len(posting_sections))
+
+    arrays = bytearray()
+    array_layout = {}
+    for name, values in (("idf", idf), ("posting_starts", posting_starts),
+                         ("posting_sections", posting_sections), ("posting_weights", posting_weights)):
+        arrays.extend(b"\0" * (-len(arrays) % 8))
+        array_layout[name] = (len(arrays), len(values), values.typecode)
+        arrays.extend(values.tobytes())
+
+    metadata = marshal.dumps({
+        "fingerprint": source_fingerprint(corpus_root),
+        "entries": entries,
+        "keywords": keyword_table,
+        "priority": list(priority),
+        "sections": section_index["sections"],
+        "preambles": section_index["preambles"],
+        "agent_ranges": section_index["agent_ranges"],
+        "vocabulary": "\n".join(vocabulary),
+        "arrays": array_layout,
+        "arrays_length": len(arrays)
+    })
+    padding = b"\0" * _padding(_HEADER.size + len(metadata))
+
+    checksum = source_checksum(corpus_root, keyword_table, priority)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, checksum, len(metadata))
+    return header + metadata + padding + bytes(arrays) + b"".join(text_parts)
+
+
+def _refingerprint(buffer, fingerprint: str) -> bytes:
+    """Snapshot bytes with only the stored source fingerprint replaced"""
+    magic, version, checksum, metadata_length = _HEADER.unpack_from(buffer, 0)
+    metadata_end = _HEADER.size + metadata_length
+    metadata = marshal.loads(buffer[_HEADER.size:metadata_end])
+    metadata["fingerprint"] = fingerprint
+    packed = marshal.dumps(metadata)
+    padding = b"\0" * _padding(_HEADER.size + len(packed))
+    # Array offsets are relative to the aligned end of the metadata, so the rest is copied as-is
+    rest = buffer[metadata_end + _padding(metadata_end):]
+    return _HEADER.pack(magic, version, checksum, len(packed)) + packed + padding + bytes(rest)
+
+
+def _write_atomic(path: str, data: bytes):
+    # A temporary file of its own per writer, so concurrent rebuilds never share one
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                                    dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class FallbackSnapshot:
+    """Read-only view of a compiled snapshot, usable anywhere a FallbackCorpus is
+
+    Decoded entries are kept in an LRU of `cache_size`, like FallbackCorpus.
+    """
+
+    def __init__(self, buffer, cache_size: int = 16):
+        self._buffer = buffer
+        magic, version, self.checksum, metadata_length = _HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Unrecognised fallback snapshot format")
+
+        metadata_end = _HEADER.size + metadata_length
+        metadata = marshal.loads(buffer[_HEADER.size:metadata_end])
+        arrays_start = metadata_end + _padding(metadata_end)
+        self._text_start = arrays_start + metadata["arrays_length"]
+
+        self.fingerprint = metadata["fingerprint"]
+        self.entries = metadata["entries"]
+        self.keywords = metadata["keywords"]
+        self.priority = metadata["priority"]
+
+        # Zero-copy views of the packed arrays
+        view = memoryview(buffer)
+        packed = {}
+        for name, (offset, length, typecode) in metadata["arrays"].items():
+            start = arrays_start + offset
+            packed[name] = view[start:start + length * array(typecode).itemsize].cast(typecode)
+        idf = packed["idf"]
+        starts = packed["posting_starts"]
+        sections = packed["posting_sections"]
+        weights = packed["posting_weights"]
+
+        vocabulary = metadata["vocabulary"].split("\n") if metadata["vocabulary"] else []
+        term_ids = dict(zip(vocabulary, range(len(vocabulary))))
+        self.section_index = {
+            "sections": metadata["sections"],
+            "preambles": metadata["preambles"],
+            "agent_ranges": metadata["agent_ranges"],
+            "idf": _PackedTermTable(term_ids, idf.__getitem__),
+            "postings": _PackedTermTable(
+                term_ids,
+                lambda term_id: list(zip(sections[starts[term_id]:starts[term_id + 1]],
+                                         weights[starts[term_id]:starts[term_id + 1]]))
+            )
+        }
+
+        self.index = {}
+        for agent_type, category in self.entries:
+            self.index.setdefault(agent_type, set()).add(category)
+        self.get = lru_cache(maxsize=cache_size)(self._decode_entry)
+
+    def resolve(self, agent_type: str, category: str) -> Tuple[str, str]:
+        """Map a request onto an existing entry, same rules as FallbackCorpus"""
+        if agent_type not in self.index:
+            agent_type = "ProductManager"
+        if category not in self.index[agent_type]:
+            category = "default"
+        return agent_type, category
+
+    def _decode_entry(self, agent_type: str, category: str) -> str:
+        """Decode one entry straight from the mapped file"""
+        offset, length = self.entries[(agent_type, category)]
+        start = self._text_start + offset
+        return bytes(self._buffer[start:start + length]).decode("utf-8")
+
+    @classmethod
+    def open(cls, path: str) -> "FallbackSnapshot":
+        """Memory-map a snapshot file"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    @classmethod
+    def load(cls, path: str, corpus_root: str, keyword_table: Dict[str, Dict[str, float]],
+             priority: List[str]) -> "FallbackSnapshot":
+        """Open the snapshot at `path`, rebuilding it first if the source has changed"""
+        try:
+            snapshot = cls.open(path)
+            fingerprint = source_fingerprint(corpus_root)
+            if snapshot.fingerprint == fingerprint:
+                return snapshot
+            # Timestamps moved (e.g. a fresh checkout); only the checksum decides
+            if snapshot.checksum == source_checksum(corpus_root, keyword_table, priority):
+                # Store the new fingerprint so later cold starts skip the hashing
+                try:
+                    _write_atomic(path, _refingerprint(snapshot._buffer, fingerprint))
+                    return cls.open(path)
+                except OSError as e:
+                    logger.warning(f"Could not update fallback snapshot {path}: {e}")
+                    return snapshot
+        except (OSError, ValueError, EOFError, struct.error) as e:
+            logger.info(f"Fallback snapshot unavailable ({e}) - rebuilding")
+
+        data = build_snapshot(corpus_root, keyword_table, priority)
+        try:
+            _write_atomic(path, data)
+            return cls.open(path)
+        except OSError as e:
+            logger.warning(f"Could not write fallback snapshot {path}: {e} - using in-memory copy")
+            return cls(data)
+
+
+def main(path: Optional[str] = None):
+    """Build step: compile the snapshot from the current corpus"""
+    from utils.emergency_fallback import CORPUS_DIR, CATEGORY_KEYWORDS, CATEGORY_PRIORITY, SNAPSHOT_PATH
+
+    path = path or SNAPSHOT_PATH
+    data = build_snapshot(CORPUS_DIR, CATEGORY_KEYWORDS, CATEGORY_PRIORITY)
+    with open(path, "wb") as f:
+        f.write(data)
+    print(f"Wrote {len(data):,} bytes to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,7 @@ class MultiModelManager:
                     "facebook/blenderbot-400M-distill",
                     "microsoft/GODEL-v1_1-large-seq2seq"
                 ],
+                "default_model": "microsoft/DialoGPT-large",
                 "api_key": os.getenv("HUGGINGFACE_API_KEY"),
                 "base_url": "https://api-inference.huggingface.co/models",
                 "rate_limit": None,  # Usually unlimited for free tier
@@ -38,6 +39,7 @@ class MultiModelManager:
                     "mistralai/Mixtral-8x7B-Instruct-v0.1",
                     "NousResearch/Nous-Hermes-2-Mixtral-8x7B-DPO"
                 ],
+                "default_model": "meta-llama/Llama-2-7b-chat-hf",
                 "api_key": os.getenv("TOGETHER_API_KEY"),
                 "base_url": "https://api.together.xyz/v1/chat/completions",
                 "rate_limit": 60,  # requests per minute
@@ -49,6 +51,7 @@ class MultiModelManager:
                     "meta/llama-2-70b-chat",
                     "mistralai/mixtral-8x7b-instruct-v0.1"
                 ],
+                "default_model": "meta/llama-2-70b-chat",
                 "api_key": os.getenv("REPLICATE_API_TOKEN"),
                 "base_url": "https://api.replicate.com/v1/predictions",
                 "rate_limit": None,
@@ -57,6 +60,7 @@ class MultiModelManager:
             "cohere": {
                 "name": "Cohere (Free Tier)",
                 "models": ["command", "command-light"],
+                "default_model": "command",
                 "api_key": os.getenv("COHERE_API_KEY"),
                 "base_url": "https://api.cohere.ai/v1/generate",
                 "rate_limit": 100,  # requests per minute
@@ -65,6 +69,7 @@ class MultiModelManager:
             "local_ollama": {
                 "name": "Ollama (Local - Unlimited)",
                 "models": ["llama2", "mistral", "codellama", "neural-chat", "gemma:2b"],
+                "default_model": "gemma:2b",
                 "api_key": None,
                 "base_url": "http://localhost:11434",
                 "rate_limit": None,
@@ -105,15 +110,18 @@ class MultiModelManager:
         # INSTANT MODE: Always use emergency fallback for your system since Ollama is too slow
         logger.info("Using emergency mode for instant response")
         from utils.emergency_fallback import emergency_engine
-        return emergency_engine.get_fallback_response(
+        response = emergency_engine.get_fallback_response(
             messages[-1].get('content', '') if messages else '', 
             agent_type
         )
+        self._record_fallback(agent_type)
+        return response
         
         # Smart timeout management: Skip Ollama if it's been timing out too much
         if self.timeout_count >= self.max_timeouts:
             logger.info(f"Skipping Ollama due to {self.timeout_count} consecutive timeouts - using emergency mode")
             from utils.emergency_fallback import emergency_engine
+            self._record_fallback(agent_type)
             return emergency_engine.get_fallback_response(
                 messages[-1].get('content', '') if messages else '', 
                 agent_type
@@ -125,19 +133,40 @@ class MultiModelManager:
             if not provider["active"]:
                 continue
                 
+            started = time.perf_counter()
             try:
                 response = self._call_provider(provider_id, messages, temperature, max_tokens)
+                self._record_call(agent_type, messages, response, provider_id, provider["default_model"],
+                                  started, success=bool(response))
                 if response:
                     logger.info(f"Successfully used {provider['name']}")
                     return response
             except Exception as e:
+                self._record_call(agent_type, messages, None, provider_id, provider["default_model"],
+                                  started, success=False)
                 logger.warning(f"Provider {provider_id} failed: {e}")
                 continue
         
         # If all providers fail, use emergency fallback
         from utils.emergency_fallback import emergency_engine
+        self._record_fallback(agent_type)
         return emergency_engine.get_fallback_response("General project inquiry", agent_type)
     
+    def _record_call(self, agent_type: str, messages: List[Dict], response: Optional[str], provider_id: str,
+                     model: Optional[str], started: float, success: bool = True):
+        """Feed one call's latency to the per-(agent, provider, model) analytics sketches"""
+        from analytics.ai_analytics import ai_analytics
+        ai_analytics.log_interaction(
+            agent_type, messages[-1].get('content', '') if messages else '', response or '',
+            response_time=time.perf_counter() - started, success=success,
+            provider=provider_id, model=model
+        )
+    
+    def _record_fallback(self, agent_type: str):
+        """Count a canned response; only real provider calls are logged as interactions"""
+        from analytics.ai_analytics import ai_analytics
+        ai_analytics.record_fallback(agent_type)
+    
     def _call_provider(self, provider_id: str, messages: List[Dict], 
                       temperature: float, max_tokens: int) -> Optional[str]:
         """Call specific provider"""
@@ -166,7 +195,7 @@ class MultiModelManager:
         }
         
         data = {
-            "model": "meta-llama/Llama-2-7b-chat-hf",
+            "model": self.providers["together"]["default_model"],
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens
@@ -190,7 +219,7 @@ class MultiModelManager:
         # Convert messages to prompt format
         prompt = self._messages_to_prompt(messages)
         
-        model = "microsoft/DialoGPT-large"
+        model = self.providers["huggingface"]["default_model"]
         url = f"{self.providers['huggingface']['base_url']}/{model}"
         
         headers = {
@@ -229,7 +258,7 @@ class MultiModelManager:
         }
         
         data = {
-            "model": "command",
+            "model": self.providers["cohere"]["default_model"],
             "prompt": prompt,
             "temperature": temperature,
             "max_tokens": max_tokens
@@ -261,7 +290,7 @@ class MultiModelManager:
         }
         
         data = {
-            "version": "meta/llama-2-70b-chat",
+            "version": self.providers["replicate"]["default_model"],
             "input": {
                 "prompt": prompt,
                 "temperature": temperature,
@@ -289,7 +318,7 @@ class MultiModelManager:
         
         # Optimize for maximum speed
         data = {
-            "model": "gemma:2b",  # Back to gemma:2b - smaller and might be faster
+            "model": self.providers["local_ollama"]["default_model"],  # gemma:2b - smaller and might be faster
             "prompt": prompt,
             "stream": False,
             "options": {
@@ -4,9 +4,17 @@ Handles API rate limiting, token tracking, and fallback responses
 """
 
 import time
+import heapq
+import itertools
 import logging
+import sqlite3
+import threading
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Dict, Optional, Any, List
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 import os
 
@@ -22,105 +30,662 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Request priority classes; lower values are served first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+class TokenMeter:
+    """Provider tokens charged while a metered_tokens() block runs"""
+
+    def __init__(self):
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, tokens: int):
+        with self._lock:
+            self.tokens += tokens
+
+
+_token_meter: ContextVar[Optional[TokenMeter]] = ContextVar("token_meter", default=None)
+
+
+@contextmanager
+def metered_tokens():
+    """Count the tokens charged by calls made in this context, including threads it is copied to"""
+    meter = TokenMeter()
+    reset_token = _token_meter.set(meter)
+    try:
+        yield meter
+    finally:
+        _token_meter.reset(reset_token)
+
+
+def _meter_tokens(tokens: int):
+    meter = _token_meter.get()
+    if meter is not None:
+        meter.add(tokens)
+
+
+class SharedQuotaStore:
+    """Token and request counters shared by every worker process.
+
+    Backed by a small SQLite database in WAL mode so uvicorn workers and
+    Streamlit sessions on the same host draw from one daily budget. Every
+    update is a single short write transaction, so recording a request costs
+    one fsync-free append instead of rewriting a JSON file.
+    """
+
+    REQUEST_WINDOW_SECONDS = 60
+    RESERVATION_TTL_SECONDS = 600  # Reservations left behind by crashed workers expire
+    USAGE_LOG_SECONDS = 3600  # History kept for consumption-rate forecasting
+    KEY_ANALYSIS_WINDOW_SECONDS = 3600  # Per-key hourly analysis window
+    KEY_ANALYSIS_TTL_SECONDS = 3600  # Analyses left running by crashed workers stop holding a slot
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.getenv("RATE_LIMIT_DB", "token_usage.db")
+        self._lock = threading.Lock()
+
+        try:
+            self._conn = self._connect(self.db_path)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not open shared quota store {self.db_path}: {e} - using in-memory counters")
+            self.db_path = ":memory:"
+            self._conn = self._connect(self.db_path)
+
+        self._import_legacy_usage()
+
+    def _connect(self, db_path: str) -> sqlite3.Connection:
+        """Open the database and make sure the schema exists"""
+        conn = sqlite3.connect(db_path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_usage ("
+            "day TEXT PRIMARY KEY, tokens_used INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS request_log (ts REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_request_log_ts ON request_log (ts)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS token_reservations ("
+            "id TEXT PRIMARY KEY, day TEXT NOT NULL, tokens INTEGER NOT NULL, created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS usage_log (ts REAL NOT NULL, tokens INTEGER NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_usage_log_ts ON usage_log (ts)")
+        conn.execute("CREATE TABLE IF NOT EXISTS limits (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        # Per-API-key quotas: analyses (running ones hold their token estimate), daily tokens, counters
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS key_analyses ("
+            "id TEXT PRIMARY KEY, key TEXT NOT NULL, day TEXT NOT NULL, started_at REAL NOT NULL, "
+            "reserved_tokens INTEGER NOT NULL, active INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_key_analyses_key ON key_analyses (key, started_at)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS key_usage ("
+            "key TEXT NOT NULL, day TEXT NOT NULL, tokens_used INTEGER NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (key, day))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS key_counters ("
+            "key TEXT PRIMARY KEY, total_analyses INTEGER NOT NULL DEFAULT 0, "
+            "rejected_requests INTEGER NOT NULL DEFAULT 0)"
+        )
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write transaction that holds the database lock across processes"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _import_legacy_usage(self):
+        """Carry over today's count from the old token_usage.json file"""
+        legacy_path = 'token_usage.json'
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, 'r') as f:
+                data = json.load(f)
+            if data.get('date') == str(datetime.now().date()):
+                with self._transaction() as conn:
+                    conn.execute(
+                        "INSERT INTO daily_usage (day, tokens_used) VALUES (?, ?) "
+                        "ON CONFLICT(day) DO UPDATE SET tokens_used = MAX(tokens_used, excluded.tokens_used)",
+                        (data['date'], int(data.get('tokens_used', 0)))
+                    )
+        except Exception as e:
+            logger.warning(f"Could not import legacy token usage: {e}")
+
+    def _log_usage(self, conn: sqlite3.Connection, tokens: int, timestamp: float):
+        """Append to the consumption history inside an open transaction"""
+        conn.execute("INSERT INTO usage_log (ts, tokens) VALUES (?, ?)", (timestamp, tokens))
+        conn.execute("DELETE FROM usage_log WHERE ts < ?", (timestamp - self.USAGE_LOG_SECONDS,))
+
+    def tokens_used(self, day: str) -> int:
+        """Tokens consumed on the given day by all processes"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tokens_used FROM daily_usage WHERE day = ?", (day,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def set_tokens_used(self, day: str, tokens: int):
+        """Overwrite the day's total, e.g. to match the provider's own count"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO daily_usage (day, tokens_used) VALUES (?, ?) "
+                "ON CONFLICT(day) DO UPDATE SET tokens_used = excluded.tokens_used",
+                (day, tokens)
+            )
+
+    def record_request(self, day: str, tokens: int, timestamp: float) -> int:
+        """Atomically log a request and add its tokens; returns the new daily total"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO daily_usage (day, tokens_used) VALUES (?, ?) "
+                "ON CONFLICT(day) DO UPDATE SET tokens_used = tokens_used + excluded.tokens_used",
+                (day, tokens)
+            )
+            conn.execute("INSERT INTO request_log (ts) VALUES (?)", (timestamp,))
+            conn.execute(
+                "DELETE FROM request_log WHERE ts < ?",
+                (timestamp - self.REQUEST_WINDOW_SECONDS,)
+            )
+            self._log_usage(conn, tokens, timestamp)
+            row = conn.execute("SELECT tokens_used FROM daily_usage WHERE day = ?", (day,)).fetchone()
+        return row[0]
+
+    def reserve_tokens(self, day: str, reservation_id: str, tokens: int,
+                       ceiling: int, now: float) -> tuple[bool, int]:
+        """Atomically hold tokens against the day's ceiling.
+
+        Returns (reserved, remaining) where remaining is the budget left
+        after committed usage and all outstanding reservations.
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM token_reservations WHERE created_at < ?",
+                (now - self.RESERVATION_TTL_SECONDS,)
+            )
+            used, reserved = conn.execute(
+                "SELECT "
+                "(SELECT tokens_used FROM daily_usage WHERE day = ?), "
+                "(SELECT SUM(tokens) FROM token_reservations WHERE day = ?)",
+                (day, day)
+            ).fetchone()
+            remaining = ceiling - (used or 0) - (reserved or 0)
+            if tokens > remaining:
+                return False, remaining
+
+            conn.execute(
+                "INSERT INTO token_reservations (id, day, tokens, created_at) VALUES (?, ?, ?, ?)",
+                (reservation_id, day, tokens, now)
+            )
+        return True, remaining - tokens
+
+    def commit_reservation(self, reservation_id: str, day: str, actual_tokens: int) -> int:
+        """Release a reservation and charge the tokens actually used; returns the new daily total"""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT day FROM token_reservations WHERE id = ?", (reservation_id,)
+            ).fetchone()
+            if row:
+                day = row[0]
+                conn.execute("DELETE FROM token_reservations WHERE id = ?", (reservation_id,))
+            conn.execute(
+                "INSERT INTO daily_usage (day, tokens_used) VALUES (?, ?) "
+                "ON CONFLICT(day) DO UPDATE SET tokens_used = tokens_used + excluded.tokens_used",
+                (day, actual_tokens)
+            )
+            self._log_usage(conn, actual_tokens, time.time())
+            total = conn.execute("SELECT tokens_used FROM daily_usage WHERE day = ?", (day,)).fetchone()
+        return total[0]
+
+    def refund_reservation(self, reservation_id: str):
+        """Drop a reservation without charging any tokens"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM token_reservations WHERE id = ?", (reservation_id,))
+
+    def claim_request_slot(self, now: float, max_per_window: int, min_interval: float) -> float:
+        """Claim a send slot if one is free; otherwise return seconds until the earliest one.
+
+        The check and the claim happen in one write transaction, so two
+        processes can never both take the same slot.
+        """
+        with self._transaction() as conn:
+            last_ts = conn.execute("SELECT MAX(ts) FROM request_log").fetchone()[0] or 0.0
+            earliest = max(now, last_ts + min_interval)
+
+            # Once the window is full, the next slot frees up when the
+            # max_per_window-th most recent request ages out of it
+            row = conn.execute(
+                "SELECT ts FROM request_log WHERE ts > ? ORDER BY ts DESC LIMIT 1 OFFSET ?",
+                (now - self.REQUEST_WINDOW_SECONDS, max_per_window - 1)
+            ).fetchone()
+            if row:
+                earliest = max(earliest, row[0] + self.REQUEST_WINDOW_SECONDS)
+
+            if earliest > now:
+                return earliest - now
+
+            conn.execute("INSERT INTO request_log (ts) VALUES (?)", (now,))
+            conn.execute(
+                "DELETE FROM request_log WHERE ts < ?",
+                (now - self.REQUEST_WINDOW_SECONDS,)
+            )
+        return 0.0
+
+    def get_limit(self, name: str) -> Optional[int]:
+        """A limit learned at runtime (e.g. from a provider error), or None if never set"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM limits WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_limit(self, name: str, value: int):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO limits (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, value)
+            )
+
+    def recent_consumption(self, now: float, window: float) -> int:
+        """Tokens charged by all processes during the last `window` seconds"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT SUM(tokens) FROM usage_log WHERE ts > ?", (now - window,)
+            ).fetchone()
+        return row[0] or 0
+
+    def _key_usage(self, conn: sqlite3.Connection, key: str, day: str, now: float) -> Dict[str, Any]:
+        """A key's quota counters, read inside an open connection"""
+        live_after = now - self.KEY_ANALYSIS_TTL_SECONDS
+        row = conn.execute(
+            "SELECT "
+            "(SELECT COUNT(*) FROM key_analyses WHERE key = ? AND active = 1 AND started_at >= ?), "
+            "(SELECT COUNT(*) FROM key_analyses WHERE key = ? AND started_at > ?), "
+            "(SELECT MIN(started_at) FROM key_analyses WHERE key = ? AND started_at > ?), "
+            "(SELECT tokens_used FROM key_usage WHERE key = ? AND day = ?), "
+            "(SELECT SUM(reserved_tokens) FROM key_analyses "
+            " WHERE key = ? AND day = ? AND active = 1 AND started_at >= ?), "
+            "(SELECT total_analyses FROM key_counters WHERE key = ?), "
+            "(SELECT rejected_requests FROM key_counters WHERE key = ?)",
+            (key, live_after, key, now - self.KEY_ANALYSIS_WINDOW_SECONDS,
+             key, now - self.KEY_ANALYSIS_WINDOW_SECONDS, key, day, key, day, live_after, key, key)
+        ).fetchone()
+        return {
+            "active_analyses": row[0],
+            "analyses_last_hour": row[1],
+            "oldest_recent_analysis": row[2],
+            "tokens_used": row[3] or 0,
+            "tokens_reserved": row[4] or 0,
+            "total_analyses": row[5] or 0,
+            "rejected_requests": row[6] or 0,
+        }
+
+    def key_usage(self, key: str, day: str, now: float) -> Dict[str, Any]:
+        """Quota counters of one API key across every worker"""
+        with self._lock:
+            return self._key_usage(self._conn, key, day, now)
+
+    def start_key_analysis(self, key: str, analysis_id: str, day: str, now: float, max_concurrent: int,
+                           per_hour: int, tokens_per_day: int, estimated_tokens: int) -> tuple[Optional[str], float]:
+        """Atomically check a key's quotas and start an analysis holding `estimated_tokens`.
+
+        Returns (None, 0) once started, or the exceeded limit ("concurrency",
+        "hourly" or "tokens") and the seconds until it frees up; tokens
+        free up at midnight, which the caller knows best, so that wait is 0.
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM key_analyses WHERE started_at < ? AND (active = 0 OR started_at < ?)",
+                (now - self.KEY_ANALYSIS_WINDOW_SECONDS, now - self.KEY_ANALYSIS_TTL_SECONDS)
+            )
+            usage = self._key_usage(conn, key, day, now)
+            exceeded, retry_after = None, 0.0
+            if usage["active_analyses"] >= max_concurrent:
+                exceeded = "concurrency"
+            elif usage["analyses_last_hour"] >= per_hour:
+                exceeded = "hourly"
+                retry_after = usage["oldest_recent_analysis"] + self.KEY_ANALYSIS_WINDOW_SECONDS - now
+            elif usage["tokens_used"] + usage["tokens_reserved"] + estimated_tokens > tokens_per_day:
+                exceeded = "tokens"
+
+            column = "rejected_requests" if exceeded else "total_analyses"
+            conn.execute(
+                f"INSERT INTO key_counters (key, {column}) VALUES (?, 1) "
+                f"ON CONFLICT(key) DO UPDATE SET {column} = {column} + 1",
+                (key,)
+            )
+            if exceeded is None:
+                conn.execute(
+                    "INSERT INTO key_analyses (id, key, day, started_at, reserved_tokens, active) "
+                    "VALUES (?, ?, ?, ?, ?, 1)",
+                    (analysis_id, key, day, now, estimated_tokens)
+                )
+        return exceeded, retry_after
+
+    def finish_key_analysis(self, analysis_id: str, actual_tokens: int):
+        """Free an analysis's slot and replace its held estimate with the tokens it used"""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT key, day FROM key_analyses WHERE id = ?", (analysis_id,)).fetchone()
+            if row is None:
+                return
+            conn.execute("UPDATE key_analyses SET active = 0, reserved_tokens = 0 WHERE id = ?", (analysis_id,))
+            conn.execute(
+                "INSERT INTO key_usage (key, day, tokens_used) VALUES (?, ?, ?) "
+                "ON CONFLICT(key, day) DO UPDATE SET tokens_used = tokens_used + excluded.tokens_used",
+                (row[0], row[1], actual_tokens)
+            )
+
+    def snapshot(self, day: str, now: float) -> Dict[str, Any]:
+        """Read daily usage and the request window in one consistent query"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT "
+                "(SELECT tokens_used FROM daily_usage WHERE day = ?), "
+                "(SELECT COUNT(*) FROM request_log WHERE ts > ?), "
+                "(SELECT MAX(ts) FROM request_log), "
+                "(SELECT SUM(tokens) FROM token_reservations WHERE day = ? AND created_at >= ?)",
+                (day, now - self.REQUEST_WINDOW_SECONDS, day, now - self.RESERVATION_TTL_SECONDS)
+            ).fetchone()
+        return {
+            "tokens_used": row[0] or 0,
+            "requests_last_minute": row[1] or 0,
+            "last_request_time": row[2] or 0.0,
+            "tokens_reserved": row[3] or 0,
+        }
+
+
 class RateLimitManager:
     """Manages API rate limiting and token usage tracking"""
     
-    def __init__(self):
-        self.daily_token_limit = 100000  # Groq free tier daily limit
-        self.tokens_used_today = 0
-        self.last_reset_date = datetime.now().date()
-        self.request_timestamps = []
+    def __init__(self, store: Optional[SharedQuotaStore] = None):
+        self.default_daily_token_limit = 100000  # Groq free tier daily limit
         self.max_requests_per_minute = 30  # Conservative limit
         self.min_request_interval = 2.0  # Minimum seconds between requests
-        self.last_request_time = 0
         
-        # Load token usage from file if exists
-        self._load_token_usage()
+        # Counters live in a store shared by all worker processes
+        self.store = store or SharedQuotaStore()
+        
+        # Pacing spreads the budget evenly across the day. Each priority
+        # class may run ahead of the even pace by this fraction of the budget.
+        self.pacing_enabled = True
+        self.pacing_borrow = {
+            PRIORITY_HIGH: 1.0,     # Never held back by pacing
+            PRIORITY_NORMAL: 0.10,
+            PRIORITY_LOW: 0.0
+        }
+        self.forecast_window_seconds = 900  # Consumption rate is measured over 15 minutes
     
-    def _load_token_usage(self):
-        """Load token usage from persistent storage"""
-        try:
-            if os.path.exists('token_usage.json'):
-                with open('token_usage.json', 'r') as f:
-                    data = json.load(f)
-                    saved_date = datetime.fromisoformat(data.get('date', str(datetime.now().date())))
-                    
-                    # Reset if it's a new day
-                    if saved_date.date() == datetime.now().date():
-                        self.tokens_used_today = data.get('tokens_used', 0)
-                    else:
-                        self.tokens_used_today = 0
-        except Exception as e:
-            logger.warning(f"Could not load token usage: {e}")
-            self.tokens_used_today = 0
+    @staticmethod
+    def _today() -> str:
+        return str(datetime.now().date())
     
-    def _save_token_usage(self):
-        """Save token usage to persistent storage"""
-        try:
-            data = {
-                'date': str(datetime.now().date()),
-                'tokens_used': self.tokens_used_today
-            }
-            with open('token_usage.json', 'w') as f:
-                json.dump(data, f)
-        except Exception as e:
-            logger.warning(f"Could not save token usage: {e}")
+    @staticmethod
+    def _day_progress() -> tuple[float, float]:
+        """Return (fraction of today elapsed, seconds left until midnight)"""
+        now = datetime.now()
+        midnight = datetime.combine(now.date(), datetime.min.time())
+        elapsed = (now - midnight).total_seconds()
+        return elapsed / 86400, 86400 - elapsed
+    
+    @property
+    def tokens_used_today(self) -> int:
+        """Tokens used today across every process sharing the store"""
+        return self.store.tokens_used(self._today())
+    
+    @tokens_used_today.setter
+    def tokens_used_today(self, tokens: int):
+        self.store.set_tokens_used(self._today(), tokens)
+    
+    @property
+    def daily_token_limit(self) -> int:
+        """The provider's daily token limit, as last reported to any process sharing the store"""
+        return self.store.get_limit("daily_token_limit") or self.default_daily_token_limit
+    
+    @daily_token_limit.setter
+    def daily_token_limit(self, tokens: int):
+        self.store.set_limit("daily_token_limit", tokens)
+    
+    @property
+    def last_request_time(self) -> float:
+        """Epoch time of the most recent request made by any process"""
+        return self.store.snapshot(self._today(), time.time())["last_request_time"]
+    
+    @property
+    def budget_ceiling(self) -> int:
+        """Tokens admissible today - a conservative 95% of the daily limit"""
+        return int(self.daily_token_limit * 0.95)
+    
+    def _check_daily_budget(self, tokens_committed: int, estimated_tokens: int) -> tuple[bool, str]:
+        """Check the daily token budget; waiting does not help when this fails"""
+        # Be very conservative - if we're above 95% usage, block all requests
+        if tokens_committed + estimated_tokens > self.budget_ceiling:
+            remaining_tokens = self.daily_token_limit - tokens_committed
+            return False, f"Conservative rate limit reached. Remaining: {remaining_tokens} tokens (95% limit)"
+        
+        return True, "OK"
     
     def can_make_request(self, estimated_tokens: int = 1000) -> tuple[bool, str]:
         """Check if we can make a request without hitting limits"""
         current_time = time.time()
+        usage = self.store.snapshot(self._today(), current_time)
         
-        # Be very conservative - if we're above 95% usage, block all requests
-        if self.tokens_used_today + estimated_tokens > (self.daily_token_limit * 0.95):
-            remaining_tokens = self.daily_token_limit - self.tokens_used_today
-            return False, f"Conservative rate limit reached. Remaining: {remaining_tokens} tokens (95% limit)"
-        
-        # Check daily token limit
-        if self.tokens_used_today + estimated_tokens > self.daily_token_limit:
-            remaining_tokens = self.daily_token_limit - self.tokens_used_today
-            return False, f"Daily token limit would be exceeded. Remaining: {remaining_tokens} tokens"
+        tokens_committed = usage["tokens_used"] + usage["tokens_reserved"]
+        within_budget, reason = self._check_daily_budget(tokens_committed, estimated_tokens)
+        if not within_budget:
+            return False, reason
         
         # Check rate limiting (requests per minute)
-        now = datetime.now()
-        # Remove timestamps older than 1 minute
-        self.request_timestamps = [
-            ts for ts in self.request_timestamps 
-            if now - ts < timedelta(minutes=1)
-        ]
-        
-        if len(self.request_timestamps) >= self.max_requests_per_minute:
+        if usage["requests_last_minute"] >= self.max_requests_per_minute:
             return False, "Rate limit: Too many requests per minute"
         
         # Check minimum interval between requests
-        if current_time - self.last_request_time < self.min_request_interval:
-            wait_time = self.min_request_interval - (current_time - self.last_request_time)
+        if current_time - usage["last_request_time"] < self.min_request_interval:
+            wait_time = self.min_request_interval - (current_time - usage["last_request_time"])
             return False, f"Rate limit: Wait {wait_time:.1f} seconds before next request"
         
         return True, "OK"
     
+    def paced_allowance(self, priority: int = PRIORITY_NORMAL) -> int:
+        """Tokens a priority class may have consumed by now under pacing"""
+        if not self.pacing_enabled:
+            return self.budget_ceiling
+        
+        day_fraction, _ = self._day_progress()
+        borrow = self.pacing_borrow.get(priority, 0.0)
+        return min(self.budget_ceiling, int(self.budget_ceiling * (day_fraction + borrow)))
+    
+    def reserve_tokens(self, estimated_tokens: int,
+                       priority: int = PRIORITY_NORMAL) -> tuple[Optional[str], Optional[float], str]:
+        """Atomically reserve estimated tokens against today's budget.
+        
+        Returns (reservation_id, wait_seconds, reason). reservation_id is None
+        when the budget cannot cover the estimate; wait_seconds then says how
+        long until pacing would admit it, or is None if the daily budget
+        itself is exhausted. Every reservation must later be passed to
+        commit_tokens or refund_tokens.
+        """
+        reservation_id = uuid.uuid4().hex
+        ceiling = self.paced_allowance(priority)
+        reserved, remaining = self.store.reserve_tokens(
+            self._today(), reservation_id, estimated_tokens, ceiling, time.time()
+        )
+        if reserved:
+            return reservation_id, 0.0, "OK"
+        
+        # Held back by pacing: the allowance grows linearly through the day
+        if ceiling < self.budget_ceiling:
+            hard_remaining = remaining + self.budget_ceiling - ceiling
+            if estimated_tokens <= hard_remaining:
+                wait_time = (estimated_tokens - remaining) * 86400 / self.budget_ceiling
+                return None, wait_time, f"Pacing: daily budget ahead of schedule, wait {wait_time:.0f} seconds"
+        
+        return None, None, f"Conservative rate limit reached. Remaining: {max(remaining, 0)} tokens (95% limit)"
+    
+    def commit_tokens(self, reservation_id: str, actual_tokens: int):
+        """Replace a reservation with the tokens the provider actually billed"""
+        tokens_used_today = self.store.commit_reservation(reservation_id, self._today(), actual_tokens)
+        _meter_tokens(actual_tokens)
+        
+        logger.info(f"API request made. Tokens used today: {tokens_used_today}/{self.daily_token_limit}")
+    
+    def refund_tokens(self, reservation_id: str):
+        """Return a reservation's tokens to the budget unused"""
+        self.store.refund_reservation(reservation_id)
+    
+    def try_acquire(self, estimated_tokens: int = 1000,
+                    priority: int = PRIORITY_NORMAL) -> tuple[Optional[str], Optional[float], str]:
+        """Reserve budget and claim a send slot if limits allow.
+        
+        Returns (reservation_id, wait_seconds, reason). On success the
+        reservation id is set and wait_seconds is 0. Otherwise wait_seconds
+        is the exact delay until the next slot frees up, or None when the
+        daily budget is exhausted and waiting would not help.
+        """
+        reservation_id, wait_time, reason = self.reserve_tokens(estimated_tokens, priority)
+        if reservation_id is None:
+            return None, wait_time, reason
+        
+        wait_time = self.store.claim_request_slot(
+            time.time(), self.max_requests_per_minute, self.min_request_interval
+        )
+        if wait_time <= 0:
+            return reservation_id, 0.0, "OK"
+        
+        self.refund_tokens(reservation_id)
+        return None, wait_time, f"Rate limit: Wait {wait_time:.1f} seconds before next request"
+    
     def record_request(self, tokens_used: int = 0):
         """Record that a request was made"""
-        self.request_timestamps.append(datetime.now())
-        self.last_request_time = time.time()
-        self.tokens_used_today += tokens_used
-        self._save_token_usage()
+        tokens_used_today = self.store.record_request(self._today(), tokens_used, time.time())
+        _meter_tokens(tokens_used)
+        
+        logger.info(f"API request made. Tokens used today: {tokens_used_today}/{self.daily_token_limit}")
+    
+    def sync_usage(self, tokens_used: int, daily_limit: Optional[int] = None):
+        """Align shared counters with the usage reported by the provider"""
+        if daily_limit:
+            self.daily_token_limit = daily_limit
+        self.tokens_used_today = tokens_used
+    
+    def forecast_exhaustion(self) -> Dict[str, Any]:
+        """Forecast when today's budget runs out at the recent consumption rate"""
+        now = time.time()
+        day_fraction, seconds_left = self._day_progress()
+        usage = self.store.snapshot(self._today(), now)
+        tokens_committed = usage["tokens_used"] + usage["tokens_reserved"]
         
-        logger.info(f"API request made. Tokens used today: {self.tokens_used_today}/{self.daily_token_limit}")
+        recent_tokens = self.store.recent_consumption(now, self.forecast_window_seconds)
+        tokens_per_second = recent_tokens / self.forecast_window_seconds
+        remaining = max(0, self.budget_ceiling - tokens_committed)
+        
+        exhaustion_at = None
+        if tokens_per_second > 0 and remaining / tokens_per_second < seconds_left:
+            exhaustion_at = datetime.fromtimestamp(now + remaining / tokens_per_second).isoformat()
+        
+        paced_target = int(self.budget_ceiling * day_fraction)
+        return {
+            "tokens_per_hour": round(tokens_per_second * 3600),
+            "forecast_exhaustion_at": exhaustion_at,
+            "exhausts_before_reset": exhaustion_at is not None or remaining == 0,
+            "paced_target": paced_target,
+            "tokens_ahead_of_pace": tokens_committed - paced_target,
+            "pacing_enabled": self.pacing_enabled
+        }
     
     def get_usage_stats(self) -> Dict[str, Any]:
         """Get current usage statistics"""
+        usage = self.store.snapshot(self._today(), time.time())
+        tokens_used_today = usage["tokens_used"]
+        daily_limit = self.daily_token_limit
         return {
-            "tokens_used_today": self.tokens_used_today,
-            "daily_limit": self.daily_token_limit,
-            "remaining_tokens": self.daily_token_limit - self.tokens_used_today,
-            "usage_percentage": (self.tokens_used_today / self.daily_token_limit) * 100,
-            "requests_last_minute": len(self.request_timestamps),
-            "can_make_request": self.can_make_request()[0]
+            "tokens_used_today": tokens_used_today,
+            "tokens_reserved": usage["tokens_reserved"],
+            "daily_limit": daily_limit,
+            "remaining_tokens": daily_limit - tokens_used_today,
+            "usage_percentage": (tokens_used_today / daily_limit) * 100,
+            "requests_last_minute": usage["requests_last_minute"],
+            "can_make_request": self.can_make_request()[0],
+            "pacing": self.forecast_exhaustion()
         }
 
+class FairRequestScheduler:
+    """Parks callers until the rate limiter has a free slot for them.
+
+    Waiting callers are served in (priority, fair share, arrival) order: a
+    lower priority value goes first, and within a priority class the agent
+    type that has been served least goes next. Each caller sleeps exactly
+    until the earliest permitted send time and gives up at its deadline.
+    """
+
+    PRIORITY_HIGH = PRIORITY_HIGH
+    PRIORITY_NORMAL = PRIORITY_NORMAL
+    PRIORITY_LOW = PRIORITY_LOW
+
+    def __init__(self, rate_limiter: RateLimitManager, default_deadline: float = 30.0):
+        self.rate_limiter = rate_limiter
+        self.default_deadline = default_deadline
+        self._cond = threading.Condition()
+        self._queue = []
+        self._served = defaultdict(int)
+        self._sequence = itertools.count()
+
+    def acquire(self, agent_type: str = "default", estimated_tokens: int = 1000,
+                priority: int = PRIORITY_NORMAL,
+                deadline: Optional[float] = None) -> tuple[Optional[str], str]:
+        """Block until a send slot is claimed or the deadline passes.
+        
+        Returns (reservation_id, reason); reservation_id is None if the
+        caller should fall back instead of sending.
+        """
+        deadline_at = time.monotonic() + (self.default_deadline if deadline is None else deadline)
+
+        with self._cond:
+            entry = [priority, self._served[agent_type], next(self._sequence)]
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    wait_time = None
+                    if self._queue[0] is entry:
+                        reservation_id, wait_time, reason = self.rate_limiter.try_acquire(
+                            estimated_tokens, priority
+                        )
+                        if reservation_id is not None:
+                            self._served[agent_type] += 1
+                            return reservation_id, reason
+                        if wait_time is None:
+                            return None, reason
+                    else:
+                        reason = "Waiting in request queue"
+
+                    remaining = deadline_at - time.monotonic()
+                    if remaining <= 0 or (wait_time is not None and wait_time > remaining):
+                        return None, f"Scheduler deadline exceeded ({reason})"
+                    self._cond.wait(remaining if wait_time is None else wait_time)
+            finally:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for a slot"""
+        with self._cond:
+            return len(self._queue)
+
+
 class GroqClientManager:
     """Enhanced Groq client with rate limiting and fallback handling"""
     
+    MODEL = "llama-3.3-70b-versatile"
+    
     def __init__(self):
         # Only initialize Groq client if available and API key exists
         if GROQ_AVAILABLE and os.getenv("GROQ_API_KEY"):
@@ -134,6 +699,7 @@ class GroqClientManager:
             logger.info("Groq client not available - using fallback mode only")
             
         self.rate_limiter = RateLimitManager()
+        self.scheduler = FairRequestScheduler(self.rate_limiter)
         
         # Fallback responses for different agent types
         self.fallback_responses = {
@@ -153,7 +719,9 @@ class GroqClientManager:
         }
     
     def safe_chat_completion(self, messages: List[Dict], agent_type: str = "default", 
-                           temperature: float = 0.4, max_tokens: int = 1000) -> str:
+                           temperature: float = 0.4, max_tokens: int = 1000,
+                           priority: int = PRIORITY_NORMAL,
+                           deadline: Optional[float] = None) -> str:
         """Make a chat completion with rate limiting and fallback"""
         
         # If Groq client is not available, use fallback immediately
@@ -164,33 +732,36 @@ class GroqClientManager:
         # Estimate tokens (rough approximation)
         estimated_tokens = sum(len(str(msg)) for msg in messages) // 4 + max_tokens
         
-        # Check if we can make the request
-        can_request, reason = self.rate_limiter.can_make_request(estimated_tokens)
+        # Wait for a send slot; fall back only if the deadline passes first
+        requested = time.perf_counter()
+        reservation_id, reason = self.scheduler.acquire(agent_type, estimated_tokens, priority, deadline)
+        queue_wait = time.perf_counter() - requested
         
-        if not can_request:
+        if reservation_id is None:
             logger.warning(f"Rate limit hit: {reason}")
             return self._get_fallback_response(agent_type, reason)
         
         try:
-            # Add rate limiting delay
-            time.sleep(1)  # Small delay to be respectful to API
-            
             response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
+                model=self.MODEL,
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens
             )
             
-            # Record successful request
+            # Reconcile the reservation with the tokens actually billed
             actual_tokens = getattr(response.usage, 'total_tokens', estimated_tokens)
-            self.rate_limiter.record_request(actual_tokens)
+            self.rate_limiter.commit_tokens(reservation_id, actual_tokens)
             
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
+            self._record_call(agent_type, messages, content, requested, queue_wait, True)
+            return content
             
         except Exception as e:
+            self._record_call(agent_type, messages, None, requested, queue_wait, False)
             error_str = str(e)
             logger.error(f"API request failed: {error_str}")
+            self.rate_limiter.refund_tokens(reservation_id)
             
             # Handle specific rate limit errors
             if "rate_limit_exceeded" in error_str or "429" in error_str:
@@ -206,9 +777,7 @@ class GroqClientManager:
                             actual_limit = int(limit_match.group(1))
                             
                             # Update our tracking to match reality
-                            self.rate_limiter.daily_token_limit = actual_limit
-                            self.rate_limiter.tokens_used_today = actual_used
-                            self.rate_limiter._save_token_usage()
+                            self.rate_limiter.sync_usage(actual_used, actual_limit)
                             
                             logger.warning(f"Updated rate limiter: {actual_used}/{actual_limit} tokens")
                     except Exception as parse_error:
@@ -219,6 +788,17 @@ class GroqClientManager:
             # Handle other API errors
             return self._get_fallback_response(agent_type, f"API error: {error_str}")
     
+    def _record_call(self, agent_type: str, messages: List[Dict], response: Optional[str],
+                     requested: float, queue_wait: float, success: bool):
+        """Feed one call's queue wait and end-to-end latency to the analytics sketches"""
+        from analytics.ai_analytics import ai_analytics
+        # Completions are not streamed, so time to first token is not observable here
+        ai_analytics.log_interaction(
+            agent_type, messages[-1].get('content', '') if messages else '', response or '',
+            response_time=time.perf_counter() - requested, success=success,
+            provider="groq", model=self.MODEL, queue_wait=queue_wait
+        )
+    
     def _get_fallback_response(self, agent_type: str, reason: str) -> str:
         """Get appropriate fallback response"""
         